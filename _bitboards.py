@@ -0,0 +1,591 @@
+"""
+Bitboard helpers, used by Board when it is created with "bitboard" backend.
+
+Every bitboard is a python int, where bit number N is set if something is on square N
+(squares are numbered like in SQUARES_TO_POSITIONS, A1 is 0, H1 is 7, H8 is 63).
+Board keeps one bitboard for each piece type of each player and attacks of pieces are
+calculated here with shifts, masks and lookup tables, instead of walking cells one by one.
+"""
+
+from _move_related_functions import PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO
+
+FULL_BOARD = (1 << 64) - 1
+
+FILE_A = sum(1 << (row * 8) for row in range(8))
+FILE_H = FILE_A << 7
+NOT_FILE_A = FULL_BOARD ^ FILE_A
+NOT_FILE_H = FULL_BOARD ^ FILE_H
+NOT_FILES_AB = NOT_FILE_A & (FULL_BOARD ^ (FILE_A << 1))
+NOT_FILES_GH = NOT_FILE_H & (FULL_BOARD ^ (FILE_H >> 1))
+
+ROW_1 = 0xFF
+ROW_2 = ROW_1 << 8
+ROW_7 = ROW_1 << 48
+ROW_8 = ROW_1 << 56
+
+PIECE_NAMES = ("king", "queen", "rook", "bishop", "knight", "pawn")
+
+
+def _north(bb):
+    return (bb << 8) & FULL_BOARD
+
+
+def _south(bb):
+    return bb >> 8
+
+
+def _east(bb):
+    return (bb << 1) & NOT_FILE_A & FULL_BOARD
+
+
+def _west(bb):
+    return (bb >> 1) & NOT_FILE_H
+
+
+def _north_east(bb):
+    return (bb << 9) & NOT_FILE_A & FULL_BOARD
+
+
+def _north_west(bb):
+    return (bb << 7) & NOT_FILE_H & FULL_BOARD
+
+
+def _south_east(bb):
+    return (bb >> 7) & NOT_FILE_A
+
+
+def _south_west(bb):
+    return (bb >> 9) & NOT_FILE_H
+
+
+def knight_attacks(bb):
+    return (
+        ((bb << 17) & NOT_FILE_A)
+        | ((bb << 15) & NOT_FILE_H)
+        | ((bb << 10) & NOT_FILES_AB)
+        | ((bb << 6) & NOT_FILES_GH)
+        | ((bb >> 17) & NOT_FILE_H)
+        | ((bb >> 15) & NOT_FILE_A)
+        | ((bb >> 10) & NOT_FILES_GH)
+        | ((bb >> 6) & NOT_FILES_AB)
+    ) & FULL_BOARD
+
+
+def king_attacks(bb):
+    row = bb | _east(bb) | _west(bb)
+
+    return (row | _north(row) | _south(row)) ^ bb
+
+
+def pawn_attacks(bb, player_number):
+    if player_number == 1:
+        return _north_east(bb) | _north_west(bb)
+
+    return _south_east(bb) | _south_west(bb)
+
+
+def _get_ray(square, direction_func):
+    ray = 0
+    bb = direction_func(1 << square)
+
+    while bb:
+        ray |= bb
+        bb = direction_func(bb)
+
+    return ray
+
+
+KNIGHT_ATTACKS = [knight_attacks(1 << square) for square in range(64)]
+KING_ATTACKS = [king_attacks(1 << square) for square in range(64)]
+PAWN_ATTACKS = {
+    player_number: [pawn_attacks(1 << square, player_number) for square in range(64)]
+    for player_number in (1, 2)
+}
+
+# rays going to bigger square numbers, first blocker on them is the lowest set bit
+_POSITIVE_RAYS = [
+    [_get_ray(square, func) for square in range(64)]
+    for func in (_north, _east, _north_east, _north_west)
+]
+# and to smaller ones, first blocker on them is the highest set bit
+_NEGATIVE_RAYS = [
+    [_get_ray(square, func) for square in range(64)]
+    for func in (_south, _west, _south_west, _south_east)
+]
+
+
+def _get_between_squares(square, other_square):
+    """
+    Squares between 2 given ones on the same line, with the other square included,
+    as moving there stops check or pin from piece standing on it. 0 if not on one line.
+    """
+    for rays in (*_POSITIVE_RAYS, *_NEGATIVE_RAYS):
+        if rays[square] & (1 << other_square):
+            return rays[square] ^ rays[other_square]
+
+    return 0
+
+
+BETWEEN_SQUARES = [
+    [_get_between_squares(square, other_square) for other_square in range(64)]
+    for square in range(64)
+]
+
+
+def _sliding_attacks(square, occupied, directions):
+    attacks = 0
+
+    for direction in directions:
+        ray = _POSITIVE_RAYS[direction][square]
+        blockers = ray & occupied
+
+        if blockers:
+            first_blocker = (blockers & -blockers).bit_length() - 1
+            ray ^= _POSITIVE_RAYS[direction][first_blocker]
+
+        attacks |= ray
+
+        ray = _NEGATIVE_RAYS[direction][square]
+        blockers = ray & occupied
+
+        if blockers:
+            first_blocker = blockers.bit_length() - 1
+            ray ^= _NEGATIVE_RAYS[direction][first_blocker]
+
+        attacks |= ray
+
+    return attacks
+
+
+def _get_line_mask(square, direction):
+    """
+    Squares of line going through given square in given direction(both ways),
+    that can block it. Last squares on the board edges never block anything.
+    """
+    positive_ray = _POSITIVE_RAYS[direction][square]
+    negative_ray = _NEGATIVE_RAYS[direction][square]
+
+    if positive_ray:
+        positive_ray ^= 1 << (positive_ray.bit_length() - 1)
+
+    if negative_ray:
+        negative_ray ^= negative_ray & -negative_ray
+
+    return positive_ray | negative_ray
+
+
+def _get_line_attacks(square, direction, mask):
+    """
+    Attacks along the line for each possible set of blockers on it, there are at most
+    6 squares that can block, so at most 64 of them for each square and line.
+    """
+    line_attacks = {}
+    blockers = 0
+
+    # go through all subsets of mask bits
+    while True:
+        line_attacks[blockers] = _sliding_attacks(square, blockers, (direction,))
+        blockers = (blockers - mask) & mask
+
+        if not blockers:
+            return line_attacks
+
+
+# for each line direction(see rays above) and square, blocking squares mask and
+# attacks for each occupancy of them, so sliding attacks are just dictionary lookups
+_LINE_MASKS = [
+    [_get_line_mask(square, direction) for square in range(64)]
+    for direction in range(4)
+]
+_LINE_ATTACKS = [
+    [
+        _get_line_attacks(square, direction, _LINE_MASKS[direction][square])
+        for square in range(64)
+    ]
+    for direction in range(4)
+]
+
+_FILE_MASKS, _ROW_MASKS, _DIAGONAL_MASKS, _ANTI_DIAGONAL_MASKS = _LINE_MASKS
+_FILE_ATTACKS, _ROW_ATTACKS, _DIAGONAL_ATTACKS, _ANTI_DIAGONAL_ATTACKS = _LINE_ATTACKS
+
+
+def rook_attacks(square, occupied):
+    return (
+        _FILE_ATTACKS[square][occupied & _FILE_MASKS[square]]
+        | _ROW_ATTACKS[square][occupied & _ROW_MASKS[square]]
+    )
+
+
+def bishop_attacks(square, occupied):
+    return (
+        _DIAGONAL_ATTACKS[square][occupied & _DIAGONAL_MASKS[square]]
+        | _ANTI_DIAGONAL_ATTACKS[square][occupied & _ANTI_DIAGONAL_MASKS[square]]
+    )
+
+
+def queen_attacks(square, occupied):
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def iterate_squares(bb):
+    """
+    Yield numbers of set bits, from lowest to highest
+    """
+    while bb:
+        lowest_bit = bb & -bb
+        yield lowest_bit.bit_length() - 1
+        bb ^= lowest_bit
+
+
+def get_empty_bitboards():
+    return {
+        player_number: {piece_name: 0 for piece_name in PIECE_NAMES}
+        for player_number in (1, 2)
+    }
+
+
+def is_square_attacked(bitboards, occupied, square, by_player_number):
+    """
+    Can any piece of given player kill something on given square?
+
+    We look from the square itself, for example if knight standing on the square
+    could reach some knight of given player, that knight also reaches the square.
+    """
+    pieces = bitboards[by_player_number]
+
+    if KNIGHT_ATTACKS[square] & pieces["knight"]:
+        return True
+
+    if KING_ATTACKS[square] & pieces["king"]:
+        return True
+
+    # opponent pawns attack us from where our pawn would attack them
+    if PAWN_ATTACKS[3 - by_player_number][square] & pieces["pawn"]:
+        return True
+
+    queens = pieces["queen"]
+    rooks_and_queens = pieces["rook"] | queens
+
+    if rooks_and_queens and rook_attacks(square, occupied) & rooks_and_queens:
+        return True
+
+    bishops_and_queens = pieces["bishop"] | queens
+
+    if bishops_and_queens and bishop_attacks(square, occupied) & bishops_and_queens:
+        return True
+
+    return False
+
+
+def get_technically_valid_moves_info_for_piece(piece, board_state):
+    """
+    Bitboard based version of pieces get_technically_valid_moves_info_for_piece methods,
+    returns list of move info dictionaries with the same structure as they do.
+    Castling moves of King are not included.
+    """
+    square = piece.square
+    player_number = piece.player_number
+    piece_name = piece.piece_name
+
+    own_pieces = board_state._occupied_squares[player_number]
+    opponent_pieces = board_state._occupied_squares[3 - player_number]
+    occupied = own_pieces | opponent_pieces
+
+    possible_moves_info = []
+
+    if piece_name == "pawn":
+        if player_number == 1:
+            one_forward = _north(1 << square) & ~occupied
+            two_forward = _north(one_forward & (ROW_2 << 8)) & ~occupied
+            promotion_row = ROW_8
+        else:
+            one_forward = _south(1 << square) & ~occupied
+            two_forward = _south(one_forward & (ROW_7 >> 8)) & ~occupied
+            promotion_row = ROW_1
+
+        targets = one_forward | two_forward
+        kill_targets = PAWN_ATTACKS[player_number][square] & opponent_pieces
+
+        for new_square in iterate_squares(targets | kill_targets):
+            killed_opponent_piece_square = (
+                new_square if (1 << new_square) & kill_targets else None
+            )
+
+            if (1 << new_square) & promotion_row:
+                for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
+                    possible_moves_info.append(
+                        {
+                            "new_square": new_square,
+                            "killed_opponent_piece_square": killed_opponent_piece_square,
+                            "promote_into": piece_letter,
+                        }
+                    )
+            else:
+                possible_moves_info.append(
+                    {
+                        "new_square": new_square,
+                        "killed_opponent_piece_square": killed_opponent_piece_square,
+                    }
+                )
+
+        # En passant
+        victim_square = board_state._get_en_passant_victim_square()
+
+        if victim_square is not None and player_number == board_state._player_turn:
+            # victim must be just next to our pawn
+            if (_east(1 << square) | _west(1 << square)) & (1 << victim_square):
+                possible_moves_info.append(
+                    {
+                        "new_square": victim_square + (8 if player_number == 1 else -8),
+                        "killed_opponent_piece_square": victim_square,
+                    }
+                )
+
+        return possible_moves_info
+
+    if piece_name == "knight":
+        targets = KNIGHT_ATTACKS[square]
+    elif piece_name == "king":
+        targets = KING_ATTACKS[square]
+    elif piece_name == "rook":
+        targets = rook_attacks(square, occupied)
+    elif piece_name == "bishop":
+        targets = bishop_attacks(square, occupied)
+    else:
+        targets = queen_attacks(square, occupied)
+
+    for new_square in iterate_squares(targets & ~own_pieces):
+        possible_moves_info.append(
+            {
+                "new_square": new_square,
+                "killed_opponent_piece_square": (
+                    new_square if (1 << new_square) & opponent_pieces else None
+                ),
+            }
+        )
+
+    return possible_moves_info
+
+
+def _get_squares_attacked_by_player(pieces, player_number, occupied):
+    attacked_squares = pawn_attacks(pieces["pawn"], player_number)
+
+    for square in iterate_squares(pieces["knight"]):
+        attacked_squares |= KNIGHT_ATTACKS[square]
+
+    for square in iterate_squares(pieces["king"]):
+        attacked_squares |= KING_ATTACKS[square]
+
+    for square in iterate_squares(pieces["rook"] | pieces["queen"]):
+        attacked_squares |= rook_attacks(square, occupied)
+
+    for square in iterate_squares(pieces["bishop"] | pieces["queen"]):
+        attacked_squares |= bishop_attacks(square, occupied)
+
+    return attacked_squares
+
+
+def get_legal_moves_info(board_state, pieces):
+    """
+    Bitboard based version of Board._generate_legal_moves_of_pieces, returns legal moves
+    of given pieces of current player as list of (piece, move_info) tuples.
+
+    Checks, pins and squares attacked by opponent are all found as bitboards,
+    so moves of each piece are just its attacks masked by them.
+    """
+    player_number = board_state._player_turn
+    opponent_player_number = 3 - player_number
+
+    own_pieces = board_state._occupied_squares[player_number]
+    opponent_pieces = board_state._occupied_squares[opponent_player_number]
+    occupied = own_pieces | opponent_pieces
+    opponent_bitboards = board_state._bitboards[opponent_player_number]
+
+    king = board_state.current_player_king
+    king_square = king.square
+
+    opponent_rooks_and_queens = opponent_bitboards["rook"] | opponent_bitboards["queen"]
+    opponent_bishops_and_queens = (
+        opponent_bitboards["bishop"] | opponent_bitboards["queen"]
+    )
+
+    checkers = (
+        (KNIGHT_ATTACKS[king_square] & opponent_bitboards["knight"])
+        | (PAWN_ATTACKS[player_number][king_square] & opponent_bitboards["pawn"])
+        | (rook_attacks(king_square, occupied) & opponent_rooks_and_queens)
+        | (bishop_attacks(king_square, occupied) & opponent_bishops_and_queens)
+    )
+
+    # squares other pieces can move to, to stop check
+    if not checkers:
+        allowed_squares = FULL_BOARD
+    elif checkers & (checkers - 1):
+        # if 2 pieces give check, only king can save itself
+        allowed_squares = 0
+    else:
+        # knights and pawns are not on one line with king, so it is only their square
+        allowed_squares = (
+            BETWEEN_SQUARES[king_square][checkers.bit_length() - 1] | checkers
+        )
+
+    # our pieces that are the only ones between king and opponent sliding piece
+    pins = {}
+    pinners = (
+        rook_attacks(king_square, opponent_pieces) & opponent_rooks_and_queens
+    ) | (bishop_attacks(king_square, opponent_pieces) & opponent_bishops_and_queens)
+
+    for pinner_square in iterate_squares(pinners):
+        between_squares = BETWEEN_SQUARES[king_square][pinner_square]
+        pinned_pieces = between_squares & own_pieces
+
+        if pinned_pieces and not pinned_pieces & (pinned_pieces - 1):
+            pins[pinned_pieces.bit_length() - 1] = between_squares
+
+    en_passant_victim_square = board_state._get_en_passant_victim_square()
+
+    if player_number == 1:
+        forward = 8
+        promotion_row = ROW_8
+        pawns_row = ROW_2
+    else:
+        forward = -8
+        promotion_row = ROW_1
+        pawns_row = ROW_7
+
+    not_own_pieces = FULL_BOARD ^ own_pieces
+    legal_moves = []
+
+    for piece in pieces:
+        square = piece.square
+        piece_name = piece.piece_name
+
+        if piece is king:
+            # king can not step back from the sliding piece that gives check
+            attacked_squares = _get_squares_attacked_by_player(
+                opponent_bitboards, opponent_player_number, occupied ^ (1 << square)
+            )
+            targets = KING_ATTACKS[square] & not_own_pieces & ~attacked_squares
+
+            while targets:
+                new_square_bit = targets & -targets
+                targets ^= new_square_bit
+                new_square = new_square_bit.bit_length() - 1
+
+                legal_moves.append(
+                    (
+                        king,
+                        {
+                            "new_square": new_square,
+                            "killed_opponent_piece_square": (
+                                new_square if new_square_bit & opponent_pieces else None
+                            ),
+                        },
+                    )
+                )
+
+            # king can not castle if it has active check
+            if not checkers:
+                for move_info in king.get_castling_moves_info(board_state):
+                    if not (1 << move_info["new_square"]) & attacked_squares:
+                        legal_moves.append((king, move_info))
+
+            continue
+
+        if not allowed_squares:
+            continue
+
+        piece_allowed_squares = allowed_squares & pins.get(square, FULL_BOARD)
+
+        if piece_name == "pawn":
+            one_forward = (1 << (square + forward)) & ~occupied
+            targets = one_forward
+
+            if one_forward and (1 << square) & pawns_row:
+                targets |= (1 << (square + 2 * forward)) & ~occupied
+
+            targets = (
+                targets | (PAWN_ATTACKS[player_number][square] & opponent_pieces)
+            ) & piece_allowed_squares
+
+            while targets:
+                new_square_bit = targets & -targets
+                targets ^= new_square_bit
+                new_square = new_square_bit.bit_length() - 1
+                killed_opponent_piece_square = (
+                    new_square if new_square_bit & opponent_pieces else None
+                )
+
+                if new_square_bit & promotion_row:
+                    for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
+                        legal_moves.append(
+                            (
+                                piece,
+                                {
+                                    "new_square": new_square,
+                                    "killed_opponent_piece_square": killed_opponent_piece_square,
+                                    "promote_into": piece_letter,
+                                },
+                            )
+                        )
+                else:
+                    legal_moves.append(
+                        (
+                            piece,
+                            {
+                                "new_square": new_square,
+                                "killed_opponent_piece_square": killed_opponent_piece_square,
+                            },
+                        )
+                    )
+
+            # En passant kills piece that is not on the new square of moving pawn, and
+            # may even open check from a side, so just try it, it happens rarely
+            if en_passant_victim_square is not None and (
+                PAWN_ATTACKS[player_number][square]
+                & (1 << (en_passant_victim_square + forward))
+            ):
+                move_info = {
+                    "new_square": en_passant_victim_square + forward,
+                    "killed_opponent_piece_square": en_passant_victim_square,
+                }
+
+                board_state.push(
+                    piece=piece, move_info=move_info, swap_player_turn=False
+                )
+                has_check = board_state._player_has_check_in_position()
+                board_state.pop()
+
+                if not has_check:
+                    legal_moves.append((piece, move_info))
+
+            continue
+
+        if piece_name == "knight":
+            targets = KNIGHT_ATTACKS[square]
+        elif piece_name == "rook":
+            targets = rook_attacks(square, occupied)
+        elif piece_name == "bishop":
+            targets = bishop_attacks(square, occupied)
+        else:
+            targets = queen_attacks(square, occupied)
+
+        targets &= not_own_pieces & piece_allowed_squares
+
+        while targets:
+            new_square_bit = targets & -targets
+            targets ^= new_square_bit
+            new_square = new_square_bit.bit_length() - 1
+
+            legal_moves.append(
+                (
+                    piece,
+                    {
+                        "new_square": new_square,
+                        "killed_opponent_piece_square": (
+                            new_square if new_square_bit & opponent_pieces else None
+                        ),
+                    },
+                )
+            )
+
+    return legal_moves
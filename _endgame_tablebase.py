@@ -0,0 +1,379 @@
+"""
+Endgame tablebase - perfect results of positions with few pieces left, like king and
+queen against king, found by retrograde analysis(see endgame_tablebase.py).
+
+For each position of some material(like "KQK" - king and queen of one player against
+king of other one) table knows if player who moves wins, loses, or it is a draw, and in
+how many plies(moves of both players) checkmate happens when both players play best.
+
+Each material is a separate file, with header and one byte for each position:
+    . header
+        - 4 bytes: b"CCTB"
+        - 4 bytes: format version
+        - 8 bytes: material, like b"KQK", padded with zero bytes
+        - 4 bytes: number of positions
+    . one byte for each position:
+        - 0: draw
+        - 255: position is not possible(pieces on the same square, king of player
+               who does not move is checked...) or not used(see below)
+        - other: number of plies till checkmate + 1, odd number of plies means that
+                 player who moves wins, even one - that player who moves loses
+
+Position index is made from player who moves and squares of pieces, in order of material
+letters. Mirror images of position have the same result, so first king is always moved
+into a1-d1-d4 triangle by mirroring the board(or just into a-d columns, if there are
+pawns, as they can not be mirrored vertically), which makes tables up to 6 times smaller.
+Positions with first king outside of it are never looked up and not saved at all, and
+ones that are mirror images of other ones inside it are marked as not possible.
+
+Tables are made for the first side of material being player 1, positions where player 2
+has it are looked up with board mirrored vertically and players swapped.
+"""
+
+import os
+import struct
+
+MAGIC = b"CCTB"
+VERSION = 1
+FILE_EXTENSION = ".cctb"
+
+_HEADER = struct.Struct(">4sI8sI")
+
+DRAW = 0
+NOT_POSSIBLE = 255
+
+# tables for 5 pieces would take hundreds of megabytes
+MAX_PIECES = 4
+
+# in order they are written in materials
+PIECE_LETTERS = "KQRBNP"
+
+# used to decide which side of material goes first
+_PIECE_LETTERS_VALUES = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "P": 1}
+
+
+def _transform_square(square, transformation):
+    """
+    transformation bits: 1 - mirror columns, 2 - mirror rows, 4 - swap rows and columns
+    (mirror by a1-h8 diagonal), done in that order
+    """
+    row, col = divmod(square, 8)
+
+    if transformation & 1:
+        col = 7 - col
+
+    if transformation & 2:
+        row = 7 - row
+
+    if transformation & 4:
+        row, col = col, row
+
+    return row * 8 + col
+
+
+TRANSFORMED_SQUARES = [
+    [_transform_square(square, transformation) for square in range(64)]
+    for transformation in range(8)
+]
+
+# squares first king can be on in tables without and with pawns
+_TRIANGLE_SQUARES = [i for i in range(64) if i // 8 <= i % 8 <= 3]
+_LEFT_HALF_SQUARES = [i for i in range(64) if i % 8 <= 3]
+
+
+def _get_king_transformation(square):
+    transformation = (square % 8 > 3) | (square // 8 > 3) << 1
+    row, col = divmod(TRANSFORMED_SQUARES[transformation][square], 8)
+
+    return transformation | (row > col) << 2
+
+
+_KING_TRANSFORMATIONS = [_get_king_transformation(square) for square in range(64)]
+
+
+def parse_material(material):
+    """
+    "KQK" --> ["K", "Q", "K"], [1, 1, 2](player of each piece)
+    Raises ValueError for materials tablebase does not support.
+    """
+    if (
+        not material
+        or material[0] != "K"
+        or material.count("K") != 2
+        or any(i not in PIECE_LETTERS for i in material)
+        or len(material) > MAX_PIECES
+    ):
+        raise ValueError(
+            f"Invalid material {material}, it should be like KQK, "
+            f"with at most {MAX_PIECES} pieces"
+        )
+
+    second_king_index = material.index("K", 1)
+
+    for side in (material[:second_king_index], material[second_king_index:]):
+        if list(side) != sorted(side, key=PIECE_LETTERS.index):
+            raise ValueError(
+                f"Invalid material {material}, pieces of each "
+                f"side should be in {PIECE_LETTERS} order"
+            )
+
+    return list(material), [1] * second_king_index + [2] * (
+        len(material) - second_king_index
+    )
+
+
+def normalize_material(first_side_letters, second_side_letters):
+    """
+    Material with stronger side first, as tables are generated for it,
+    from letters of pieces of each side in any order
+    """
+    sides = [
+        "".join(sorted(letters, key=PIECE_LETTERS.index))
+        for letters in (first_side_letters, second_side_letters)
+    ]
+    sides.sort(
+        key=lambda i: (sum(_PIECE_LETTERS_VALUES[letter] for letter in i), i),
+        reverse=True,
+    )
+
+    return "".join(sides)
+
+
+def has_insufficient_material(letters):
+    """
+    Nobody can checkmate with only kings, or kings and one bishop or knight
+    """
+    other_letters = [i for i in letters if i != "K"]
+
+    return not other_letters or (len(other_letters) == 1 and other_letters[0] in "BN")
+
+
+def get_result(value):
+    """
+    Byte of table --> {"result": "win", "loss" or "draw", "distance": plies till
+    checkmate, 0 for draws}, result is for player who moves
+    """
+    if value == DRAW:
+        return {"result": "draw", "distance": 0}
+
+    distance = value - 1
+
+    return {"result": "win" if distance % 2 else "loss", "distance": distance}
+
+
+class TableLayout:
+    """
+    How positions of some material are placed in its table
+    """
+
+    def __init__(self, material):
+        self.material = material
+        self.letters, self.players = parse_material(material)
+        self.pieces_count = len(self.letters)
+        self.has_pawns = "P" in material
+
+        self.king_squares = _LEFT_HALF_SQUARES if self.has_pawns else _TRIANGLE_SQUARES
+        # first king square --> how it is mirrored to be in king_squares
+        self.king_transformations = [
+            (square % 8 > 3) if self.has_pawns else _KING_TRANSFORMATIONS[square]
+            for square in range(64)
+        ]
+        # player number and first king square(before mirroring) --> first part of index
+        self._first_indices = {
+            player_number: [
+                (player_number - 1) * len(self.king_squares)
+                + self.king_squares.index(
+                    TRANSFORMED_SQUARES[self.king_transformations[square]][square]
+                )
+                for square in range(64)
+            ]
+            for player_number in (1, 2)
+        }
+        # first king squares that get on a1-d4 diagonal after mirroring, in tables
+        # without pawns, then mirroring by the diagonal keeps king in the triangle
+        self._diagonal_king_squares = {
+            square
+            for square in range(64)
+            if not self.has_pawns
+            and TRANSFORMED_SQUARES[self.king_transformations[square]][square] % 9 == 0
+        }
+
+        self.size = 2 * len(self.king_squares) * 64 ** (self.pieces_count - 1)
+
+    def get_index(self, squares, player_number):
+        """
+        Index of position in table, squares are squares of pieces in order of material
+        letters and player_number is player who moves, 1 if it is first side of material
+        """
+        king_square = squares[0]
+        transformation = self.king_transformations[king_square]
+
+        # other pieces decide if board is mirrored by diagonal, to have one index only
+        if king_square in self._diagonal_king_squares:
+            for square in squares[1:]:
+                row, col = divmod(TRANSFORMED_SQUARES[transformation][square], 8)
+
+                if row != col:
+                    if row > col:
+                        transformation |= 4
+
+                    break
+
+        transformed_squares = TRANSFORMED_SQUARES[transformation]
+        index = self._first_indices[player_number][king_square]
+
+        for square in squares[1:]:
+            index = index * 64 + transformed_squares[square]
+
+        return index
+
+    def get_position(self, index):
+        """
+        Index --> (squares, player_number), opposite of get_index
+        """
+        squares = []
+
+        for _ in range(self.pieces_count - 1):
+            index, square = divmod(index, 64)
+            squares.append(square)
+
+        player_index, king_index = divmod(index, len(self.king_squares))
+        squares.append(self.king_squares[king_index])
+
+        return squares[::-1], player_index + 1
+
+
+def save_table(file_path, material, values):
+    if len(values) != TableLayout(material).size:
+        raise ValueError(f"Wrong size of {material} table")
+
+    with open(file_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, material.encode(), len(values)))
+        f.write(values)
+
+
+def load_table(file_path):
+    """
+    Returns (material, values) of table file
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{file_path} is not an endgame table")
+
+    magic, version, material, size = _HEADER.unpack_from(data)
+    material = material.rstrip(b"\0").decode(errors="replace")
+
+    try:
+        expected_size = TableLayout(material).size
+    except ValueError:
+        expected_size = None
+
+    if (
+        magic != MAGIC
+        or version != VERSION
+        or size != expected_size
+        or len(data) != _HEADER.size + size
+    ):
+        raise ValueError(f"{file_path} is not an endgame table")
+
+    return material, data[_HEADER.size :]
+
+
+class EndgameTablebase:
+    """
+    Tables of several materials, to look positions up in them
+    """
+
+    def __init__(self):
+        # material --> (TableLayout, bytes of table)
+        self._tables = {}
+
+    def add_table(self, material, values):
+        layout = TableLayout(material)
+
+        if len(values) != layout.size:
+            raise ValueError(f"Wrong size of {material} table")
+
+        self._tables[material] = (layout, values)
+
+    @property
+    def materials(self):
+        return sorted(self._tables)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load all tables(*.cctb files) from directory
+        """
+        tablebase = cls()
+
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith(FILE_EXTENSION):
+                tablebase.add_table(*load_table(os.path.join(directory, file_name)))
+
+        return tablebase
+
+    def get_value(self, pieces, player_number):
+        """
+        Byte of table for position(see module docstring), None if there is no table for it.
+
+        pieces - (player_number, letter, square) tuple for each piece on the board,
+                letters are as in FEN for player 1, like "Q" for queen
+        player_number - player who moves
+        """
+        players_pieces = {1: [], 2: []}
+
+        for piece_player_number, letter, square in pieces:
+            players_pieces[piece_player_number].append(
+                (PIECE_LETTERS.index(letter), letter, square)
+            )
+
+        if has_insufficient_material(
+            [i[1] for i in players_pieces[1] + players_pieces[2]]
+        ):
+            return DRAW
+
+        players_pieces[1].sort()
+        players_pieces[2].sort()
+
+        for first_player_number in (1, 2):
+            second_player_number = 3 - first_player_number
+            first_side, second_side = (
+                players_pieces[first_player_number],
+                players_pieces[second_player_number],
+            )
+            material = "".join(i[1] for i in first_side + second_side)
+
+            if material not in self._tables:
+                continue
+
+            layout, values = self._tables[material]
+            squares = [i[2] for i in first_side + second_side]
+
+            if first_player_number == 2:
+                squares = [square ^ 56 for square in squares]
+                player_number = 3 - player_number
+
+            return values[layout.get_index(squares, player_number)]
+
+        return None
+
+    def probe(self, pieces, player_number):
+        """
+        Result of position for player who moves, as get_result returns it, None if
+        position is not in tables. Arguments are the same as get_value has.
+        """
+        value = self.get_value(pieces, player_number)
+
+        if value is None or value == NOT_POSSIBLE:
+            return None
+
+        return get_result(value)
+
+    def __len__(self):
+        """
+        Number of materials in tablebase
+        """
+        return len(self._tables)
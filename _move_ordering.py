@@ -0,0 +1,148 @@
+"""
+Order in which search tries moves.
+
+Alpha-beta search skips the rest of moves as soon as one of them is good enough(cutoff),
+so the sooner best move is tried, the less positions are searched. With random order it
+searches almost as many positions as plain minimax, so moves are tried in this order:
+    . best move known from previous searches of the position(like principal variation)
+    . kills, most valuable victims first, and from them, by least valuable attackers
+    . promotions
+    . killer moves - quiet moves that caused cutoffs at the same ply in other positions
+    . other moves, by how often they caused cutoffs so far(history table)
+"""
+
+from _move_related_functions import encode_move
+
+# piece values only for ordering kills, so that any victim is more
+# important than any attacker, as 10 * victim value - attacker value is used
+_PIECE_ORDER_VALUES = {
+    "pawn": 1,
+    "knight": 2,
+    "bishop": 3,
+    "rook": 4,
+    "queen": 5,
+    "king": 6,
+}
+
+_BEST_MOVE_ORDER = 1 << 30
+_KILL_ORDER = 1 << 26
+_PROMOTION_ORDER = 1 << 25
+_FIRST_KILLER_ORDER = 1 << 24
+_SECOND_KILLER_ORDER = _FIRST_KILLER_ORDER - 1
+# history scores are kept below killers
+_MAX_HISTORY_SCORE = _SECOND_KILLER_ORDER - 1
+
+
+class MoveOrderer:
+    def __init__(self, max_ply=64):
+        # 2 last quiet moves(as encoded moves) that caused cutoff, for each ply
+        self.killer_moves = [[None, None] for _ in range(max_ply + 1)]
+        # how useful each quiet move was so far, for each player,
+        # by (player_number - 1) * 4096 + from_square * 64 + to_square
+        self.history = [0] * (2 * 64 * 64)
+
+        self.cutoffs = 0
+        # cutoffs caused by first tried move, the higher is their share,
+        # the better ordering works, good one gets more than 90%
+        self.first_move_cutoffs = 0
+        self.killer_move_cutoffs = 0
+
+    def new_search(self):
+        """
+        Forget killer moves and statistics, but keep history(just make it less
+        important), as it is still mostly true for positions of next search.
+        """
+        for killer_moves in self.killer_moves:
+            killer_moves[0], killer_moves[1] = None, None
+
+        self.history = [i // 2 for i in self.history]
+
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.killer_move_cutoffs = 0
+
+    def get_move_order(self, board, piece, move_info, ply, best_move_key=None):
+        """
+        The bigger, the sooner move should be tried
+        """
+        move_key = encode_move(
+            piece.square, move_info["new_square"], move_info.get("promote_into")
+        )
+
+        if move_key == best_move_key:
+            return _BEST_MOVE_ORDER
+
+        if move_info["killed_opponent_piece_square"] is not None:
+            victim = board._squares[move_info["killed_opponent_piece_square"]]
+
+            return (
+                _KILL_ORDER
+                + 10 * _PIECE_ORDER_VALUES[victim.piece_name]
+                - _PIECE_ORDER_VALUES[piece.piece_name]
+            )
+
+        if move_info.get("promote_into"):
+            # queens first, others are rarely useful
+            return _PROMOTION_ORDER + (move_info["promote_into"] == "Q")
+
+        killer_moves = self.killer_moves[ply]
+
+        if move_key == killer_moves[0]:
+            return _FIRST_KILLER_ORDER
+
+        if move_key == killer_moves[1]:
+            return _SECOND_KILLER_ORDER
+
+        return self.history[(piece.player_number - 1) << 12 | move_key]
+
+    def order_moves(self, board, legal_moves, ply, best_move_key=None):
+        """
+        (piece, move_info) tuples of legal moves, sorted in order to try them
+        """
+        return sorted(
+            legal_moves,
+            key=lambda i: self.get_move_order(board, *i, ply, best_move_key),
+            reverse=True,
+        )
+
+    def add_cutoff(self, piece, move_info, ply, depth, move_number):
+        """
+        Remember that move caused cutoff at given ply while searching given depth.
+        move_number - index of move in ordered moves
+        """
+        self.cutoffs += 1
+
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+        is_kill = move_info["killed_opponent_piece_square"] is not None
+
+        # kills and promotions are tried early anyway
+        if is_kill or move_info.get("promote_into"):
+            return
+
+        move_key = encode_move(piece.square, move_info["new_square"])
+        killer_moves = self.killer_moves[ply]
+
+        if move_key == killer_moves[0] or move_key == killer_moves[1]:
+            self.killer_move_cutoffs += 1
+
+        if move_key != killer_moves[0]:
+            killer_moves[1] = killer_moves[0]
+            killer_moves[0] = move_key
+
+        # moves that cut bigger subtrees are more important
+        history_index = (piece.player_number - 1) << 12 | move_key
+        self.history[history_index] = min(
+            self.history[history_index] + depth * depth, _MAX_HISTORY_SCORE
+        )
+
+    def get_stats(self):
+        return {
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoffs_rate": (
+                self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0
+            ),
+            "killer_move_cutoffs": self.killer_move_cutoffs,
+        }
@@ -5,6 +5,12 @@ PIECES_LETTERS_THAT_NEED_THEIR_LETTER_UPPERCASED_IN_CHESS_NOTATION = (
     PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO + "K"
 )
 
+# board cells as square indices from 0 to 63, starting from A1, then B1 ... H1, A2 ... H8
+SQUARES_TO_POSITIONS = [f"{col}{row}" for row in "12345678" for col in "ABCDEFGH"]
+POSITIONS_TO_SQUARES = {
+    position: square for square, position in enumerate(SQUARES_TO_POSITIONS)
+}
+
 
 def _is_chess_cell_coord(coord_str):
     """
@@ -74,6 +80,12 @@ def _is_chess_notation_move_str(move):
     try:
         assert len(move) >= 2
 
+        # check and checkmate signs can only be at the end, and do not change the move
+        if move[-1] in "+#":
+            move = move[:-1]
+
+        assert "+" not in move and "#" not in move
+
         # special cases for castling
         if move in ("O-O", "O-O-O"):
             return True
@@ -91,16 +103,11 @@ def _is_chess_notation_move_str(move):
                 i
                 in "abcdefgh12345678x"
                 + PIECES_LETTERS_THAT_NEED_THEIR_LETTER_UPPERCASED_IN_CHESS_NOTATION
-                + "+x=#"
+                + "x="
                 for i in move
             ]
         )
 
-        # check can only be at the end
-        if move.count("+") > 0:
-            assert move.endswith("+")
-            move = move[:-1]
-
         # kills
         if move.count("x") > 0:
             # max 1 kill sign
@@ -151,105 +158,260 @@ def _is_chess_notation_move_str(move):
         return False
 
 
-# next move calculation helpers, without validation
-def _top_left_coords(from_cell) -> str:
-    col, row = from_cell
+# next move calculation helpers, they return None if
+# there is no such cell on board(or if None was given)
+def _top_left_square(from_square):
+    if from_square is None or from_square % 8 == 0 or from_square >= 56:
+        return None
+
+    return from_square + 7
+
+
+def _top_right_square(from_square):
+    if from_square is None or from_square % 8 == 7 or from_square >= 56:
+        return None
+
+    return from_square + 9
+
+
+def _top_square(from_square):
+    if from_square is None or from_square >= 56:
+        return None
+
+    return from_square + 8
+
+
+def _left_square(from_square):
+    if from_square is None or from_square % 8 == 0:
+        return None
+
+    return from_square - 1
+
+
+def _right_square(from_square):
+    if from_square is None or from_square % 8 == 7:
+        return None
+
+    return from_square + 1
+
+
+def _bottom_left_square(from_square):
+    if from_square is None or from_square % 8 == 0 or from_square < 8:
+        return None
+
+    return from_square - 9
+
+
+def _bottom_right_square(from_square):
+    if from_square is None or from_square % 8 == 7 or from_square < 8:
+        return None
 
-    return chr(ord(col) - 1) + str(int(row) + 1)
+    return from_square - 7
 
 
-def _top_right_coords(from_cell) -> str:
-    col, row = from_cell
-    return chr(ord(col) + 1) + str(int(row) + 1)
+def _bottom_square(from_square):
+    if from_square is None or from_square < 8:
+        return None
 
+    return from_square - 8
 
-def _top_coords(from_cell) -> str:
-    col, row = from_cell
-    return col + str(int(row) + 1)
 
+def _get_ray(from_square, func_to_apply):
+    """
+    All cells from given square till the edge of the board in some direction, nearest first
+    """
+    ray = []
+    curr_square = func_to_apply(from_square)
+
+    while curr_square is not None:
+        ray.append(curr_square)
+        curr_square = func_to_apply(curr_square)
+
+    return tuple(ray)
+
+
+# directions for RAYS table below
+(
+    TOP,
+    BOTTOM,
+    LEFT,
+    RIGHT,
+    TOP_LEFT,
+    TOP_RIGHT,
+    BOTTOM_LEFT,
+    BOTTOM_RIGHT,
+) = range(8)
+
+ROOK_DIRECTIONS = (TOP, BOTTOM, LEFT, RIGHT)
+BISHOP_DIRECTIONS = (TOP_LEFT, TOP_RIGHT, BOTTOM_LEFT, BOTTOM_RIGHT)
+QUEEN_DIRECTIONS = BISHOP_DIRECTIONS + ROOK_DIRECTIONS
+
+### tables with moves info for each square, calculated once, when module is imported,
+### so that pieces do not need to calculate neighbour cells and filter off board ones every time
+
+# ex: RAYS[square][TOP] - cells above given square, from nearest to farthest
+RAYS = [
+    [
+        _get_ray(square, func)
+        for func in (
+            _top_square,
+            _bottom_square,
+            _left_square,
+            _right_square,
+            _top_left_square,
+            _top_right_square,
+            _bottom_left_square,
+            _bottom_right_square,
+        )
+    ]
+    for square in range(64)
+]
+
+# cells where knight or king can go from each square
+KNIGHT_TARGETS = [
+    tuple(
+        i
+        for i in [
+            _top_left_square(_top_square(square)),
+            _top_right_square(_top_square(square)),
+            _bottom_left_square(_bottom_square(square)),
+            _bottom_right_square(_bottom_square(square)),
+            _top_left_square(_left_square(square)),
+            _bottom_left_square(_left_square(square)),
+            _top_right_square(_right_square(square)),
+            _bottom_right_square(_right_square(square)),
+        ]
+        if i is not None
+    )
+    for square in range(64)
+]
+KING_TARGETS = [tuple(ray[0] for ray in RAYS[square] if ray) for square in range(64)]
+
+# cells that pawn of given player attacks from each square(top left and top right
+# from this player's point of view)
+PAWN_ATTACKS = {
+    1: [
+        tuple(i for i in [_top_left_square(sq), _top_right_square(sq)] if i is not None)
+        for sq in range(64)
+    ],
+    2: [
+        tuple(
+            i
+            for i in [_bottom_right_square(sq), _bottom_left_square(sq)]
+            if i is not None
+        )
+        for sq in range(64)
+    ],
+}
+
+
+def _get_move_info_new_position(move_info):
+    """
+    Position where move info moves the piece, as it is written in basic notation
+    ex:
+        {"new_square": 28, ...} --> "E4"
+        {"new_square": 60, "promote_into": "Q", ...} --> "E8=Q"
+    """
+    new_position = SQUARES_TO_POSITIONS[move_info["new_square"]]
+
+    if move_info.get("promote_into"):
+        new_position = f"{new_position}={move_info['promote_into']}"
+
+    return new_position
 
-def _left_coords(from_cell) -> str:
-    col, row = from_cell
-    return chr(ord(col) - 1) + row
 
+def _parse_new_position(new_position):
+    """
+    Opposite of _get_move_info_new_position, returns square and letter of
+    piece to promote pawn into(None if it is not a promotion)
+    ex:
+        "E4" --> (28, None)
+        "E8=Q" --> (60, "Q")
+    """
+    if "=" in new_position:
+        new_position, promote_into = new_position.split("=")
+    else:
+        promote_into = None
+
+    return POSITIONS_TO_SQUARES[new_position], promote_into
+
+
+# moves packed into 16-bit numbers(used in game records and opening book files):
+#   bits 0-5: square from which piece moves(0 for A1, 63 for H8)
+#   bits 6-11: square to which piece moves(for castling, king's one)
+#   bits 12-13: piece to promote into(Q, R, B, N), if bit 14 is set
+_PROMOTION_FLAG = 1 << 14
+_PROMOTION_LETTERS = "QRBN"
 
-def _right_coords(from_cell) -> str:
-    col, row = from_cell
-    return chr(ord(col) + 1) + row
 
+def encode_move(from_square, to_square, promote_into=None):
+    encoded_move = from_square | to_square << 6
 
-def _bottom_left_coords(from_cell) -> str:
-    col, row = from_cell
-    return chr(ord(col) - 1) + str(int(row) - 1)
+    if promote_into:
+        encoded_move |= _PROMOTION_FLAG | _PROMOTION_LETTERS.index(promote_into) << 12
 
+    return encoded_move
 
-def _bottom_right_coords(from_cell) -> str:
-    col, row = from_cell
-    return chr(ord(col) + 1) + str(int(row) - 1)
 
+def decode_move(encoded_move):
+    """
+    16-bit number --> (from_square, to_square, promote_into)
+    """
+    promote_into = None
+
+    if encoded_move & _PROMOTION_FLAG:
+        promote_into = _PROMOTION_LETTERS[encoded_move >> 12 & 3]
 
-def _bottom_coords(from_cell) -> str:
-    col, row = from_cell
-    return col + str(int(row) - 1)
+    return encoded_move & 63, encoded_move >> 6 & 63, promote_into
 
 
 def _get_linearly_distant_cells_from_piece_position(
-    piece, positions_to_pieces, linearity_functions
+    piece, squares_to_pieces, directions
 ):
     """
-    Lets say we got cell E4 and 2 linearity functions and 4 functions
-    that get next cells based on top, bottom, left and right positions of current
-    cells respectively, then this function will try to follow from
-    given position cell to given function-orienting cells until it can and
+    Lets say we got cell E4 and 4 directions - top, bottom, left and right, then this
+    function will try to follow from given position cell in each direction until it can and
     return resulting cells to opposite player pieces dictionary that will be useful
     in outer functions that decide where the piece can move.
 
-    We plan to use this function with diagonal functions for Bishop, with straight functions
-    for Rook and with linear and straight functions for Queen.
+    We plan to use this function with diagonal directions for Bishop, with straight directions
+    for Rook and with both of them for Queen.
 
     Having it written on one place is better than having in multiple places, also its usage will be
     super easy from callers.
     """
-    # possible_moves_to_killed_pieces = []
     possible_moves_info = []
 
     # useful, as we can not kill our piece here, but we defend them, so their King cant kill them
     current_player_cells_that_are_defended_by_this_piece = []
 
-    for func_to_apply in linearity_functions:
-        curr_cell = func_to_apply(piece.position)
-
-        for _ in range(7):
-            if not _is_chess_cell_coord(curr_cell):
-                break
+    rays = RAYS[piece.square]
 
+    for direction in directions:
+        for curr_square in rays[direction]:
             # some piece found there
-            if curr_cell in positions_to_pieces:
+            if squares_to_pieces[curr_square] is not None:
                 # it is not our piece
-                if positions_to_pieces[curr_cell].player_number != piece.player_number:
+                if squares_to_pieces[curr_square].player_number != piece.player_number:
 
                     possible_moves_info.append(
                         {
-                            "new_position": curr_cell,
-                            "killed_opponent_piece_position": positions_to_pieces[
-                                curr_cell
-                            ].position,
+                            "new_square": curr_square,
+                            "killed_opponent_piece_square": curr_square,
                         }
                     )
 
                 # defending our piece
                 else:
                     current_player_cells_that_are_defended_by_this_piece.append(
-                        positions_to_pieces[curr_cell]
+                        curr_square
                     )
                 break
             else:
                 possible_moves_info.append(
-                    {"new_position": curr_cell, "killed_opponent_piece_position": None}
+                    {"new_square": curr_square, "killed_opponent_piece_square": None}
                 )
 
-            curr_cell = func_to_apply(curr_cell)
-
     return (
         current_player_cells_that_are_defended_by_this_piece,
         possible_moves_info,
@@ -1,6 +1,7 @@
 import re
 
 from _move_related_functions import (
+    _get_move_info_new_position,
     _is_chess_basic_move_str,
     PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO,
     PIECES_LETTERS_THAT_NEED_THEIR_LETTER_UPPERCASED_IN_CHESS_NOTATION,
@@ -31,34 +32,31 @@ def convert_basic_move_notation_to_chess_notation(
 
     from_cell, to_cell = basic_move_str.upper().split()
 
+    moving_piece_col, moving_piece_row = moving_piece.position
+
     if basic_move_str[-2] == "=":
         # pawn promotion case
-        moving_piece_col, moving_piece_row = moving_piece.position[:2]
         pawn_promotion_suffix = basic_move_str[-2:]
 
     else:
         # normal case
-        moving_piece_col, moving_piece_row = moving_piece.position
         pawn_promotion_suffix = ""
 
     piece_name_prefix = moving_piece.chess_notation_prefix
 
     # kill | x   # inacurate for an pasaunt ?
-    piece_being_killed = move_info.get("killed_opponent_piece_position")
+    piece_being_killed = move_info["killed_opponent_piece_square"]
 
-    kill_prefix = "x" if piece_being_killed else ""
+    kill_prefix = "x" if piece_being_killed is not None else ""
 
     # check | +
-    board_after_move = board_state_before_move.get_deepcopy()
-    copied_piece = board_after_move.positions_to_pieces[moving_piece.position]
-
-    copied_piece.apply_move_info_to_board(
-        board_state=board_after_move,
-        move_info=move_info,
-    )
+    board_state_before_move.push(piece=moving_piece, move_info=move_info)
 
     # check & checkmate signs
-    opponent_troubles_after_move = board_after_move.get_current_player_troubles()
+    opponent_troubles_after_move = board_state_before_move.get_current_player_troubles()
+
+    # restore board, as all calculations below need state before move
+    board_state_before_move.pop()
     check_suffix, checkmate_suffix = "", ""
 
     if opponent_troubles_after_move.get("player_is_checkmated"):
@@ -82,7 +80,7 @@ def convert_basic_move_notation_to_chess_notation(
         pieces_that_can_move_to_new_position = [
             piece
             for piece, moves_infos in possible_moves_info.items()
-            if to_cell in [i["new_position"] for i in moves_infos]
+            if to_cell in [_get_move_info_new_position(i) for i in moves_infos]
         ]
 
         assert len(pieces_that_can_move_to_new_position) > 0
@@ -128,9 +126,9 @@ def convert_chess_notation_to_basic_move_notation(
         "Nf3" --> "G1 F3"
     """
 
-    # special case - short or long castle
-    if chess_notation in ("O-O", "O-O-O"):
-        return chess_notation
+    # special case - short or long castle, maybe with check or checkmate sign
+    if chess_notation.rstrip("+#") in ("O-O", "O-O-O"):
+        return chess_notation.rstrip("+#")
 
     chess_notation_bak = chess_notation
 
@@ -172,7 +170,10 @@ def convert_chess_notation_to_basic_move_notation(
         i
         for i in possible_move_initializer_pieces
         if move_to
-        in [i["new_position"] for i in i.get_possible_moves(board_state_before_move)]
+        in [
+            _get_move_info_new_position(i)
+            for i in i.get_possible_moves(board_state_before_move)
+        ]
     ]
 
     if len(pieces_that_can_move_there) == 0:
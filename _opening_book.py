@@ -0,0 +1,124 @@
+"""
+Opening book - moves played in positions of some games collection, with their results.
+
+Book is kept as dictionary of position hash(see Board.position_hash) to moves played in
+that position, so looking moves up is constant time. On disk it is a header and sorted
+list of fixed size entries:
+    . header
+        - 4 bytes: b"CCOB"
+        - 4 bytes: format version
+        - 4 bytes: number of entries
+    . entries, each one has
+        - 8 bytes: position hash
+        - 2 bytes: move, packed as in _move_related_functions.encode_move
+        - 4 bytes each: number of games with this move, won by player 1, draws,
+                        won by player 2
+
+See opening_book.py for building it from PGN files.
+"""
+
+import struct
+
+MAGIC = b"CCOB"
+VERSION = 1
+
+_HEADER = struct.Struct(">4sII")
+_ENTRY = struct.Struct(">QHIIII")
+
+# results of games as PGN writes them --> index of counter to increase
+_RESULTS_INDICES = {"1-0": 1, "1/2-1/2": 2, "0-1": 3}
+
+
+class OpeningBook:
+    def __init__(self):
+        # position hash --> {encoded move: [games, player 1 wins, draws, player 2 wins]}
+        self._positions = {}
+
+    def add_move(self, position_hash, encoded_move, result=None):
+        """
+        Count move played in given position in a game with given result("1-0", "0-1",
+        "1/2-1/2", anything else for unknown one)
+        """
+        counters = self._positions.setdefault(position_hash, {}).setdefault(
+            encoded_move, [0, 0, 0, 0]
+        )
+
+        counters[0] += 1
+
+        if result in _RESULTS_INDICES:
+            counters[_RESULTS_INDICES[result]] += 1
+
+    def get_moves(self, position_hash):
+        """
+        Moves played in given position as list of tuples:
+            (encoded_move, games, player_1_wins, draws, player_2_wins)
+        most played ones first, empty list if there are none.
+        """
+        moves = self._positions.get(position_hash)
+
+        if not moves:
+            return []
+
+        return sorted(
+            [(encoded_move, *counters) for encoded_move, counters in moves.items()],
+            key=lambda i: (-i[1], i[0]),
+        )
+
+    def remove_rare_moves(self, min_games):
+        """
+        Forget moves played in less than min_games games, they make book big and are
+        mostly mistakes or surprises, not something worth to repeat.
+        """
+        for position_hash in list(self._positions):
+            moves = self._positions[position_hash]
+
+            for encoded_move in [i for i, c in moves.items() if c[0] < min_games]:
+                del moves[encoded_move]
+
+            if not moves:
+                del self._positions[position_hash]
+
+    def save(self, file_path):
+        entries = sorted(
+            (position_hash, encoded_move, *counters)
+            for position_hash, moves in self._positions.items()
+            for encoded_move, counters in moves.items()
+        )
+
+        with open(file_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(entries)))
+
+            for entry in entries:
+                f.write(_ENTRY.pack(*entry))
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{file_path} is not an opening book")
+
+        magic, version, entries_count = _HEADER.unpack_from(data)
+
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or len(data) != _HEADER.size + entries_count * _ENTRY.size
+        ):
+            raise ValueError(f"{file_path} is not an opening book")
+
+        book = cls()
+
+        for position_hash, encoded_move, *counters in _ENTRY.iter_unpack(
+            memoryview(data)[_HEADER.size :]
+        ):
+            book._positions.setdefault(position_hash, {})[encoded_move] = counters
+
+        return book
+
+    def __len__(self):
+        """
+        Number of positions in the book
+        """
+        return len(self._positions)
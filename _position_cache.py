@@ -0,0 +1,72 @@
+"""
+Cache of things calculated for board positions, keyed by Board.position_hash.
+
+When loading games or converting notations, the same position is analysed many times
+(move validation, notation conversion, checks after the move...), so we remember answers
+for recent positions and evict least recently used ones when cache is full.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_POSITION_CACHE_SIZE = 4096
+
+
+class PositionCache:
+    def __init__(self, max_size=DEFAULT_POSITION_CACHE_SIZE):
+        """
+        max_size - how many values to keep at most, 0 disables caching
+        """
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._values = OrderedDict()
+
+    def get(self, position_hash, name):
+        """
+        Return value saved with given name for given position, None if it is not in cache.
+        """
+        if self.max_size <= 0:
+            return None
+
+        key = (position_hash, name)
+        value = self._values.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._values.move_to_end(key)
+
+        return value
+
+    def set(self, position_hash, name, value):
+        if self.max_size <= 0:
+            return
+
+        key = (position_hash, name)
+
+        self._values[key] = value
+        self._values.move_to_end(key)
+
+        if len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def clear(self):
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        return {
+            "enabled": self.max_size > 0,
+            "size": len(self._values),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,206 @@
+"""
+Transposition table - results of already searched positions, by position hash.
+
+The same position is reached by different orders of moves many times during search, and
+again on each depth of iterative deepening, so search saves what it found for each
+position(score, how deep it was searched, best move) and uses it next time.
+
+Entries are packed into one flat buffer of fixed size, so memory does not grow during
+search(dictionaries of move_info for millions of positions would not fit in memory),
+and the buffer can be in shared memory, so that processes of parallel search(see
+parallel_search.py) use one table.
+
+Each entry is 2 64-bit numbers:
+    . position hash XOR-ed with data
+    . data: score(bits 0-31, with 2**31 added to make it positive), best move(bits
+            32-47, encoded as _move_related_functions.encode_move does, 0 if there
+            is none), depth(bits 48-55), bound(bits 56-57), generation(bits 58-63)
+Processes write entries without any locks, so one process may read entry while other
+one writes it and get first number of new entry and second one of old entry. Then hash
+XOR-ed with data does not give position hash anymore, and the entry is just ignored.
+
+Entries are grouped in buckets of 4 entries, position can be saved in any entry of
+its bucket. When bucket is full, entry that is the least useful is replaced: the one
+that was searched less deep, taking into account that entries from previous searches
+(generations) are less useful than new ones.
+"""
+
+import struct
+from multiprocessing import shared_memory
+
+# score is exact, or only known to be at least/at most that much,
+# as search stops looking at moves after cutoff
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+_ENTRY = struct.Struct("<QQ")
+_ENTRIES_IN_BUCKET = 4
+_BUCKET = struct.Struct("<" + "QQ" * _ENTRIES_IN_BUCKET)
+
+_SCORE_OFFSET = 1 << 31
+_GENERATIONS_COUNT = 64
+# how many plies of depth one generation of age is worth, when choosing entry to replace
+_AGE_DEPTH_PENALTY = 8
+
+DEFAULT_SIZE_MB = 16
+
+
+def _pack_data(depth, bound, score, best_move, generation):
+    return (
+        score + _SCORE_OFFSET
+        | (best_move or 0) << 32
+        | depth << 48
+        | bound << 56
+        | generation << 58
+    )
+
+
+def _unpack_data(data):
+    """
+    Returns (depth, bound, score, best_move, generation)
+    """
+    return (
+        data >> 48 & 255,
+        data >> 56 & 3,
+        (data & 0xFFFFFFFF) - _SCORE_OFFSET,
+        data >> 32 & 0xFFFF or None,
+        data >> 58,
+    )
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, shared=False, name=None):
+        """
+        size_mb - size of table in megabytes
+        shared - keep entries in shared memory, so that other processes can
+                use the same table, by creating it with its name
+        name - name of shared memory of existing table to use
+        """
+        self.buckets_count = max(size_mb * 1024 * 1024 // _BUCKET.size, 1)
+        size = self.buckets_count * _BUCKET.size
+
+        self._shared_memory = None
+        self.name = None
+
+        if name is not None:
+            self._shared_memory = shared_memory.SharedMemory(name=name)
+        elif shared:
+            self._shared_memory = shared_memory.SharedMemory(create=True, size=size)
+
+        if self._shared_memory is not None:
+            self.name = self._shared_memory.name
+            self._buffer = self._shared_memory.buf
+        else:
+            self._buffer = memoryview(bytearray(size))
+
+        # increased for each new search, to know which entries are old
+        self.generation = 0
+
+        # statistics of current process only, even for shared table
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        # stores that replaced entry of other position
+        self.replacements = 0
+
+    def new_search(self):
+        """
+        Mark entries saved so far as older ones, and reset statistics
+        """
+        self.generation = (self.generation + 1) % _GENERATIONS_COUNT
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def probe(self, position_hash):
+        """
+        Returns (depth, bound, score, best_move) saved for position, None if there is no
+        entry for it. best_move is encoded move or None.
+        """
+        self.probes += 1
+
+        bucket = _BUCKET.unpack_from(
+            self._buffer, position_hash % self.buckets_count * _BUCKET.size
+        )
+
+        for i in range(0, 2 * _ENTRIES_IN_BUCKET, 2):
+            data = bucket[i + 1]
+
+            if bucket[i] ^ data == position_hash and data:
+                self.hits += 1
+
+                return _unpack_data(data)[:4]
+
+        return None
+
+    def store(self, position_hash, depth, bound, score, best_move):
+        self.stores += 1
+
+        bucket_offset = position_hash % self.buckets_count * _BUCKET.size
+        bucket = _BUCKET.unpack_from(self._buffer, bucket_offset)
+
+        replaced_entry_index = None
+        replaced_entry_value = None
+
+        for entry_index in range(_ENTRIES_IN_BUCKET):
+            checksum, data = bucket[2 * entry_index], bucket[2 * entry_index + 1]
+
+            if not data:
+                replaced_entry_index = entry_index
+                break
+
+            if checksum ^ data == position_hash:
+                # keep best move, if new search of position did not find it
+                best_move = best_move or _unpack_data(data)[3]
+
+                replaced_entry_index = entry_index
+                break
+
+            entry_depth, _, _, _, entry_generation = _unpack_data(data)
+            age = (self.generation - entry_generation) % _GENERATIONS_COUNT
+            value = entry_depth - age * _AGE_DEPTH_PENALTY
+
+            if replaced_entry_value is None or value < replaced_entry_value:
+                replaced_entry_index, replaced_entry_value = entry_index, value
+        else:
+            self.replacements += 1
+
+        data = _pack_data(depth, bound, score, best_move, self.generation)
+
+        _ENTRY.pack_into(
+            self._buffer,
+            bucket_offset + replaced_entry_index * _ENTRY.size,
+            position_hash ^ data,
+            data,
+        )
+
+    def get_stats(self):
+        return {
+            "size_mb": len(self._buffer) / 1024 / 1024,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0,
+            "stores": self.stores,
+            "replacements": self.replacements,
+        }
+
+    def clear(self):
+        self._buffer[:] = bytes(len(self._buffer))
+
+    def close(self, unlink=False):
+        """
+        Stop using shared memory of the table, unlink=True also frees
+        it, which should be done by process that created it.
+        """
+        if self._shared_memory is None:
+            return
+
+        self._shared_memory.close()
+
+        if unlink:
+            self._shared_memory.unlink()
+
+        self._shared_memory = None
@@ -0,0 +1,36 @@
+"""
+Random keys for Zobrist hashing of board positions.
+
+Hash of a position is XOR of keys of everything that is true in it: each piece on its
+square, player 2 being the one to move, each castling right that still exists and the
+column of pawn that can be killed using En passant. So when something changes, hash
+can be updated by XOR-ing just the keys that changed, without looking at whole board.
+
+Keys are generated with fixed seed, so hashes are the same across runs and processes
+and can be saved to files.
+"""
+
+import random
+
+PIECE_NAMES = ("king", "queen", "rook", "bishop", "knight", "pawn")
+
+_random = random.Random(20211101)
+
+PIECE_KEYS = {
+    player_number: {
+        piece_name: [_random.getrandbits(64) for _ in range(64)]
+        for piece_name in PIECE_NAMES
+    }
+    for player_number in (1, 2)
+}
+
+PLAYER_2_TURN_KEY = _random.getrandbits(64)
+
+CASTLING_KEYS = {
+    player_number: {
+        castling_case: _random.getrandbits(64) for castling_case in ("short", "long")
+    }
+    for player_number in (1, 2)
+}
+
+EN_PASSANT_COLUMN_KEYS = [_random.getrandbits(64) for _ in range(8)]
@@ -0,0 +1,200 @@
+"""
+Benchmark that replays real games from pgn file and measures how fast board handles them.
+
+For each game and for all of them together, it reports:
+    . moves per second - for whole replay, including notation conversions
+    . mean and 99-th percentile latency of make_a_move_if_possible calls
+    . time spent converting chess notation moves(like "Nf3") into basic ones("G1 F3")
+    . peak memory used while replaying game(measured in separate run, as
+    tracing memory allocations slows everything down)
+
+Results are written into JSON file, so that they can be compared between commits.
+
+Usage from command line:
+    python benchmark.py
+    python benchmark.py --backend bitboard --games 5 --output results.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from _notation_converters import convert_chess_notation_to_basic_move_notation
+from board import BITBOARD_BACKEND, MAILBOX_BACKEND, Board
+from pgn_reader import read_pgn_games
+
+DEFAULT_PGN_FILE_PATH = "./tests/assets/master_games.pgn"
+DEFAULT_OUTPUT_FILE_PATH = "./benchmark_results.json"
+
+
+def _get_percentile(values, percentile):
+    """
+    Nearest-rank percentile of given values, 0 if there are none
+    """
+    if not values:
+        return 0
+
+    sorted_values = sorted(values)
+    index = max(math.ceil(percentile / 100 * len(sorted_values)) - 1, 0)
+
+    return sorted_values[index]
+
+
+def _get_stats(moves_count, seconds, latencies, notation_conversion_seconds):
+    return {
+        "moves": moves_count,
+        "seconds": seconds,
+        "moves_per_second": moves_count / seconds if seconds else 0,
+        "make_a_move_mean_ms": (
+            sum(latencies) / len(latencies) * 1000 if latencies else 0
+        ),
+        "make_a_move_p99_ms": _get_percentile(latencies, 99) * 1000,
+        "notation_conversion_seconds": notation_conversion_seconds,
+    }
+
+
+def _replay_game(game_moves, backend, latencies=None):
+    """
+    Apply all moves of the game to new board, same way apply_chess_notation_moves does,
+    but measure each step. Returns time spent on notation conversions.
+    """
+    board = Board(backend=backend)
+    notation_conversion_seconds = 0
+
+    for moves in game_moves:
+        for move in moves:
+            start_time = time.perf_counter()
+            basic_move_str = convert_chess_notation_to_basic_move_notation(move, board)
+            notation_conversion_seconds += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            success, errors, _ = board.make_a_move_if_possible(basic_move_str)
+
+            if latencies is not None:
+                latencies.append(time.perf_counter() - start_time)
+
+            if not success:
+                raise ValueError(f"Move {move} could not be applied: {errors}")
+
+    return notation_conversion_seconds
+
+
+def benchmark_game(game_moves, backend=MAILBOX_BACKEND):
+    """
+    Replay one game and return its measurements, plus list of all move latencies,
+    which are needed to calculate percentiles for all games together.
+    """
+    latencies = []
+
+    start_time = time.perf_counter()
+    notation_conversion_seconds = _replay_game(game_moves, backend, latencies)
+    seconds = time.perf_counter() - start_time
+
+    stats = _get_stats(len(latencies), seconds, latencies, notation_conversion_seconds)
+
+    tracemalloc.start()
+    _replay_game(game_moves, backend)
+    stats["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return stats, latencies
+
+
+def _get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    pgn_file_path=DEFAULT_PGN_FILE_PATH, backend=MAILBOX_BACKEND, games_limit=None
+):
+    games_stats = []
+    all_latencies = []
+    total_seconds = 0
+    total_notation_conversion_seconds = 0
+
+    with open(pgn_file_path) as f:
+        for game in itertools.islice(read_pgn_games(f), games_limit):
+            # nothing to measure, like games with only headers
+            if not game["moves"]:
+                continue
+
+            stats, latencies = benchmark_game(game["moves"], backend)
+
+            games_stats.append(stats)
+            all_latencies.extend(latencies)
+            total_seconds += stats["seconds"]
+            total_notation_conversion_seconds += stats["notation_conversion_seconds"]
+
+    total_stats = _get_stats(
+        len(all_latencies),
+        total_seconds,
+        all_latencies,
+        total_notation_conversion_seconds,
+    )
+    total_stats["peak_memory_bytes"] = max(
+        (i["peak_memory_bytes"] for i in games_stats), default=0
+    )
+
+    return {
+        "pgn_file": pgn_file_path,
+        "backend": backend,
+        "git_commit": _get_git_commit(),
+        "python_version": platform.python_version(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "total": total_stats,
+        "games": games_stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay games from pgn file and measure board performance"
+    )
+    parser.add_argument("--pgn", default=DEFAULT_PGN_FILE_PATH)
+    parser.add_argument(
+        "--backend",
+        choices=(MAILBOX_BACKEND, BITBOARD_BACKEND),
+        default=MAILBOX_BACKEND,
+    )
+    parser.add_argument(
+        "--games", type=int, default=None, help="use only first N games"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE_PATH)
+
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        pgn_file_path=args.pgn, backend=args.backend, games_limit=args.games
+    )
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    total = results["total"]
+
+    print(f"Games: {len(results['games'])}, moves: {total['moves']}")
+    print(f"Moves/second: {total['moves_per_second']:.1f}")
+    print(
+        f"make_a_move_if_possible latency: mean {total['make_a_move_mean_ms']:.3f}ms, "
+        f"p99 {total['make_a_move_p99_ms']:.3f}ms"
+    )
+    print(f"Notation conversion: {total['notation_conversion_seconds']:.3f}s")
+    print(f"Peak memory: {total['peak_memory_bytes'] / 1024:.1f}KiB")
+    print(f"Results saved in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
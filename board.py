@@ -1,11 +1,32 @@
 import copy
 import os
+from collections.abc import Mapping
+from types import MappingProxyType
 
 from rich import print
 
+import _bitboards
+import _evaluation
+import _zobrist
+from _endgame_tablebase import MAX_PIECES as MAX_ENDGAME_TABLEBASE_PIECES
+from _endgame_tablebase import has_insufficient_material
+from _position_cache import DEFAULT_POSITION_CACHE_SIZE, PositionCache
 from _move_related_functions import (
+    BISHOP_DIRECTIONS,
+    POSITIONS_TO_SQUARES,
+    KING_TARGETS,
+    KNIGHT_TARGETS,
+    PAWN_ATTACKS,
+    QUEEN_DIRECTIONS,
+    RAYS,
+    ROOK_DIRECTIONS,
+    SQUARES_TO_POSITIONS,
+    _get_move_info_new_position,
     _is_chess_basic_move_str,
     _is_chess_notation_move_str,
+    _parse_new_position,
+    decode_move,
+    encode_move,
 )
 from _notation_converters import (
     convert_basic_move_notation_to_chess_notation,
@@ -17,6 +38,112 @@ INVALID_MOVE_ERROR_TEXT = "Invalid move"
 NOT_A_CHESS_MOVE_ERROR_TEXT = "Not a chess move"
 PLAYER_TURN_SYMBOL = "⬤"
 
+# cells used when castling for player 1, as square indices. For player 2 they
+# are the same, just on 8-th row, so 56 needs to be added to each of them
+_CASTLING_SQUARES = {
+    # rook moves from H1 to F1, king from E1 to G1, passing F1
+    "short": {
+        "rook_from": 7,
+        "rook_to": 5,
+        "king_to": 6,
+        "king_passes": 5,
+        "must_be_free": (5, 6),
+    },
+    # rook moves from A1 to D1, king from E1 to C1, passing D1
+    "long": {
+        "rook_from": 0,
+        "rook_to": 3,
+        "king_to": 2,
+        "king_passes": 3,
+        "must_be_free": (3, 2, 1),
+    },
+}
+
+# ways board can generate moves and find checks
+MAILBOX_BACKEND = "mailbox"
+BITBOARD_BACKEND = "bitboard"
+
+STARTING_POSITION_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# ways game can be finished, see get_game_status
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+THREEFOLD_REPETITION = "threefold_repetition"
+FIFTY_MOVE_RULE = "fifty_move_rule"
+INSUFFICIENT_MATERIAL = "insufficient_material"
+# messages to show when game finishes with a draw
+DRAW_MESSAGES = {
+    STALEMATE: "Stalemate, it is a draw!",
+    THREEFOLD_REPETITION: "Threefold repetition, it is a draw!",
+    FIFTY_MOVE_RULE: "Fifty-move rule, it is a draw!",
+    INSUFFICIENT_MATERIAL: "Insufficient material, it is a draw!",
+}
+
+# halfmove clock value at which game is a draw
+FIFTY_MOVE_RULE_HALFMOVES = 100
+
+# letters of pieces in FEN, for player 1, for player 2 they are lowercased
+_FEN_LETTERS_TO_PIECE_CLASSES = {
+    "K": King,
+    "Q": Queen,
+    "R": Rook,
+    "B": Bishop,
+    "N": Knight,
+    "P": Pawn,
+}
+_PIECE_NAMES_TO_FEN_LETTERS = {
+    piece_class.__name__.lower(): letter
+    for letter, piece_class in _FEN_LETTERS_TO_PIECE_CLASSES.items()
+}
+# castling rights in FEN order
+_FEN_LETTERS_TO_CASTLING_RIGHTS = {
+    "K": (1, "short"),
+    "Q": (1, "long"),
+    "k": (2, "short"),
+    "q": (2, "long"),
+}
+
+# values of pieces in centipawns, king can not be exchanged, so its value is only
+# used when it kills something and all other pieces are tried before it
+PIECE_VALUES = {
+    "pawn": 100,
+    "knight": 320,
+    "bishop": 330,
+    "rook": 500,
+    "queen": 900,
+    "king": 20000,
+}
+
+
+class _IndexBasedPositionsToPieces(Mapping):
+    """
+    Read-only view of board squares, that uses (row_index, col_index) tuples
+    as keys, like Piece.index_based_position property returns them.
+    """
+
+    def __init__(self, squares):
+        self._squares = squares
+
+    def __getitem__(self, index_based_position):
+        row_index, col_index = index_based_position
+        piece = None
+
+        if 0 <= row_index <= 7 and 0 <= col_index <= 7:
+            piece = self._squares[(7 - row_index) * 8 + col_index]
+
+        if piece is None:
+            raise KeyError(index_based_position)
+
+        return piece
+
+    def __iter__(self):
+        for square, piece in enumerate(self._squares):
+            if piece is not None:
+                yield 7 - square // 8, square % 8
+
+    def __len__(self):
+        return len([i for i in self._squares if i is not None])
+
 
 class Board:
     def __init__(
@@ -26,7 +153,31 @@ class Board:
         black_cell_color="grey58",
         white_cell_color="grey37",
         previous_move_cell_color="green4",
+        backend=MAILBOX_BACKEND,
+        position_cache_size=DEFAULT_POSITION_CACHE_SIZE,
+        opening_book=None,
+        endgame_tablebase=None,
     ):
+        """
+        backend argument decides how moves are generated and checks found:
+            . "mailbox" - each piece class walks cells around it
+            . "bitboard" - pieces of each type are also kept as 64-bit numbers and
+                        attacks are calculated with bit shifts and masks
+        Both of them give the same results through all public methods of the board.
+
+        position_cache_size - how many answers(legal moves, checks) for recently seen
+        positions to remember, 0 disables caching. See position_cache attribute for stats.
+
+        opening_book - OpeningBook(see opening_book.py) to get book_moves from
+
+        endgame_tablebase - EndgameTablebase(see endgame_tablebase.py) to get perfect
+        results of positions with few pieces from
+        """
+        if backend not in (MAILBOX_BACKEND, BITBOARD_BACKEND):
+            raise ValueError(f"Unknown backend {backend}")
+
+        self.backend = backend
+
         # colors to draw player pieces
         self.p1_color = p1_color
         self.p2_color = p2_color
@@ -42,6 +193,16 @@ class Board:
         self.player_1_pieces = []
         self.player_2_pieces = []
 
+        # pieces on board, for each of 64 squares(None if empty) and for each
+        # position like "E2", kept up to date when pieces move, get killed or promoted
+        self._squares = [None] * 64
+        self._positions_to_pieces = {}
+
+        # for bitboard backend only, bitboards of each piece type
+        # of each player and all squares taken by each player
+        self._bitboards = None
+        self._occupied_squares = None
+
         # holds who killed what info
         self.killed_opponent_pieces = {1: [], 2: []}
 
@@ -57,11 +218,48 @@ class Board:
         self._player_turn = 1
 
         self.total_moves_count = 0
+        # moves since last pawn move or kill, for fifty-move rule, and number of
+        # full move(starts from 1 and increases after player 2 moves), as in FEN
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        # position from which moves histories start
+        self.starting_fen = STARTING_POSITION_FEN
         # stores moves with just starting and ending cells, like [ ["E2 E4", "G8 F6"], ]
         self.moves = []
         # stores moves with chess notation like [ ["e4", "Nf6"], ]
         self.chess_notation_moves = []
 
+        # stores information needed to undo moves applied using push method
+        self._pushed_moves_info = []
+
+        # position hashes of starting position and position after each move(including
+        # ones applied using push method), and how many times each of them is there,
+        # so repetitions are known without looking through moves histories
+        self._position_history = []
+        self._position_history_counts = {}
+
+        # legal moves and checks of recently seen positions, by position hash
+        self.position_cache = PositionCache(max_size=position_cache_size)
+
+        self.opening_book = opening_book
+        self.endgame_tablebase = endgame_tablebase
+
+        # Zobrist hash of current position, see position_hash property
+        self._position_hash = 0
+        # set of (player_number, castling_case) pairs for castlings that are still possible
+        # in the game, if not now, then later, when cells between king and rook are free
+        self._castling_rights = frozenset()
+        # square of pawn that just moved 2 cells forward and can be killed using En passant
+        self._en_passant_victim_square = None
+        # En passant key that is currently XOR-ed in position hash, 0 if there is none
+        self._en_passant_hash_key = 0
+
+        # sums of middlegame and endgame scores of all pieces(from player 1 point of
+        # view) and game phase, updated together with position hash, see evaluate
+        self._middlegame_score = 0
+        self._endgame_score = 0
+        self._game_phase = 0
+
         self._initialize_pieces()
 
     def __repr__(self):
@@ -136,6 +334,112 @@ class Board:
     def get_deepcopy(self):
         return copy.deepcopy(self)
 
+    def push(self, piece, move_info, swap_player_turn=True):
+        """
+        Apply move_info of given piece to the board, like piece.apply_move_info_to_board does,
+        but also remember everything that changes, so that pop method can restore previous
+        board state later.
+
+        This allows to check what happens after some move (for example, does it leave our king
+        checked?) without making copy of the whole board for every single move.
+
+        Moves applied this way are not added into moves histories, it is not a replacement
+        for make_a_move_if_possible method.
+        """
+        killed_piece = None
+
+        if move_info["killed_opponent_piece_square"] is not None:
+            killed_piece = self._squares[move_info["killed_opponent_piece_square"]]
+
+        rook, rook_square, rook_moves_count = None, None, None
+
+        if move_info.get("additional_movements"):
+            rook = self._squares[move_info["additional_movements"]["from"]]
+            rook_square, rook_moves_count = rook.square, rook.moves_count
+
+        undo_info = {
+            "piece": piece,
+            "square": piece.square,
+            "moves_count": piece.moves_count,
+            "killed_piece": killed_piece,
+            "rook": rook,
+            "rook_square": rook_square,
+            "rook_moves_count": rook_moves_count,
+            "player_turn": self._player_turn,
+            "position_hash": self._position_hash,
+            "castling_rights": self._castling_rights,
+            "en_passant_victim_square": self._en_passant_victim_square,
+            "en_passant_hash_key": self._en_passant_hash_key,
+            "halfmove_clock": self.halfmove_clock,
+            "fullmove_number": self.fullmove_number,
+            "added_to_position_history": swap_player_turn,
+            # pieces lists are never changed in place, kills and promotions create new
+            # lists, so keeping references to current ones is enough to restore them
+            "player_1_pieces": self.player_1_pieces,
+            "player_2_pieces": self.player_2_pieces,
+        }
+
+        piece.apply_move_info_to_board(
+            board_state=self,
+            move_info=move_info,
+            swap_player_turn=swap_player_turn,
+        )
+
+        self._pushed_moves_info.append(undo_info)
+
+    def pop(self):
+        """
+        Undo last move applied using push method and return its piece.
+        """
+        undo_info = self._pushed_moves_info.pop()
+
+        piece = undo_info["piece"]
+
+        # in case of promotion, this removes promoted piece from the index
+        self._remove_piece_from_index(piece)
+
+        # set square directly to not increase moves count again
+        piece.square = undo_info["square"]
+        piece.moves_count = undo_info["moves_count"]
+
+        self._add_piece_to_index(piece)
+
+        if undo_info["rook"]:
+            rook = undo_info["rook"]
+
+            self._remove_piece_from_index(rook)
+
+            rook.square = undo_info["rook_square"]
+            rook.moves_count = undo_info["rook_moves_count"]
+
+            self._add_piece_to_index(rook)
+
+        if undo_info["killed_piece"]:
+            killer_player_number = 3 - undo_info["killed_piece"].player_number
+            self.killed_opponent_pieces[killer_player_number].pop()
+
+            self._add_piece_to_index(undo_info["killed_piece"])
+
+        # this also removes promoted piece if there was any
+        self.player_1_pieces = undo_info["player_1_pieces"]
+        self.player_2_pieces = undo_info["player_2_pieces"]
+
+        self._player_turn = undo_info["player_turn"]
+
+        self._castling_rights = undo_info["castling_rights"]
+        self._en_passant_victim_square = undo_info["en_passant_victim_square"]
+        self._en_passant_hash_key = undo_info["en_passant_hash_key"]
+        self.halfmove_clock = undo_info["halfmove_clock"]
+        self.fullmove_number = undo_info["fullmove_number"]
+
+        if undo_info["added_to_position_history"]:
+            self._remove_last_position_from_history()
+
+        # restore it last, as index changes above also update it
+        self._position_hash = undo_info["position_hash"]
+
+        return piece
+
     @property
     def current_player_pieces(self):
         return [self.player_2_pieces, self.player_1_pieces][self._player_turn == 1]
@@ -154,22 +458,220 @@ class Board:
 
     @property
     def index_based_positions_to_pieces(self):
-        index_based_positions_to_pieces = {
-            i.index_based_position: i
-            for i in [*self.player_1_pieces, *self.player_2_pieces]
-        }
-
-        return index_based_positions_to_pieces
+        return _IndexBasedPositionsToPieces(self._squares)
 
     @property
     def positions_to_pieces(self):
-        positions_to_pieces = {}
+        return MappingProxyType(self._positions_to_pieces)
+
+    @property
+    def position_hash(self):
+        """
+        64-bit Zobrist hash of current position.
+
+        It covers pieces placement, player whose turn it is, castling rights and
+        column of pawn that can be killed using En passant, and is updated on each change
+        of them, so getting it costs nothing. Same positions have the same hash no
+        matter how we got there, even across runs, as keys are generated with fixed seed.
+        """
+        return self._position_hash
+
+    def evaluate(self):
+        """
+        Score of current position for current player, in centipawns: material and
+        places of pieces(see _evaluation.py), positive if current player is better.
+
+        It is updated when pieces move, get killed or promoted, so getting it costs
+        nothing, which matters for search, as it evaluates lots of positions.
+        """
+        score = _evaluation.get_tapered_score(
+            self._middlegame_score, self._endgame_score, self._game_phase
+        )
+
+        return score if self._player_turn == 1 else -score
+
+    def _add_piece_to_index(self, piece):
+        square = piece.square
+
+        self._positions_to_pieces[SQUARES_TO_POSITIONS[square]] = piece
+        self._squares[square] = piece
+        self._position_hash ^= _zobrist.PIECE_KEYS[piece.player_number][
+            piece.piece_name
+        ][square]
+
+        self._middlegame_score += _evaluation.MIDDLEGAME_SCORES[piece.player_number][
+            piece.piece_name
+        ][square]
+        self._endgame_score += _evaluation.ENDGAME_SCORES[piece.player_number][
+            piece.piece_name
+        ][square]
+        self._game_phase += _evaluation.GAME_PHASE_INCREMENTS[piece.piece_name]
+
+        if self._bitboards is not None:
+            self._bitboards[piece.player_number][piece.piece_name] |= 1 << square
+            self._occupied_squares[piece.player_number] |= 1 << square
+
+    def _remove_piece_from_index(self, piece):
+        """
+        Remove piece that stands on given piece position from index,
+        which may be other piece than given one, when pawn is being promoted.
+        """
+        square = piece.square
+
+        piece = self._squares[square]
+        self._squares[square] = None
+        del self._positions_to_pieces[SQUARES_TO_POSITIONS[square]]
+        self._position_hash ^= _zobrist.PIECE_KEYS[piece.player_number][
+            piece.piece_name
+        ][square]
+
+        self._middlegame_score -= _evaluation.MIDDLEGAME_SCORES[piece.player_number][
+            piece.piece_name
+        ][square]
+        self._endgame_score -= _evaluation.ENDGAME_SCORES[piece.player_number][
+            piece.piece_name
+        ][square]
+        self._game_phase -= _evaluation.GAME_PHASE_INCREMENTS[piece.piece_name]
+
+        if self._bitboards is not None:
+            self._bitboards[piece.player_number][piece.piece_name] ^= 1 << square
+            self._occupied_squares[piece.player_number] ^= 1 << square
+
+    def _rebuild_pieces_index(self):
+        self._squares = [None] * 64
+        self._positions_to_pieces = {}
+        self._position_hash = 0
+        self._middlegame_score = 0
+        self._endgame_score = 0
+        self._game_phase = 0
+
+        if self.backend == BITBOARD_BACKEND:
+            self._bitboards = _bitboards.get_empty_bitboards()
+            self._occupied_squares = {1: 0, 2: 0}
 
-        # assign each chess position string to corresponding piece
         for piece in [*self.player_1_pieces, *self.player_2_pieces]:
-            positions_to_pieces[piece.position] = piece
+            self._add_piece_to_index(piece)
+
+        if self._player_turn == 2:
+            self._position_hash ^= _zobrist.PLAYER_2_TURN_KEY
+
+        # start with all castling rights and keep ones that are still possible
+        self._castling_rights = frozenset()
+
+        for player_number in (1, 2):
+            for castling_case in ("short", "long"):
+                self._castling_rights |= {(player_number, castling_case)}
+                self._position_hash ^= _zobrist.CASTLING_KEYS[player_number][
+                    castling_case
+                ]
+
+        self._update_castling_rights()
+
+        en_passant_victim_square = self._en_passant_victim_square
+        self._en_passant_victim_square, self._en_passant_hash_key = None, 0
+        self._set_en_passant_victim_square(en_passant_victim_square)
+
+    def _reset_position_history(self):
+        self._position_history = [self._position_hash]
+        self._position_history_counts = {self._position_hash: 1}
+
+    def _add_position_to_history(self):
+        """
+        Remember current position, called after each move
+        """
+        self._position_history.append(self._position_hash)
+        self._position_history_counts[self._position_hash] = (
+            self._position_history_counts.get(self._position_hash, 0) + 1
+        )
+
+    def _remove_last_position_from_history(self):
+        position_hash = self._position_history.pop()
+
+        if self._position_history_counts[position_hash] == 1:
+            del self._position_history_counts[position_hash]
+        else:
+            self._position_history_counts[position_hash] -= 1
+
+    def _has_castling_right(self, player_number, castling_case):
+        """
+        King and rook of that castling must have not moved yet(and rook not killed)
+        """
+        row_start_square = 0 if player_number == 1 else 56
+
+        king = self._squares[row_start_square + 4]
+        rook = self._squares[
+            row_start_square + _CASTLING_SQUARES[castling_case]["rook_from"]
+        ]
+
+        for piece, piece_name in ((king, "king"), (rook, "rook")):
+            if (
+                piece is None
+                or piece.piece_name != piece_name
+                or piece.player_number != player_number
+                or piece.moves_count != 0
+            ):
+                return False
+
+        return True
+
+    def _update_castling_rights(self):
+        """
+        Remove castling rights that are lost after last move, from rights and hash.
+        """
+        # rights can only be lost, so when nothing is left, there is nothing to do
+        if not self._castling_rights:
+            return
+
+        lost_castling_rights = {
+            i for i in self._castling_rights if not self._has_castling_right(*i)
+        }
+
+        for player_number, castling_case in lost_castling_rights:
+            self._position_hash ^= _zobrist.CASTLING_KEYS[player_number][castling_case]
+
+        if lost_castling_rights:
+            self._castling_rights = self._castling_rights - lost_castling_rights
+
+    def _set_en_passant_victim_square(self, square):
+        """
+        Remember pawn that just moved 2 cells forward(or None) and update position hash.
+
+        Its column is added into hash only if there is opponent pawn next to it, so
+        positions where En passant is not possible at all do not differ from the same
+        positions without that 2 cells move.
+        """
+        self._position_hash ^= self._en_passant_hash_key
+        self._en_passant_victim_square = square
+        self._en_passant_hash_key = 0
+
+        if square is None:
+            return
+
+        victim = self._squares[square]
+        column = square % 8
+
+        for neighbour_square in (square - 1, square + 1):
+            # neighbour must be on the same row
+            if neighbour_square // 8 != square // 8:
+                continue
+
+            neighbour = self._squares[neighbour_square]
 
-        return positions_to_pieces
+            if (
+                neighbour is not None
+                and neighbour.piece_name == "pawn"
+                and neighbour.player_number != victim.player_number
+            ):
+                self._en_passant_hash_key = _zobrist.EN_PASSANT_COLUMN_KEYS[column]
+                self._position_hash ^= self._en_passant_hash_key
+                return
+
+    def _move_piece_on_board(self, piece, new_square):
+        self._remove_piece_from_index(piece)
+
+        piece.move_to_square(new_square)
+
+        self._add_piece_to_index(piece)
 
     @property
     def _current_player_has_active_check(self):
@@ -179,51 +681,22 @@ class Board:
         self, castling_case="short"
     ):
         """
-        return rooks old and new positions, if castling can be done, None otherwise
+        return rooks old and new squares, if castling can be done, None otherwise
         """
         assert castling_case in ("short", "long")
 
-        positions_info = {
-            "short": {
-                1: "H1",
-                2: "H8",
-            },
-            "long": {
-                1: "A1",
-                2: "A8",
-            },
-        }
+        castling_squares = _CASTLING_SQUARES[castling_case]
+        row_start_square = 0 if self._player_turn == 1 else 56
+
+        piece = self._squares[row_start_square + castling_squares["rook_from"]]
 
-        # make sure cells between Rook and King are free
-        # check only B column here as 2 cells from King sides are checked in king check method
         if (
-            castling_case == "long"
-            and {1: "B1", 2: "B8"}[self._player_turn] in self.positions_to_pieces
+            piece is not None
+            and piece.piece_name == "rook"
+            and piece.moves_count == 0
+            and piece.player_number == self._player_turn
         ):
-            return None
-
-        position_to_expect_rook_on = positions_info[castling_case][self._player_turn]
-
-        if position_to_expect_rook_on in self.positions_to_pieces:
-            piece = self.positions_to_pieces[position_to_expect_rook_on]
-
-            if (
-                piece.piece_name == "rook"
-                and piece.moves_count == 0
-                and piece.player_number == self._player_turn
-            ):
-                position_if_castled = {
-                    "short": {
-                        1: "F1",
-                        2: "F8",
-                    },
-                    "long": {
-                        1: "D1",
-                        2: "D8",
-                    },
-                }[castling_case][self._player_turn]
-
-                return piece.position, position_if_castled
+            return piece.square, row_start_square + castling_squares["rook_to"]
 
         return None
 
@@ -231,7 +704,7 @@ class Board:
         self, castling_case="short"
     ):
         """
-        Return kings new position, if castling can be done, None otherwise
+        Return kings new square, if castling can be done, None otherwise
         """
         assert castling_case in ("short", "long")
 
@@ -242,66 +715,45 @@ class Board:
         if king.moves_count > 0 or self._current_player_has_active_check:
             return None
 
-        # make sure cells that castling needs are free
-        taken_positions = self.positions_to_pieces
-        for i in {
-            "short": {
-                1: ["F1", "G1"],
-                2: ["F8", "G8"],
-            },
-            "long": {
-                1: ["D1", "C1"],
-                2: ["D8", "C8"],
-            },
-        }[castling_case][self._player_turn]:
-
-            if i in taken_positions:
+        castling_squares = _CASTLING_SQUARES[castling_case]
+        row_start_square = 0 if self._player_turn == 1 else 56
+
+        # make sure cells between Rook and King are free
+        for square in castling_squares["must_be_free"]:
+            if self._squares[row_start_square + square] is not None:
                 return None
 
-        # check cells nearby, are they free from checks?
-        cells_info = {
-            "short": {
-                1: "F1",
-                2: "F8",
-            },
-            "long": {
-                1: "D1",
-                2: "D8",
-            },
-        }
+        # check cell nearby, is it free from checks?
 
         # checking 1 cell for checks is enough here, as we check current
         # cell before this steps and king position after castle ends in
         # outer function that in general removes technically possible moves
         # from possible moves if after the move check is present
-        cell = cells_info[castling_case][self._player_turn]
 
         # king must not have checks not only before and after, but also
-        # in between those as well, so check for this
-        copied_board_state = self.get_deepcopy()
-        copied_king = copied_board_state.positions_to_pieces[king.position]
-
-        copied_king.apply_move_info_to_board(
-            board_state=copied_board_state,
-            move_info={"new_position": cell, "killed_opponent_piece_position": None},
-            swap_player_turn=False,
-        )
-
-        if copied_board_state._current_player_has_active_check:
+        # in between those as well, so check for this.
+        # King itself can not hide that cell from attacks, as then it would
+        # already have check, so we do not need to move it there first
+        if self.is_square_attacked(
+            row_start_square + castling_squares["king_passes"],
+            by_player_number=3 - self._player_turn,
+        ):
             return None
 
-        king_position_if_castled = {
-            "short": {
-                1: "G1",
-                2: "G8",
-            },
-            "long": {
-                1: "C1",
-                2: "C8",
-            },
-        }[castling_case][self._player_turn]
+        return row_start_square + castling_squares["king_to"]
 
-        return king_position_if_castled
+    def _get_en_passant_victim_square(self):
+        """
+        If opponent just moved pawn 2 cells forward, return its square, as current
+        player pawns next to it can kill it using En passant, None otherwise.
+        """
+        square = self._en_passant_victim_square
+
+        # when move is applied without swapping turns, it is our own pawn
+        if square is None or self._squares[square].player_number == self._player_turn:
+            return None
+
+        return square
 
     def get_current_player_pieces_with_piece_prefix(self, chess_notation):
         """
@@ -326,6 +778,8 @@ class Board:
         else:
             self._player_turn = 1
 
+        self._position_hash ^= _zobrist.PLAYER_2_TURN_KEY
+
     def _add_temporary_error(self, error_text):
         self.errors_to_display.append(error_text)
 
@@ -343,8 +797,9 @@ class Board:
         """
         self._update_last_move_on_board_info(_from=last_move_from, _to=last_move_to)
 
-        # first player adds new move item in histories
-        if self.total_moves_count % 2 == 0:
+        # first player adds new move item in histories, as well as second one,
+        # if game started from position where it moves first(see from_fen)
+        if self._player_turn == 1 or not self.moves:
             self.moves.append([])
             self.chess_notation_moves.append([])
 
@@ -377,6 +832,219 @@ class Board:
 
         self.total_moves_count += 1
 
+    @classmethod
+    def from_fen(cls, fen, **kwargs):
+        """
+        Create board with position given in FEN notation, like:
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        Other arguments are passed to Board itself, like backend or colors.
+
+        Board keeps castling rights as moves counts of kings and rooks, so kings and rooks
+        that can castle get moves count 0, other kings and rooks(or all pawns not on their
+        starting rows) get 1. Moves histories start empty.
+        """
+        board = cls(**kwargs)
+        board._set_position_from_fen(fen)
+
+        return board
+
+    def _set_position_from_fen(self, fen):
+        fields = fen.split()
+
+        # move counters are sometimes omitted
+        if len(fields) == 4:
+            fields += ["0", "1"]
+
+        if len(fields) != 6:
+            raise ValueError(f"Invalid FEN {fen}")
+
+        placement, player_turn, castling_rights, en_passant_cell, halfmove, fullmove = (
+            fields
+        )
+
+        rows = placement.split("/")
+
+        if (
+            len(rows) != 8
+            or player_turn not in ("w", "b")
+            or castling_rights != "-"
+            and not set(castling_rights) <= set(_FEN_LETTERS_TO_CASTLING_RIGHTS)
+            or not halfmove.isdigit()
+            or not fullmove.isdigit()
+        ):
+            raise ValueError(f"Invalid FEN {fen}")
+
+        castling_rights = {
+            _FEN_LETTERS_TO_CASTLING_RIGHTS[i] for i in castling_rights.replace("-", "")
+        }
+
+        player_1_pieces, player_2_pieces = [], []
+
+        # FEN starts from 8-th row
+        for row_index, row in enumerate(rows):
+            square = (7 - row_index) * 8
+            next_row_start_square = square + 8
+
+            for letter in row:
+                if letter in "12345678":
+                    square += int(letter)
+                    continue
+
+                if (
+                    letter.upper() not in _FEN_LETTERS_TO_PIECE_CLASSES
+                    or square >= next_row_start_square
+                ):
+                    raise ValueError(f"Invalid FEN {fen}")
+
+                # pawns are promoted when they get there, moves of pawns expect it
+                if letter in "Pp" and row_index in (0, 7):
+                    raise ValueError(
+                        f"Invalid FEN {fen}, pawns can not be on first or last row"
+                    )
+
+                player_number = 1 if letter.isupper() else 2
+
+                piece = _FEN_LETTERS_TO_PIECE_CLASSES[letter.upper()](
+                    color=self.p1_color if player_number == 1 else self.p2_color,
+                    position=SQUARES_TO_POSITIONS[square],
+                    player_number=player_number,
+                )
+
+                [player_1_pieces, player_2_pieces][player_number - 1].append(piece)
+                square += 1
+
+            if square != next_row_start_square:
+                raise ValueError(f"Invalid FEN {fen}")
+
+        for player_number, pieces in ((1, player_1_pieces), (2, player_2_pieces)):
+            if len([i for i in pieces if i.piece_name == "king"]) != 1:
+                raise ValueError(f"Invalid FEN {fen}, each player needs one king")
+
+            # as if pieces that can not castle or make 2 cells move have moved already
+            row_start_square = 0 if player_number == 1 else 56
+            pawns_row = 1 if player_number == 1 else 6
+
+            castling_squares = {
+                row_start_square + _CASTLING_SQUARES[castling_case]["rook_from"]
+                for i, castling_case in castling_rights
+                if i == player_number
+            }
+
+            if castling_squares:
+                castling_squares.add(row_start_square + 4)
+
+            for piece in pieces:
+                if piece.piece_name in ("king", "rook"):
+                    piece.moves_count = int(piece.square not in castling_squares)
+                elif piece.piece_name == "pawn":
+                    piece.moves_count = int(piece.square // 8 != pawns_row)
+
+        en_passant_victim_square = None
+
+        if en_passant_cell != "-":
+            en_passant_cell = en_passant_cell.upper()
+
+            if (
+                en_passant_cell not in POSITIONS_TO_SQUARES
+                or en_passant_cell[1] != {"w": "6", "b": "3"}[player_turn]
+            ):
+                raise ValueError(f"Invalid FEN {fen}")
+
+            # pawn that moved 2 cells forward stands just after that cell
+            en_passant_victim_square = POSITIONS_TO_SQUARES[en_passant_cell] + (
+                -8 if player_turn == "w" else 8
+            )
+
+        self.player_1_pieces = player_1_pieces
+        self.player_2_pieces = player_2_pieces
+        self.killed_opponent_pieces = {1: [], 2: []}
+
+        self._player_turn = 1 if player_turn == "w" else 2
+        self.halfmove_clock = int(halfmove)
+        self.fullmove_number = int(fullmove)
+
+        self.total_moves_count = 0
+        self.moves = []
+        self.chess_notation_moves = []
+        self._from_cell, self._to_cell = None, None
+        self._pushed_moves_info = []
+
+        self._en_passant_victim_square = en_passant_victim_square
+        self._rebuild_pieces_index()
+        self._reset_position_history()
+
+        self.starting_fen = fen
+
+        if self._castling_rights != castling_rights:
+            raise ValueError(
+                f"Invalid FEN {fen}, castling rights do not match pieces placement"
+            )
+
+        victim = (
+            self._squares[en_passant_victim_square]
+            if en_passant_victim_square is not None
+            else None
+        )
+
+        if en_passant_victim_square is not None and (
+            victim is None
+            or victim.piece_name != "pawn"
+            or victim.player_number == self._player_turn
+        ):
+            raise ValueError(f"Invalid FEN {fen}, no pawn to kill using En passant")
+
+    def to_fen(self):
+        """
+        Current position in FEN notation, see from_fen
+        """
+        rows = []
+
+        for row_index in range(7, -1, -1):
+            row = ""
+            empty_cells = 0
+
+            for piece in self._squares[row_index * 8 : row_index * 8 + 8]:
+                if piece is None:
+                    empty_cells += 1
+                    continue
+
+                if empty_cells:
+                    row += str(empty_cells)
+                    empty_cells = 0
+
+                letter = _PIECE_NAMES_TO_FEN_LETTERS[piece.piece_name]
+                row += letter if piece.player_number == 1 else letter.lower()
+
+            if empty_cells:
+                row += str(empty_cells)
+
+            rows.append(row)
+
+        castling_rights = "".join(
+            letter
+            for letter, castling_right in _FEN_LETTERS_TO_CASTLING_RIGHTS.items()
+            if castling_right in self._castling_rights
+        )
+
+        en_passant_cell = "-"
+        en_passant_victim_square = self._get_en_passant_victim_square()
+
+        if en_passant_victim_square is not None:
+            en_passant_cell = SQUARES_TO_POSITIONS[
+                en_passant_victim_square + (8 if self._player_turn == 1 else -8)
+            ].lower()
+
+        return " ".join(
+            [
+                "/".join(rows),
+                "w" if self._player_turn == 1 else "b",
+                castling_rights or "-",
+                en_passant_cell,
+                str(self.halfmove_clock),
+                str(self.fullmove_number),
+            ]
+        )
+
     def _initialize_pieces(self):
         """
         Create all pieces as they should be when game starts
@@ -432,6 +1100,9 @@ class Board:
         self.player_1_pieces = pieces_1
         self.player_2_pieces = pieces_2
 
+        self._rebuild_pieces_index()
+        self._reset_position_history()
+
     def _remove_piece_from_pieces(self, piece_to_kill):
         if piece_to_kill:
             assert piece_to_kill in [*self.player_2_pieces, *self.player_1_pieces]
@@ -472,23 +1143,583 @@ class Board:
 
     def _player_has_check_in_position(self):
         # check if current player has check
-        king_position = self.current_player_king.position
-        opponent_pieces = self.opponent_player_pieces
+        return self.is_square_attacked(
+            self.current_player_king.square, by_player_number=3 - self._player_turn
+        )
+
+    def is_square_attacked(self, square, by_player_number):
+        """
+        Can any piece of given player kill something on given square?
+
+        Instead of generating moves of all opponent pieces, we look outward from the
+        square itself: if knight standing on the square could reach opponent knight,
+        that knight reaches the square too, same for king, pawns and the first piece
+        on each line for queens, rooks and bishops.
+        """
+        if self.backend == BITBOARD_BACKEND:
+            return _bitboards.is_square_attacked(
+                bitboards=self._bitboards,
+                occupied=self._occupied_squares[1] | self._occupied_squares[2],
+                square=square,
+                by_player_number=by_player_number,
+            )
+
+        squares_to_pieces = self._squares
+
+        for piece_name, squares in (
+            ("knight", KNIGHT_TARGETS[square]),
+            ("king", KING_TARGETS[square]),
+            # opponent pawns attack us from where our pawn would attack them
+            ("pawn", PAWN_ATTACKS[3 - by_player_number][square]),
+        ):
+            for attacker_square in squares:
+                piece = squares_to_pieces[attacker_square]
+
+                if (
+                    piece is not None
+                    and piece.piece_name == piece_name
+                    and piece.player_number == by_player_number
+                ):
+                    return True
+
+        rays = RAYS[square]
+
+        for direction in QUEEN_DIRECTIONS:
+            for attacker_square in rays[direction]:
+                piece = squares_to_pieces[attacker_square]
+
+                if piece is None:
+                    continue
+
+                if piece.player_number == by_player_number:
+                    if piece.piece_name == "queen":
+                        return True
+
+                    if direction in ROOK_DIRECTIONS:
+                        if piece.piece_name == "rook":
+                            return True
+                    elif piece.piece_name == "bishop":
+                        return True
+
+                # first piece on the line blocks it
+                break
+
+        return False
+
+    def get_attackers(self, square, by_player_number, ignored_squares=()):
+        """
+        Pieces of given player that can kill something on given square, in the same way
+        as is_square_attacked finds them, but all of them, not just the first one.
+
+        Pieces on ignored_squares are treated as if they were not on the board, so pieces
+        behind them on the same line(like rook behind queen) are also found.
+        """
+        squares_to_pieces = self._squares
+        attackers = []
+
+        for piece_name, squares in (
+            ("knight", KNIGHT_TARGETS[square]),
+            ("king", KING_TARGETS[square]),
+            ("pawn", PAWN_ATTACKS[3 - by_player_number][square]),
+        ):
+            for attacker_square in squares:
+                piece = squares_to_pieces[attacker_square]
+
+                if (
+                    piece is not None
+                    and piece.piece_name == piece_name
+                    and piece.player_number == by_player_number
+                    and attacker_square not in ignored_squares
+                ):
+                    attackers.append(piece)
+
+        rays = RAYS[square]
+
+        for direction in QUEEN_DIRECTIONS:
+            for attacker_square in rays[direction]:
+                piece = squares_to_pieces[attacker_square]
+
+                if piece is None or attacker_square in ignored_squares:
+                    continue
+
+                if piece.player_number == by_player_number and (
+                    piece.piece_name == "queen"
+                    or piece.piece_name
+                    == ("rook" if direction in ROOK_DIRECTIONS else "bishop")
+                ):
+                    attackers.append(piece)
+
+                break
+
+        return attackers
+
+    def static_exchange_evaluation(self, piece, move_info):
+        """
+        How much material(in centipawns, see PIECE_VALUES) current player wins with
+        given kill, if both players then keep killing on the same square with their
+        least valuable pieces, as long as it is profitable for them.
+
+        ex: pawn kills knight defended by pawn --> 320 - 100 = 220
+            queen kills pawn defended by pawn --> 100 - 900 = -800
+
+        Only pieces attacking the square are looked at, moves are not applied to the
+        board. Pins and checks are not taken into account, so it is an estimation.
+        """
+        target_square = move_info["new_square"]
+        killed_square = move_info["killed_opponent_piece_square"]
+
+        gains = [0]
+
+        if killed_square is not None:
+            gains[0] = PIECE_VALUES[self._squares[killed_square].piece_name]
+
+        attacker_value = PIECE_VALUES[piece.piece_name]
+
+        if move_info.get("promote_into"):
+            promoted_piece_name = _FEN_LETTERS_TO_PIECE_CLASSES[
+                move_info["promote_into"]
+            ].__name__.lower()
+            promotion_gain = PIECE_VALUES[promoted_piece_name] - PIECE_VALUES["pawn"]
+
+            gains[0] += promotion_gain
+            attacker_value += promotion_gain
+
+        # pieces that already moved to target square, en passant victim is
+        # not on target square, but it is not on the board anymore as well
+        ignored_squares = {piece.square, killed_square}
+        player_number = 3 - piece.player_number
+
+        while True:
+            attackers = self.get_attackers(
+                target_square, player_number, ignored_squares
+            )
+
+            if not attackers:
+                break
+
+            attacker = min(attackers, key=lambda i: PIECE_VALUES[i.piece_name])
+
+            # gain if opponent kills our last attacker, and we stop there
+            gains.append(attacker_value - gains[-1])
+
+            attacker_value = PIECE_VALUES[attacker.piece_name]
+            ignored_squares.add(attacker.square)
+            player_number = 3 - player_number
+
+        # each player can stop killing, if continuing loses more
+        for i in range(len(gains) - 1, 0, -1):
+            gains[i - 1] = -max(-gains[i - 1], gains[i])
+
+        return gains[0]
+
+    def _get_technically_valid_moves_info(self, piece):
+        """
+        Moves that piece can make if we do not care about checks, using board's backend.
+        For King, castling moves are not included here.
+        """
+        if self.backend == BITBOARD_BACKEND:
+            return _bitboards.get_technically_valid_moves_info_for_piece(
+                piece=piece, board_state=self
+            )
+
+        if piece.piece_name == "king":
+            _, moves_info = piece.get_technically_valid_moves_info_for_piece(
+                self,
+                return_defended_cells=True,
+                return_only_places_where_piece_can_directly_kill=True,
+            )
+            return moves_info
+
+        return piece.get_technically_valid_moves_info_for_piece(self)
+
+    def _get_checks_and_pins_info(self, king):
+        """
+        Look from the king in all directions and find opponent pieces that give check
+        to it and our pieces that can not leave their line, as it would open a check.
+
+        Returns tuple of 2 things:
+            1. list with set of squares for each checking piece - moving there
+            (killing checking piece or standing between it and king) stops that check
+            2. dictionary of pinned pieces with set of squares each of them
+            still can move to(till the piece that pins it, including it)
+        """
+        squares_to_pieces = self._squares
+        king_square = king.square
+        player_number = king.player_number
+
+        checks = []
+        pins = {}
+
+        for piece_name, squares in (
+            ("knight", KNIGHT_TARGETS[king_square]),
+            # opponent pawns attack king from where king would attack if it was a pawn
+            ("pawn", PAWN_ATTACKS[player_number][king_square]),
+        ):
+            for square in squares:
+                piece = squares_to_pieces[square]
+
+                if (
+                    piece is not None
+                    and piece.player_number != player_number
+                    and piece.piece_name == piece_name
+                ):
+                    checks.append({square})
+
+        for direction in QUEEN_DIRECTIONS:
+            if direction in ROOK_DIRECTIONS:
+                sliding_piece_names = ("rook", "queen")
+            else:
+                sliding_piece_names = ("bishop", "queen")
+
+            passed_squares = set()
+            our_piece_on_the_way = None
+
+            for square in RAYS[king_square][direction]:
+                passed_squares.add(square)
+                piece = squares_to_pieces[square]
+
+                if piece is None:
+                    continue
+
+                if piece.player_number == player_number:
+                    # 2 our pieces on the way means no pin and no check from this side
+                    if our_piece_on_the_way is not None:
+                        break
+
+                    our_piece_on_the_way = piece
+                    continue
+
+                if piece.piece_name in sliding_piece_names:
+                    if our_piece_on_the_way is None:
+                        checks.append(passed_squares)
+                    else:
+                        pins[our_piece_on_the_way] = passed_squares
 
-        # get all possible killing moves that opponent pieces can make
-        # for pawns, we care only about killing cells here, as they can't push King forward :-)
+                break
 
-        for piece in opponent_pieces:
-            cells_on_which_opponent_can_kill_piece = (
-                piece.get_all_possible_cells_where_this_piece_can_kill(
-                    board_state=self,
+        return checks, pins
+
+    def _get_squares_attacked_by_opponent(self, king):
+        """
+        Squares that opponent pieces attack, as if given king was not on board,
+        so that it can not step back from the sliding piece that gives check.
+        """
+        squares_to_pieces = self._squares
+        attacked_squares = set()
+
+        for piece in self.opponent_player_pieces:
+            piece_name = piece.piece_name
+
+            if piece_name == "pawn":
+                attacked_squares.update(PAWN_ATTACKS[piece.player_number][piece.square])
+            elif piece_name == "knight":
+                attacked_squares.update(KNIGHT_TARGETS[piece.square])
+            elif piece_name == "king":
+                attacked_squares.update(KING_TARGETS[piece.square])
+            else:
+                directions = {
+                    "queen": QUEEN_DIRECTIONS,
+                    "rook": ROOK_DIRECTIONS,
+                    "bishop": BISHOP_DIRECTIONS,
+                }[piece_name]
+
+                rays = RAYS[piece.square]
+
+                for direction in directions:
+                    for square in rays[direction]:
+                        attacked_squares.add(square)
+
+                        if (
+                            squares_to_pieces[square] is not None
+                            and squares_to_pieces[square] is not king
+                        ):
+                            break
+
+        return attacked_squares
+
+    def legal_moves(self):
+        """
+        All moves that current player can make, as list of (piece, move_info) tuples.
+        """
+        if self.position_cache.max_size <= 0:
+            return self._generate_legal_moves_of_pieces(self.current_player_pieces)
+
+        squares_to_pieces = self._squares
+
+        return [
+            (squares_to_pieces[square], move_info)
+            for square, moves_info in self._get_cached_legal_moves_by_squares().items()
+            for move_info in moves_info
+        ]
+
+    def book_moves(self):
+        """
+        Moves played in current position in games of opening book, most played first:
+            [
+                {
+                    # basic notation, like make_a_move_if_possible needs
+                    "move": "E2 E4",
+                    "games": 120,
+                    "player_1_wins": 50,
+                    "draws": 40,
+                    "player_2_wins": 30,
+                },
+                ...
+            ]
+        Empty list if there is no opening book, or position is not in it.
+
+        Position is looked up by its hash, so it costs the same as a dictionary lookup.
+        """
+        if self.opening_book is None:
+            return []
+
+        book_moves = []
+        moves = self.opening_book.get_moves(self._position_hash)
+
+        if not moves:
+            return book_moves
+
+        # book moves should be legal, unless hashes of different positions are
+        # the same or book was made from games of other chess variant
+        legal_encoded_moves = {
+            encode_move(
+                piece.square, move_info["new_square"], move_info.get("promote_into")
+            )
+            for piece, move_info in self.legal_moves()
+        }
+
+        for encoded_move, games, player_1_wins, draws, player_2_wins in moves:
+            if encoded_move not in legal_encoded_moves:
+                continue
+
+            from_square, to_square, promote_into = decode_move(encoded_move)
+            piece = self._squares[from_square]
+
+            if piece.piece_name == "king" and abs(to_square - from_square) == 2:
+                move = "O-O" if to_square > from_square else "O-O-O"
+            else:
+                move = " ".join(
+                    (SQUARES_TO_POSITIONS[from_square], SQUARES_TO_POSITIONS[to_square])
                 )
+
+                if promote_into:
+                    move += f"={promote_into}"
+
+            book_moves.append(
+                {
+                    "move": move,
+                    "games": games,
+                    "player_1_wins": player_1_wins,
+                    "draws": draws,
+                    "player_2_wins": player_2_wins,
+                }
             )
 
-            if king_position in cells_on_which_opponent_can_kill_piece:
-                return True
+        return book_moves
 
-        return False
+    def probe_endgame_tablebase(self):
+        """
+        Result of current position for current player from endgame tablebase:
+            {"result": "win", "distance": 17}
+        result is "win", "loss" or "draw", and distance is number of plies(moves of both
+        players) till checkmate if both players play best, 0 for draws.
+        None if there is no tablebase, or it has no table for the position.
+
+        It is just a lookup by position index, so it costs almost nothing.
+        """
+        if (
+            self.endgame_tablebase is None
+            or len(self.player_1_pieces) + len(self.player_2_pieces)
+            > MAX_ENDGAME_TABLEBASE_PIECES
+            # tables do not know about castlings and En passant kills
+            or self._castling_rights
+            or self._en_passant_hash_key
+        ):
+            return None
+
+        return self.endgame_tablebase.probe(
+            [
+                (
+                    piece.player_number,
+                    _PIECE_NAMES_TO_FEN_LETTERS[piece.piece_name],
+                    piece.square,
+                )
+                for piece in self.player_1_pieces + self.player_2_pieces
+            ],
+            self._player_turn,
+        )
+
+    def endgame_tablebase_moves(self):
+        """
+        Legal moves with results for current player from endgame tablebase, best first:
+            [
+                {
+                    # basic notation, like make_a_move_if_possible needs
+                    "move": "A1 A8",
+                    # as probe_endgame_tablebase returns them, distance
+                    # is counted from current position, with the move
+                    "result": "win",
+                    "distance": 3,
+                },
+                ...
+            ]
+        Empty list if position is not in tablebase.
+        """
+        if self.probe_endgame_tablebase() is None:
+            return []
+
+        tablebase_moves = []
+
+        for piece, move_info in self.legal_moves():
+            self.push(piece=piece, move_info=move_info)
+            opponent_result = self.probe_endgame_tablebase()
+            self.pop()
+
+            # kill or promotion into material without table
+            if opponent_result is None:
+                continue
+
+            result = {"win": "loss", "loss": "win", "draw": "draw"}[
+                opponent_result["result"]
+            ]
+
+            tablebase_moves.append(
+                {
+                    "move": " ".join(
+                        (
+                            SQUARES_TO_POSITIONS[piece.square],
+                            _get_move_info_new_position(move_info),
+                        )
+                    ),
+                    "result": result,
+                    "distance": (
+                        0 if result == "draw" else opponent_result["distance"] + 1
+                    ),
+                }
+            )
+
+        # fastest wins, then draws, then slowest losses
+        tablebase_moves.sort(
+            key=lambda i: {
+                "win": (0, i["distance"]),
+                "draw": (1, 0),
+                "loss": (2, -i["distance"]),
+            }[i["result"]]
+        )
+
+        return tablebase_moves
+
+    def _get_legal_moves_of_pieces(self, pieces):
+        """
+        Legal moves of given pieces of current player, as list of (piece, move_info) tuples.
+        """
+        if self.position_cache.max_size <= 0:
+            return self._generate_legal_moves_of_pieces(pieces)
+
+        # when caching, it is worth to get moves of all pieces at once
+        legal_moves_by_squares = self._get_cached_legal_moves_by_squares()
+
+        return [
+            (piece, move_info)
+            for piece in pieces
+            for move_info in legal_moves_by_squares.get(piece.square, ())
+        ]
+
+    def _get_cached_legal_moves_by_squares(self):
+        """
+        Legal moves info of current player grouped by squares of moving pieces.
+
+        We save squares, not pieces, as pieces on them may be different objects
+        next time we see the same position(for example promoted ones).
+        """
+        legal_moves_by_squares = self.position_cache.get(
+            self._position_hash, "legal_moves"
+        )
+
+        if legal_moves_by_squares is None:
+            legal_moves_by_squares = {}
+
+            for piece, move_info in self._generate_legal_moves_of_pieces(
+                self.current_player_pieces
+            ):
+                legal_moves_by_squares.setdefault(piece.square, []).append(move_info)
+
+            self.position_cache.set(
+                self._position_hash, "legal_moves", legal_moves_by_squares
+            )
+
+        return legal_moves_by_squares
+
+    def _generate_legal_moves_of_pieces(self, pieces):
+        """
+        Legal moves of given pieces of current player, as list of (piece, move_info) tuples.
+
+        Instead of applying each technically possible move and looking for checks after it,
+        we find pieces that give check and pinned pieces once, and keep only moves that
+        respect them. King moves are checked against all cells opponent attacks.
+        """
+        if self.backend == BITBOARD_BACKEND:
+            return _bitboards.get_legal_moves_info(board_state=self, pieces=pieces)
+
+        king = self.current_player_king
+        checks, pins = self._get_checks_and_pins_info(king)
+        squares_attacked_by_opponent = None
+
+        legal_moves = []
+
+        for piece in pieces:
+            if piece is king:
+                if squares_attacked_by_opponent is None:
+                    squares_attacked_by_opponent = (
+                        self._get_squares_attacked_by_opponent(king)
+                    )
+
+                moves_info = self._get_technically_valid_moves_info(king)
+
+                # king can not castle if it has active check
+                if not checks:
+                    moves_info = moves_info + king.get_castling_moves_info(self)
+
+                for move_info in moves_info:
+                    if move_info["new_square"] not in squares_attacked_by_opponent:
+                        legal_moves.append((king, move_info))
+
+                continue
+
+            # if 2 pieces give check, only king can save itself
+            if len(checks) > 1:
+                continue
+
+            allowed_squares = checks[0] if checks else None
+
+            if piece in pins:
+                if allowed_squares is None:
+                    allowed_squares = pins[piece]
+                else:
+                    allowed_squares = allowed_squares & pins[piece]
+
+            for move_info in self._get_technically_valid_moves_info(piece):
+                # En passant kills piece that is not on the new square of moving pawn, and
+                # may even open check from a side, so just try it, it happens rarely
+                if (
+                    move_info["killed_opponent_piece_square"] is not None
+                    and move_info["killed_opponent_piece_square"]
+                    != move_info["new_square"]
+                ):
+                    self.push(piece=piece, move_info=move_info, swap_player_turn=False)
+                    has_check = self._player_has_check_in_position()
+                    self.pop()
+
+                    if not has_check:
+                        legal_moves.append((piece, move_info))
+
+                elif (
+                    allowed_squares is None
+                    or move_info["new_square"] in allowed_squares
+                ):
+                    legal_moves.append((piece, move_info))
+
+        return legal_moves
 
     @staticmethod
     def _clear_screen():
@@ -517,6 +1748,8 @@ class Board:
         # save data here, it makes printing 180 deg rotated easier when needed
         lines_to_print = []
 
+        index_based_positions_to_pieces = self.index_based_positions_to_pieces
+
         if rotate_180_deg:
             self.errors_to_display = self.errors_to_display[::-1]
 
@@ -533,8 +1766,8 @@ class Board:
                 )
 
                 # cell with piece on it
-                if (row_index, col_index) in self.index_based_positions_to_pieces:
-                    piece = self.index_based_positions_to_pieces[(row_index, col_index)]
+                if (row_index, col_index) in index_based_positions_to_pieces:
+                    piece = index_based_positions_to_pieces[(row_index, col_index)]
 
                     text_to_print = (
                         f"[{piece.color} on {cell_bg_color}]{piece.piece_icon}[/]"
@@ -637,6 +1870,7 @@ class Board:
         self.killed_opponent_pieces[killer_player_number].append(killed_opponent_piece)
 
         self._remove_piece_from_pieces(killed_opponent_piece)
+        self._remove_piece_from_index(killed_opponent_piece)
 
     def get_move_info_if_it_is_valid_move_str(self, move_str):
         """
@@ -659,13 +1893,15 @@ class Board:
 
             king = self.current_player_king
 
-            possible_moves = king.get_possible_moves(board_state=self)
+            possible_moves = [
+                move_info for _, move_info in self._get_legal_moves_of_pieces([king])
+            ]
 
             for i in possible_moves:
                 if i.get("castle_notation") == move_str:
                     move_info = i
                     _from = king.position
-                    _to = i["new_position"]
+                    _to = _get_move_info_new_position(i)
                     piece = king
                     break
 
@@ -673,14 +1909,22 @@ class Board:
             # normal moves
             move_start, move_end = move_str.split()
 
-            if move_start in {i.position for i in self.current_player_pieces}:
-                _piece = self.positions_to_pieces[move_start]
+            _piece = self._positions_to_pieces.get(move_start)
+
+            if _piece is not None and _piece.player_number == self._player_turn:
+                new_square, promote_into = _parse_new_position(move_end)
 
                 # can that piece make that move ?
-                possible_moves = _piece.get_possible_moves(board_state=self)
+                possible_moves = [
+                    move_info
+                    for _, move_info in self._get_legal_moves_of_pieces([_piece])
+                ]
 
                 for i in possible_moves:  # if piece can move there
-                    if i["new_position"] == move_end:
+                    if (
+                        i["new_square"] == new_square
+                        and i.get("promote_into") == promote_into
+                    ):
                         move_info = i
                         _from = move_start
                         _to = move_end
@@ -751,6 +1995,105 @@ class Board:
 
         return True, [], next_player_troubles
 
+    def get_position_repetitions(self):
+        """
+        How many times current position happened in the game, including now.
+        Positions are the same if pieces, player who moves, castling rights and
+        En passant kills are the same, as position hash covers all of it.
+        """
+        return self._position_history_counts.get(self._position_hash, 0)
+
+    def get_position_history(self):
+        """
+        Position hashes of positions that current one can still repeat, oldest first and
+        current one last. Positions before last pawn move or kill can not repeat anymore,
+        so only ones after it are here.
+        """
+        return self._position_history[-(self.halfmove_clock + 1) :]
+
+    def set_position_history(self, position_hashes):
+        """
+        Replace position history with hashes that get_position_history of other board
+        gave, for boards created from FEN(which do not know moves made before it) to
+        still find repetitions, like in processes of parallel search.
+        """
+        if not position_hashes or position_hashes[-1] != self._position_hash:
+            raise ValueError("Position history should end with current position")
+
+        self._position_history = []
+        self._position_history_counts = {}
+
+        for position_hash in position_hashes:
+            self._position_history.append(position_hash)
+            self._position_history_counts[position_hash] = (
+                self._position_history_counts.get(position_hash, 0) + 1
+            )
+
+    def is_threefold_repetition(self):
+        return self.get_position_repetitions() >= 3
+
+    def is_fifty_move_rule(self):
+        """
+        50 moves of each player were made without pawn moves and kills
+        """
+        return self.halfmove_clock >= FIFTY_MOVE_RULE_HALFMOVES
+
+    def has_insufficient_material(self):
+        """
+        Only kings are left, or kings and one bishop or knight, so nobody can checkmate
+        """
+        if len(self.player_1_pieces) + len(self.player_2_pieces) > 3:
+            return False
+
+        return has_insufficient_material(
+            [
+                _PIECE_NAMES_TO_FEN_LETTERS[piece.piece_name]
+                for piece in self.player_1_pieces + self.player_2_pieces
+            ]
+        )
+
+    def get_game_status(self):
+        """
+        Why game is finished, one of CHECKMATE(current player lost), STALEMATE,
+        THREEFOLD_REPETITION, FIFTY_MOVE_RULE and INSUFFICIENT_MATERIAL, all except
+        checkmate are draws. None if game is not finished.
+
+        Position history is counted as moves are made, so it does not depend on
+        how long the game is.
+        """
+        return self._get_game_status(
+            self._current_player_is_checked(), len(self.legal_moves()) > 0
+        )
+
+    def _get_game_status(self, player_is_checked, player_has_legal_moves):
+        if not player_has_legal_moves:
+            return CHECKMATE if player_is_checked else STALEMATE
+
+        if self.is_threefold_repetition():
+            return THREEFOLD_REPETITION
+
+        if self.is_fifty_move_rule():
+            return FIFTY_MOVE_RULE
+
+        if self.has_insufficient_material():
+            return INSUFFICIENT_MATERIAL
+
+        return None
+
+    def _current_player_is_checked(self):
+        player_is_checked = self.position_cache.get(
+            self._position_hash, "player_is_checked"
+        )
+
+        if player_is_checked is None:
+            player_is_checked = self._player_has_check_in_position()
+
+            self.position_cache.set(
+                self._position_hash, "player_is_checked", player_is_checked
+            )
+
+        return player_is_checked
+
     def get_current_player_troubles(self):
         """
         Get info if currently active player has check or checkmates.
@@ -763,34 +2106,47 @@ class Board:
                 "player_is_checked": True,
                 "player_is_checkmated": True,
                 "move_that_makes_check_disappear": {},
+                "endgame_tablebase_result": {"result": "loss", "distance": 0},
+                "game_status": "checkmate",
             }
 
-        Currently this function does not return info if it is draw/stalemate, but if needed,
-        should be not very difficult to implement basic version of it using already existing functionality.
+        endgame_tablebase_result is perfect result of position for current player(see
+        probe_endgame_tablebase), None if board has no endgame tablebase for it.
+
+        game_status is why game is finished, as get_game_status returns it, so draws
+        (stalemate, repetition, fifty-move rule, insufficient material) are here too.
 
         """
         return_me = {
             "player_is_checked": False,
             "player_is_checkmated": False,
             "move_that_makes_check_disappear": {},
+            "endgame_tablebase_result": self.probe_endgame_tablebase(),
+            "game_status": None,
         }
 
+        player_is_checked = self._current_player_is_checked()
+        legal_moves = self.legal_moves()
+
+        return_me["game_status"] = self._get_game_status(
+            player_is_checked, len(legal_moves) > 0
+        )
+
         # no check -> no checkmate, easy
-        if not self._player_has_check_in_position():
+        if not player_is_checked:
             # no troubles
             return return_me
 
         return_me["player_is_checked"] = True
 
-        for piece in self.current_player_pieces:
-            possible_moves = piece.get_possible_moves(board_state=self)
+        if len(legal_moves) > 0:
+            piece, move_info = legal_moves[0]
 
-            if len(possible_moves) > 0:
-                return_me["move_that_makes_check_disappear"] = {
-                    "piece": piece,
-                    "new_position": possible_moves[0]["new_position"],
-                }
-                return return_me
+            return_me["move_that_makes_check_disappear"] = {
+                "piece": piece,
+                "new_position": _get_move_info_new_position(move_info),
+            }
+            return return_me
 
         # player is checkmated if we went to this step
         return_me["player_is_checkmated"] = True
@@ -0,0 +1,898 @@
+"""
+Generate endgame tablebase(see _endgame_tablebase.py) by retrograde analysis.
+
+Instead of searching forward from some position, all positions of material are solved at
+once, going back from the end of the game:
+    . first, each position is checked: checkmates are lost in 0 plies, stalemates are
+      draws, and moves that kill a piece or promote a pawn lead to other materials,
+      whose tables were generated before(or which are draws, like king against king)
+    . then on each next step, positions from which some move leads to a position
+      solved on previous step(found by undoing moves from it) are checked again:
+      player wins in N plies, if some move leads to position lost in N - 1 plies,
+      and loses in N plies, if all moves lead to positions won by opponent, the
+      longest of them in N - 1 plies
+    . positions that were never solved are draws
+Positions of each step are split into chunks checked by processes of a pool, reading
+results of previous steps from shared memory.
+
+Generation of big tables(like KBNK) takes a long time, so progress is saved after each
+step into <material>.cctb.partial file, and generation continues from it if it was
+interrupted. Tables of materials, which killing or promoting leads to, are generated
+first, if they are not in the directory yet.
+
+En passant and castlings are not taken into account.
+
+Usage:
+    generate_endgame_tables(["KQK", "KRK", "KBNK", "KPK"], "tablebases")
+
+    board = Board(endgame_tablebase=EndgameTablebase.load("tablebases"))
+    board.probe_endgame_tablebase()  # {"result": "win", "distance": 17}
+
+From command line:
+    python endgame_tablebase.py KQK KRK KBNK KPK --directory tablebases --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+from _bitboards import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    bishop_attacks,
+    iterate_squares,
+    queen_attacks,
+    rook_attacks,
+)
+from _endgame_tablebase import (
+    DRAW,
+    FILE_EXTENSION,
+    MAX_PIECES,
+    NOT_POSSIBLE,
+    EndgameTablebase,
+    TableLayout,
+    has_insufficient_material,
+    load_table,
+    normalize_material,
+    save_table,
+)
+
+_CHECKPOINT_MAGIC = b"CCTP"
+_CHECKPOINT_VERSION = 1
+# magic, version, material, last finished step, number of positions checked
+# on the first step(it is the longest one, so it is saved in the middle too)
+_CHECKPOINT_HEADER = struct.Struct(">4sI8sII")
+CHECKPOINT_FILE_EXTENSION = ".partial"
+
+_CHECKPOINT_EVERY_SECONDS = 60
+
+# positions in one chunk of work for pool processes
+_FIRST_STEP_CHUNK_SIZE = 4096
+_CHUNK_SIZE = 1024
+
+_PROMOTION_LETTERS = "QRBN"
+
+# state of process that generates table, set when process starts
+_worker_generator = None
+_worker_values_memory = None
+
+
+def _get_attacks(letter, player_number, square, occupied):
+    if letter == "K":
+        return KING_ATTACKS[square]
+
+    if letter == "N":
+        return KNIGHT_ATTACKS[square]
+
+    if letter == "P":
+        return PAWN_ATTACKS[player_number][square]
+
+    if letter == "Q":
+        return queen_attacks(square, occupied)
+
+    if letter == "R":
+        return rook_attacks(square, occupied)
+
+    return bishop_attacks(square, occupied)
+
+
+def _is_square_attacked(letters, players, squares, square, by_player_number):
+    occupied = 0
+
+    for piece_square in squares:
+        occupied |= 1 << piece_square
+
+    for letter, player_number, piece_square in zip(letters, players, squares):
+        if player_number == by_player_number and (
+            _get_attacks(letter, player_number, piece_square, occupied) >> square & 1
+        ):
+            return True
+
+    return False
+
+
+def get_file_path(directory, material):
+    return os.path.join(directory, material + FILE_EXTENSION)
+
+
+def get_required_materials(material):
+    """
+    Materials that killing pieces or promoting pawns of material leads to, without
+    ones that are always draws
+    """
+    layout = TableLayout(material)
+    sides = {1: [], 2: []}
+
+    for letter, player_number in zip(layout.letters, layout.players):
+        sides[player_number].append(letter)
+
+    required_materials = set()
+
+    for player_number, letters in sides.items():
+        for index, letter in enumerate(letters):
+            changed_sides = []
+
+            if letter == "P":
+                changed_sides += [
+                    letters[:index] + [i] + letters[index + 1 :]
+                    for i in _PROMOTION_LETTERS
+                ]
+
+            if letter != "K":
+                changed_sides.append(letters[:index] + letters[index + 1 :])
+
+            for changed_side in changed_sides:
+                other_side = sides[3 - player_number]
+
+                if not has_insufficient_material(changed_side + other_side):
+                    required_materials.add(normalize_material(changed_side, other_side))
+
+    return sorted(required_materials)
+
+
+class _TableGenerator:
+    def __init__(self, material, values, tablebase):
+        """
+        values - table being generated, bytes-like object, same for all processes
+        tablebase - EndgameTablebase with tables of required materials
+        """
+        self.layout = TableLayout(material)
+        self.letters = self.layout.letters
+        self.players = self.layout.players
+        self.values = values
+        self.tablebase = tablebase
+
+        # indices of kings in squares of position, for each player
+        self.king_indices = {
+            player_number: list(zip(self.letters, self.players)).index(
+                ("K", player_number)
+            )
+            for player_number in (1, 2)
+        }
+
+    def _get_attacked_squares(self, squares, player_number, occupied):
+        attacked_squares = 0
+
+        for letter, piece_player_number, square in zip(
+            self.letters, self.players, squares
+        ):
+            if piece_player_number == player_number:
+                attacked_squares |= _get_attacks(
+                    letter, player_number, square, occupied
+                )
+
+        return attacked_squares
+
+    def _is_checked(self, squares, player_number):
+        occupied = 0
+
+        for square in squares:
+            occupied |= 1 << square
+
+        king_square = squares[self.king_indices[player_number]]
+
+        return bool(
+            self._get_attacked_squares(squares, 3 - player_number, occupied)
+            >> king_square
+            & 1
+        )
+
+    def _is_possible(self, index, squares, player_number):
+        if len(set(squares)) != len(squares):
+            return False
+
+        for letter, square in zip(self.letters, squares):
+            if letter == "P" and square // 8 in (0, 7):
+                return False
+
+        # mirror image of position with other index
+        if self.layout.get_index(squares, player_number) != index:
+            return False
+
+        return not self._is_checked(squares, 3 - player_number)
+
+    def _get_moves(self, squares, player_number):
+        """
+        Legal moves of player who moves, as list of (index, value) tuples: index of
+        position after the move in this table and None, or None and value(see
+        _endgame_tablebase.py) of position of other material, if move kills or promotes
+        """
+        letters, players = self.letters, self.players
+        opponent_player_number = 3 - player_number
+        king_piece_index = self.king_indices[player_number]
+        king_square = squares[king_piece_index]
+
+        occupied = 0
+        own_pieces = 0
+        opponent_pieces = 0
+        opponent_sliders = []
+
+        for letter, piece_player_number, square in zip(letters, players, squares):
+            occupied |= 1 << square
+
+            if piece_player_number == player_number:
+                own_pieces |= 1 << square
+            else:
+                opponent_pieces |= 1 << square
+
+                if letter in "QRB":
+                    opponent_sliders.append((letter, square))
+
+        # king can not step away from slider on the line of its attack,
+        # so attacks are found as if king was not on the board
+        attacked_squares = self._get_attacked_squares(
+            squares, opponent_player_number, occupied ^ 1 << king_square
+        )
+        is_checked = attacked_squares >> king_square & 1
+
+        moves = []
+
+        for piece_index, (letter, piece_player_number, square) in enumerate(
+            zip(letters, players, squares)
+        ):
+            if piece_player_number != player_number:
+                continue
+
+            if letter == "P":
+                step = 8 if player_number == 1 else -8
+                targets = PAWN_ATTACKS[player_number][square] & opponent_pieces
+
+                if not occupied >> (square + step) & 1:
+                    targets |= 1 << (square + step)
+
+                    start_row = 1 if player_number == 1 else 6
+
+                    if (
+                        square // 8 == start_row
+                        and not occupied >> (square + 2 * step) & 1
+                    ):
+                        targets |= 1 << (square + 2 * step)
+            else:
+                targets = (
+                    _get_attacks(letter, player_number, square, occupied) & ~own_pieces
+                )
+
+            if piece_index == king_piece_index:
+                targets &= ~attacked_squares
+
+            for target in iterate_squares(targets):
+                new_squares = list(squares)
+                new_squares[piece_index] = target
+
+                is_kill = opponent_pieces >> target & 1
+
+                if piece_index != king_piece_index:
+                    if is_checked:
+                        # only check of the king is known, so position is checked fully
+                        new_letters, new_players = list(letters), list(players)
+
+                        if is_kill:
+                            killed_piece_index = squares.index(target)
+
+                            del new_letters[killed_piece_index]
+                            del new_players[killed_piece_index]
+                            del new_squares[killed_piece_index]
+
+                        if _is_square_attacked(
+                            new_letters,
+                            new_players,
+                            new_squares,
+                            king_square,
+                            opponent_player_number,
+                        ):
+                            continue
+
+                        new_squares = list(squares)
+                        new_squares[piece_index] = target
+                    else:
+                        # move can only open line between king and slider
+                        new_occupied = occupied ^ 1 << square | 1 << target
+
+                        if any(
+                            slider_square != target
+                            and _get_attacks(
+                                slider_letter,
+                                opponent_player_number,
+                                slider_square,
+                                new_occupied,
+                            )
+                            >> king_square
+                            & 1
+                            for slider_letter, slider_square in opponent_sliders
+                        ):
+                            continue
+
+                if letter == "P" and target // 8 in (0, 7):
+                    for promotion_letter in _PROMOTION_LETTERS:
+                        new_letters = list(letters)
+                        new_letters[piece_index] = promotion_letter
+
+                        moves.append(
+                            (
+                                None,
+                                self._get_other_material_value(
+                                    new_letters, new_squares, opponent_player_number
+                                ),
+                            )
+                        )
+                elif is_kill:
+                    moves.append(
+                        (
+                            None,
+                            self._get_other_material_value(
+                                letters, new_squares, opponent_player_number
+                            ),
+                        )
+                    )
+                else:
+                    moves.append(
+                        (
+                            self.layout.get_index(new_squares, opponent_player_number),
+                            None,
+                        )
+                    )
+
+        return moves
+
+    def _get_other_material_value(self, letters, squares, player_number):
+        """
+        letters and squares of pieces after the move, killed piece is still in them,
+        but on the same square as the piece that killed it
+        """
+        pieces = []
+
+        for letter, piece_player_number, square in zip(letters, self.players, squares):
+            # killed piece is the one of player who moves now
+            if squares.count(square) == 1 or piece_player_number != player_number:
+                pieces.append((piece_player_number, letter, square))
+
+        value = self.tablebase.get_value(pieces, player_number)
+
+        if value is None:
+            raise ValueError(f"Table for {''.join(i[1] for i in pieces)} is required")
+
+        return value
+
+    def _get_value(self, squares, player_number, moves):
+        """
+        Value of position from values of positions after its moves, DRAW if it is
+        not known yet
+        """
+        if not moves:
+            if self._is_checked(squares, player_number):
+                # checkmated, lost in 0 plies
+                return 1
+
+            return DRAW
+
+        values = self.values
+        shortest_win = None
+        longest_loss = 0
+        can_lose = True
+
+        for index, value in moves:
+            if index is not None:
+                value = values[index]
+
+            if value == DRAW:
+                can_lose = False
+            elif value % 2:
+                # opponent loses after the move(in even number of plies)
+                if shortest_win is None or value < shortest_win:
+                    shortest_win = value
+            elif value > longest_loss:
+                longest_loss = value
+
+        if shortest_win is not None:
+            value = shortest_win + 1
+        elif can_lose:
+            value = longest_loss + 1
+        else:
+            return DRAW
+
+        if value >= NOT_POSSIBLE:
+            raise ValueError("Checkmate is too far to save it in table")
+
+        return value
+
+    def check_positions(self, start, stop):
+        """
+        First step of generation, for positions from start to stop index.
+
+        Returns (start, values, steps), where values are values of checkmates and
+        not possible positions(others are not known yet), and steps are numbers of
+        steps on which positions should be checked again because of moves into
+        other materials(0 if there is no need), as bytes.
+        """
+        values = bytearray(stop - start)
+        steps = bytearray(stop - start)
+
+        for index in range(start, stop):
+            squares, player_number = self.layout.get_position(index)
+
+            if not self._is_possible(index, squares, player_number):
+                values[index - start] = NOT_POSSIBLE
+                continue
+
+            moves = self._get_moves(squares, player_number)
+
+            if not moves:
+                values[index - start] = self._get_value(squares, player_number, [])
+                continue
+
+            other_material_values = [value for i, value in moves if i is None]
+
+            if not other_material_values:
+                continue
+
+            winning_values = [i for i in other_material_values if i % 2]
+
+            # value of position is value of move + 1, and step is its distance,
+            # which is value - 1, so step number is the same as value of move
+            if winning_values:
+                steps[index - start] = min(winning_values)
+            elif DRAW not in other_material_values:
+                steps[index - start] = max(other_material_values)
+
+        return start, bytes(values), bytes(steps)
+
+    def get_previous_positions(self, indices):
+        """
+        Indices of not solved yet positions, from which a move leads to any of given ones
+        """
+        letters, players = self.letters, self.players
+        values = self.values
+        previous_indices = set()
+
+        for index in indices:
+            squares, player_number = self.layout.get_position(index)
+            previous_player_number = 3 - player_number
+
+            occupied = 0
+
+            for square in squares:
+                occupied |= 1 << square
+
+            for piece_index, (letter, piece_player_number, square) in enumerate(
+                zip(letters, players, squares)
+            ):
+                if piece_player_number != previous_player_number:
+                    continue
+
+                if letter == "P":
+                    step = 8 if previous_player_number == 1 else -8
+                    previous_squares = 0
+
+                    # pawns are never on first and last rows
+                    if 0 < (square - step) // 8 < 7 and not (
+                        occupied >> (square - step) & 1
+                    ):
+                        previous_squares |= 1 << (square - step)
+
+                        start_row = 1 if previous_player_number == 1 else 6
+
+                        if (square - 2 * step) // 8 == start_row and not (
+                            occupied >> (square - 2 * step) & 1
+                        ):
+                            previous_squares |= 1 << (square - 2 * step)
+                else:
+                    # pieces move the same way in both directions, and
+                    # they did not kill anything, so previous square is empty
+                    previous_squares = (
+                        _get_attacks(letter, previous_player_number, square, occupied)
+                        & ~occupied
+                    )
+
+                for previous_square in iterate_squares(previous_squares):
+                    previous_position_squares = list(squares)
+                    previous_position_squares[piece_index] = previous_square
+
+                    previous_index = self.layout.get_index(
+                        previous_position_squares, previous_player_number
+                    )
+
+                    if values[previous_index] == DRAW:
+                        previous_indices.add(previous_index)
+
+        return list(previous_indices)
+
+    def solve_positions(self, indices, step):
+        """
+        Returns (index, value) tuples for positions that got solved on given step.
+
+        Position may already get value of other step from moves to other materials,
+        like checkmate in 15 plies after promotion, but not all of its moves in this
+        table are known yet then, and one of them may give shorter win later, so such
+        positions are left till that step(see steps of check_positions).
+        """
+        values = []
+
+        for index in indices:
+            squares, player_number = self.layout.get_position(index)
+            value = self._get_value(
+                squares, player_number, self._get_moves(squares, player_number)
+            )
+
+            if value == step + 1:
+                values.append((index, value))
+
+        return values
+
+
+def _initialize_worker(material, values_memory_name, directory):
+    global _worker_generator, _worker_values_memory
+
+    values_memory = shared_memory.SharedMemory(name=values_memory_name)
+
+    tablebase = EndgameTablebase()
+
+    for required_material in get_required_materials(material):
+        tablebase.add_table(*load_table(get_file_path(directory, required_material)))
+
+    _worker_generator = _TableGenerator(material, values_memory.buf, tablebase)
+    _worker_values_memory = values_memory
+
+
+def _close_worker():
+    """
+    Close shared memory, when generation runs in the main process
+    """
+    global _worker_generator, _worker_values_memory
+
+    if _worker_generator is None:
+        return
+
+    _worker_generator.values.release()
+    _worker_values_memory.close()
+
+    _worker_generator, _worker_values_memory = None, None
+
+
+def _check_positions(start_and_stop):
+    return _worker_generator.check_positions(*start_and_stop)
+
+
+def _get_previous_positions(indices):
+    return _worker_generator.get_previous_positions(indices)
+
+
+def _solve_positions(indices_and_step):
+    return _worker_generator.solve_positions(*indices_and_step)
+
+
+def _get_chunks(items, chunk_size):
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def _save_checkpoint(file_path, material, step, checked_positions, values, steps):
+    temporary_file_path = file_path + ".tmp"
+
+    with open(temporary_file_path, "wb") as f:
+        f.write(
+            _CHECKPOINT_HEADER.pack(
+                _CHECKPOINT_MAGIC,
+                _CHECKPOINT_VERSION,
+                material.encode(),
+                step,
+                checked_positions,
+            )
+        )
+        f.write(values)
+        f.write(steps)
+
+    # file is never left half written, even if generation is killed
+    os.replace(temporary_file_path, file_path)
+
+
+def _load_checkpoint(file_path, material, size):
+    """
+    Returns (step, checked_positions, values, steps), None if there is no checkpoint
+    """
+    if not os.path.exists(file_path):
+        return None
+
+    with open(file_path, "rb") as f:
+        data = f.read()
+
+    if len(data) != _CHECKPOINT_HEADER.size + 2 * size:
+        raise ValueError(f"{file_path} is not a checkpoint of {material} table")
+
+    magic, version, checkpoint_material, step, checked_positions = (
+        _CHECKPOINT_HEADER.unpack_from(data)
+    )
+
+    if (
+        magic != _CHECKPOINT_MAGIC
+        or version != _CHECKPOINT_VERSION
+        or checkpoint_material.rstrip(b"\0").decode() != material
+    ):
+        raise ValueError(f"{file_path} is not a checkpoint of {material} table")
+
+    values_start = _CHECKPOINT_HEADER.size
+
+    return (
+        step,
+        checked_positions,
+        data[values_start : values_start + size],
+        bytearray(data[values_start + size :]),
+    )
+
+
+def generate_endgame_table(material, directory, processes=None, verbose=False):
+    """
+    Generate table of material(like "KQK") into directory, tables of materials it
+    requires(see get_required_materials) should already be there.
+    Returns path of table file.
+
+    processes - number of processes to use, all CPU cores by default
+    verbose - print progress
+    """
+    layout = TableLayout(material)
+    file_path = get_file_path(directory, material)
+    checkpoint_file_path = file_path + CHECKPOINT_FILE_EXTENSION
+
+    missing_materials = [
+        i
+        for i in get_required_materials(material)
+        if not os.path.exists(get_file_path(directory, i))
+    ]
+
+    if missing_materials:
+        raise ValueError(
+            f"Tables for {', '.join(missing_materials)} should be generated first"
+        )
+
+    # steps are numbered by distance of positions solved on them, in plies, so first
+    # one is 0, and positions solved on step N have value N + 1(see _endgame_tablebase.py)
+    finished_steps, checked_positions = 0, 0
+    # on which steps positions should be checked because of moves to other materials
+    steps = bytearray(layout.size)
+
+    checkpoint = _load_checkpoint(checkpoint_file_path, material, layout.size)
+
+    values_memory = shared_memory.SharedMemory(create=True, size=layout.size)
+    values = values_memory.buf
+    pool = None
+
+    try:
+        if checkpoint is not None:
+            finished_steps, checked_positions, saved_values, steps = checkpoint
+            values[:] = saved_values
+
+            if verbose:
+                print(f"{material}: continuing from step {finished_steps}")
+
+        processes = processes or os.cpu_count() or 1
+        initializer_arguments = (material, values_memory.name, directory)
+
+        if processes > 1:
+            pool = multiprocessing.Pool(
+                processes,
+                initializer=_initialize_worker,
+                initargs=initializer_arguments,
+            )
+            # order of results matters only for the first step
+            map_ordered, map_unordered = pool.imap, pool.imap_unordered
+        else:
+            _initialize_worker(*initializer_arguments)
+            map_ordered, map_unordered = map, map
+
+        if finished_steps == 0:
+            last_checkpoint_time = time.perf_counter()
+
+            for start, chunk_values, chunk_steps in map_ordered(
+                _check_positions,
+                [
+                    (i, min(i + _FIRST_STEP_CHUNK_SIZE, layout.size))
+                    for i in range(
+                        checked_positions, layout.size, _FIRST_STEP_CHUNK_SIZE
+                    )
+                ],
+            ):
+                values[start : start + len(chunk_values)] = chunk_values
+                steps[start : start + len(chunk_steps)] = chunk_steps
+                checked_positions = start + len(chunk_values)
+
+                if (
+                    time.perf_counter() - last_checkpoint_time
+                    > _CHECKPOINT_EVERY_SECONDS
+                ):
+                    _save_checkpoint(
+                        checkpoint_file_path,
+                        material,
+                        finished_steps,
+                        checked_positions,
+                        values,
+                        steps,
+                    )
+                    last_checkpoint_time = time.perf_counter()
+
+            finished_steps = 1
+            _save_checkpoint(
+                checkpoint_file_path,
+                material,
+                finished_steps,
+                checked_positions,
+                values,
+                steps,
+            )
+
+            if verbose:
+                print(f"{material}: checked {layout.size} positions")
+
+        # generation can stop on step without new values only after this step, and
+        # after step of the biggest value found so far, as previous positions of ones
+        # solved on step N are found on step N + 1
+        last_step_with_other_materials = max(steps)
+        max_value = max((i for i in values if i != NOT_POSSIBLE), default=DRAW)
+
+        while True:
+            step = finished_steps
+            step_bytes = bytes([step])
+
+            indices = set(_find_all(steps, step_bytes))
+
+            # positions solved on previous step have value equal to step number
+            for previous_indices in map_unordered(
+                _get_previous_positions,
+                _get_chunks(_find_all(values, step_bytes), _CHUNK_SIZE),
+            ):
+                indices.update(previous_indices)
+
+            indices = sorted(i for i in indices if values[i] == DRAW)
+
+            # values are changed only when all processes finished, as they all
+            # should see only positions solved on previous steps
+            new_values = [
+                i
+                for chunk_new_values in map_unordered(
+                    _solve_positions,
+                    [(chunk, step) for chunk in _get_chunks(indices, _CHUNK_SIZE)],
+                )
+                for i in chunk_new_values
+            ]
+
+            for index, value in new_values:
+                values[index] = value
+                max_value = max(max_value, value)
+
+            finished_steps += 1
+            _save_checkpoint(
+                checkpoint_file_path,
+                material,
+                finished_steps,
+                checked_positions,
+                values,
+                steps,
+            )
+
+            if verbose:
+                print(f"{material}: step {step}, solved {len(new_values)} positions")
+
+            if not new_values and step >= max(
+                last_step_with_other_materials, max_value
+            ):
+                break
+
+        save_table(file_path, material, bytes(values))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+        _close_worker()
+
+        # buffer should not be used after memory is closed
+        values.release()
+        values_memory.close()
+        values_memory.unlink()
+
+    os.remove(checkpoint_file_path)
+
+    return file_path
+
+
+def _find_all(data, byte):
+    """
+    Indices of all occurrences of byte in bytes-like data
+    """
+    data = bytes(data)
+    indices = []
+    index = data.find(byte)
+
+    while index != -1:
+        indices.append(index)
+        index = data.find(byte, index + 1)
+
+    return indices
+
+
+def generate_endgame_tables(materials, directory, processes=None, verbose=False):
+    """
+    Generate tables of materials and ones they require, which are not in directory yet.
+    Returns normalized materials(stronger side first) of generated tables.
+    """
+    os.makedirs(directory, exist_ok=True)
+    generated_materials = []
+
+    def generate(material):
+        if os.path.exists(get_file_path(directory, material)):
+            return
+
+        for required_material in get_required_materials(material):
+            generate(required_material)
+
+        generate_endgame_table(material, directory, processes, verbose)
+        generated_materials.append(material)
+
+    for material in materials:
+        material = material.upper()
+        second_king_index = material.find("K", 1)
+
+        if material[:1] != "K" or second_king_index == -1:
+            raise ValueError(f"Invalid material {material}")
+
+        generate(
+            normalize_material(
+                material[:second_king_index], material[second_king_index:]
+            )
+        )
+
+    return generated_materials
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate endgame tablebase by retrograde analysis"
+    )
+    parser.add_argument(
+        "materials",
+        nargs="+",
+        help=f"materials like KQK, KRK, KBNK, KPK, with at most {MAX_PIECES} pieces",
+    )
+    parser.add_argument("--directory", default="tablebases")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="number of processes to use, all CPU cores by default",
+    )
+
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+
+    generated_materials = generate_endgame_tables(
+        args.materials, args.directory, processes=args.processes, verbose=True
+    )
+
+    print(f"Generated tables: {', '.join(generated_materials) or 'none'}")
+    print(f"Time: {time.perf_counter() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,581 @@
+"""
+Computer player - searches moves of current player of Board and finds the best one.
+
+Search is negamax with alpha-beta pruning: score of position is always from the point
+of view of player who moves in it, so the same code works for both players, and branches
+that can not change the result are not searched at all.
+
+It goes deeper one move at a time(iterative deepening), until time or nodes budget is
+spent, so there is always a move to play from the last finished depth, and principal
+variation(best line of moves) of previous depth is searched first in next one, which
+makes pruning work much better.
+
+Moves are tried on the same board with push/pop, copying board for each of thousands
+of searched positions would take most of the time.
+
+Usage:
+    engine = Engine(time_limit=1)
+    result = engine.search(board)
+
+    board.make_a_move_if_possible(result["move"])
+
+From command line:
+    python engine.py --fen "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+"""
+
+import argparse
+import time
+
+from _move_ordering import MoveOrderer
+from _transposition_table import (
+    DEFAULT_SIZE_MB,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+from _move_related_functions import (
+    SQUARES_TO_POSITIONS,
+    _get_move_info_new_position,
+    encode_move,
+)
+from board import (
+    BITBOARD_BACKEND,
+    MAILBOX_BACKEND,
+    STARTING_POSITION_FEN,
+    Board,
+)
+
+# score of checkmate, faster checkmates get higher scores, as
+# plies from the root of search are subtracted from it
+MATE_SCORE = 100000
+INFINITY = 1000000
+
+# search never goes deeper than this number of plies
+MAX_PLY = 64
+
+# scores above it are checkmates, endgame tablebase(see endgame_tablebase.py)
+# knows ones much further than search can reach, so it is not just MAX_PLY
+MIN_MATE_SCORE = MATE_SCORE - 1000
+
+DEFAULT_TIME_LIMIT = 1.0
+
+# how often(in nodes) to check if time is over, checking time on each node is slow
+_CHECK_TIME_EVERY_NODES = 256
+
+
+class _SearchStopped(Exception):
+    pass
+
+
+def get_move_str(piece, move_info):
+    """
+    Move in basic notation, as make_a_move_if_possible needs it, like "E2 E4" or "O-O"
+    """
+    if move_info.get("castle_notation"):
+        return move_info["castle_notation"]
+
+    return (
+        f"{SQUARES_TO_POSITIONS[piece.square]} {_get_move_info_new_position(move_info)}"
+    )
+
+
+def get_move_key(piece, move_info):
+    """
+    Move as small number, to compare moves found in different searches of the same
+    position, as pieces and move_info dictionaries may be different objects there
+    """
+    return encode_move(
+        piece.square, move_info["new_square"], move_info.get("promote_into")
+    )
+
+
+def _get_endgame_tablebase_score(tablebase_result, ply):
+    """
+    Result from endgame tablebase(see Board.probe_endgame_tablebase) --> score
+    """
+    if tablebase_result["result"] == "draw":
+        return 0
+
+    score = MATE_SCORE - ply - tablebase_result["distance"]
+
+    return score if tablebase_result["result"] == "win" else -score
+
+
+def _get_score_for_transposition_table(score, ply):
+    """
+    Checkmate scores depend on distance from the root of search, but the same position
+    may be found at different distance, so they are saved as distance from position.
+    """
+    if score >= MIN_MATE_SCORE:
+        return score + ply
+
+    if score <= -MIN_MATE_SCORE:
+        return score - ply
+
+    return score
+
+
+def _get_score_from_transposition_table(score, ply):
+    if score >= MIN_MATE_SCORE:
+        return score - ply
+
+    if score <= -MIN_MATE_SCORE:
+        return score + ply
+
+    return score
+
+
+class Engine:
+    def __init__(
+        self,
+        time_limit=DEFAULT_TIME_LIMIT,
+        max_depth=MAX_PLY,
+        node_limit=None,
+        use_opening_book=True,
+        use_endgame_tablebase=True,
+        transposition_table=None,
+        transposition_table_size_mb=DEFAULT_SIZE_MB,
+        start_depth=1,
+    ):
+        """
+        time_limit - at most how many seconds to search, None for no limit
+        max_depth - at most how many plies to search
+        node_limit - at most how many positions to visit, None for no limit
+        use_opening_book - play board's book moves(see Board.book_moves) without search
+        use_endgame_tablebase - take results of positions from board's endgame tablebase
+                            (see Board.probe_endgame_tablebase) instead of searching them
+        transposition_table - TranspositionTable to save results of searched positions
+                            in and use them later, by default engine creates its own
+        transposition_table_size_mb - size of table engine creates, 0 to search
+                            without transposition table
+        start_depth - depth to start iterative deepening from, helper processes of
+                    parallel search start deeper, to not repeat the main one
+        """
+        self.time_limit = time_limit
+        self.max_depth = min(max_depth, MAX_PLY)
+        self.node_limit = node_limit
+        self.use_opening_book = use_opening_book
+        self.use_endgame_tablebase = use_endgame_tablebase
+        self.transposition_table = transposition_table
+
+        if transposition_table is None and transposition_table_size_mb > 0:
+            self.transposition_table = TranspositionTable(
+                size_mb=transposition_table_size_mb
+            )
+        self.start_depth = min(start_depth, self.max_depth)
+
+        # number of positions visited in current search, and how many of them
+        # were visited by quiescence search(see _quiescence method)
+        self.nodes = 0
+        self.quiescence_nodes = 0
+
+        self._stop_time = None
+        # best lines of moves(as move keys) found for each ply of current search
+        self._principal_variations = [[] for _ in range(MAX_PLY + 1)]
+        # principal variation of previous iteration, to search its moves first
+        self._previous_principal_variation = []
+
+        self.move_orderer = MoveOrderer(max_ply=MAX_PLY)
+
+    def search(self, board):
+        """
+        Find best move for current player of the board. Board is left as it was.
+
+        Returns:
+            {
+                "move": "E2 E4",  # basic notation, None if there are no legal moves
+                "score": 35,  # in centipawns, for current player
+                # last fully searched depth, 0 for book and tablebase moves
+                "depth": 5,
+                "principal_variation": ["E2 E4", "E7 E5", ...],
+                "nodes": 12345,
+                "quiescence_nodes": 6789,  # part of nodes
+                "seconds": 0.93,
+                "from_opening_book": False,
+                "from_endgame_tablebase": False,
+                # see MoveOrderer.get_stats
+                "move_ordering": {"cutoffs": 321, ...},
+                # see TranspositionTable.get_stats
+                "transposition_table": {"hit_rate": 0.12, ...},
+            }
+        """
+        start_time = time.perf_counter()
+
+        result = {
+            "move": None,
+            "score": 0,
+            "depth": 0,
+            "principal_variation": [],
+            "nodes": 0,
+            "quiescence_nodes": 0,
+            "seconds": 0,
+            "from_opening_book": False,
+            "from_endgame_tablebase": False,
+            "move_ordering": {},
+            "transposition_table": {},
+        }
+
+        if self.use_opening_book:
+            book_moves = board.book_moves()
+
+            if book_moves:
+                result["move"] = book_moves[0]["move"]
+                result["principal_variation"] = [result["move"]]
+                result["from_opening_book"] = True
+
+                return result
+
+        if self.use_endgame_tablebase:
+            tablebase_moves = board.endgame_tablebase_moves()
+
+            if tablebase_moves:
+                result["move"] = tablebase_moves[0]["move"]
+                result["score"] = _get_endgame_tablebase_score(tablebase_moves[0], 0)
+                result["principal_variation"] = [result["move"]]
+                result["from_endgame_tablebase"] = True
+
+                return result
+
+        legal_moves = board.legal_moves()
+
+        if not legal_moves:
+            if board._player_has_check_in_position():
+                result["score"] = -MATE_SCORE
+
+            return result
+
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self._previous_principal_variation = []
+        self.move_orderer.new_search()
+
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        self._stop_time = None
+
+        if self.time_limit is not None:
+            self._stop_time = start_time + self.time_limit
+
+        # if search is stopped in the middle of the move,
+        # we need to know how many moves to undo
+        pushed_moves_count = len(board._pushed_moves_info)
+
+        best_principal_variation = [get_move_key(*legal_moves[0])]
+        score = 0
+
+        for depth in range(self.start_depth, self.max_depth + 1):
+            try:
+                score = self._negamax(board, depth, -INFINITY, INFINITY, 0)
+            except _SearchStopped:
+                while len(board._pushed_moves_info) > pushed_moves_count:
+                    board.pop()
+
+                # first moves of interrupted depth are ones from previous
+                # depths best line, so if some other move was found to be
+                # better than it, it is also better than previous result
+                if self._principal_variations[0]:
+                    best_principal_variation = self._principal_variations[0]
+
+                break
+
+            best_principal_variation = self._principal_variations[0]
+            self._previous_principal_variation = best_principal_variation
+
+            result["score"] = score
+            result["depth"] = depth
+
+            # no need to search deeper if checkmate was found
+            if abs(score) >= MIN_MATE_SCORE:
+                break
+
+            # next depth takes several times more time than current
+            # one, so most probably it would not be finished anyway
+            if (
+                self._stop_time is not None
+                and time.perf_counter() - start_time > self.time_limit / 2
+            ):
+                break
+
+        result["principal_variation"] = self._get_moves_strs(
+            board, best_principal_variation
+        )
+        result["move"] = result["principal_variation"][0]
+        result["nodes"] = self.nodes
+        result["quiescence_nodes"] = self.quiescence_nodes
+        result["move_ordering"] = self.move_orderer.get_stats()
+
+        if self.transposition_table is not None:
+            result["transposition_table"] = self.transposition_table.get_stats()
+        result["seconds"] = time.perf_counter() - start_time
+
+        return result
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        """
+        Score of position for current player, searching given number of plies further.
+        Positions with scores below alpha and above beta are not interesting, as players
+        have better options earlier, so their exact scores are not searched for.
+        """
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise _SearchStopped
+
+        self.nodes += 1
+
+        if (
+            self._stop_time is not None
+            and self.nodes % _CHECK_TIME_EVERY_NODES == 0
+            and time.perf_counter() >= self._stop_time
+        ):
+            raise _SearchStopped
+
+        self._principal_variations[ply] = []
+
+        # position repeats what was already played in the game or earlier in this
+        # line, players can keep repeating it, so it is counted as a draw, as well
+        # as positions where fifty-move rule makes it a draw
+        if ply > 0 and (
+            board.get_position_repetitions() > 1 or board.is_fifty_move_rule()
+        ):
+            return 0
+
+        if self.use_endgame_tablebase and ply > 0:
+            tablebase_result = board.probe_endgame_tablebase()
+
+            if tablebase_result is not None:
+                return _get_endgame_tablebase_score(tablebase_result, ply)
+
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiescence(board, alpha, beta, ply)
+
+        # move to try first
+        first_move_key = None
+
+        if ply < len(self._previous_principal_variation):
+            first_move_key = self._previous_principal_variation[ply]
+
+        transposition_table = self.transposition_table
+        position_hash = board.position_hash
+
+        if transposition_table is not None:
+            entry = transposition_table.probe(position_hash)
+
+            if entry is not None:
+                entry_depth, bound, score, entry_best_move_key = entry
+                score = _get_score_from_transposition_table(score, ply)
+
+                # position was already searched deep enough, but at root
+                # we need to know the move, not only the score
+                if entry_depth >= depth and ply > 0:
+                    if (
+                        bound == EXACT
+                        or (bound == LOWER_BOUND and score >= beta)
+                        or (bound == UPPER_BOUND and score <= alpha)
+                    ):
+                        return score
+
+                first_move_key = entry_best_move_key or first_move_key
+
+        legal_moves = board.legal_moves()
+
+        if not legal_moves:
+            if board._player_has_check_in_position():
+                return -MATE_SCORE + ply
+
+            # stalemate
+            return 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move_key = None
+
+        for move_number, (piece, move_info) in enumerate(
+            self.move_orderer.order_moves(board, legal_moves, ply, first_move_key)
+        ):
+            move_key = get_move_key(piece, move_info)
+
+            board.push(piece=piece, move_info=move_info)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move_key = move_key
+
+                if score > alpha:
+                    alpha = score
+
+                    self._principal_variations[ply] = [
+                        move_key
+                    ] + self._principal_variations[ply + 1]
+
+                    if alpha >= beta:
+                        self.move_orderer.add_cutoff(
+                            piece, move_info, ply, depth, move_number
+                        )
+                        break
+
+        if transposition_table is not None:
+            if best_score <= original_alpha:
+                bound = UPPER_BOUND
+            elif best_score >= beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+
+            transposition_table.store(
+                position_hash,
+                depth,
+                bound,
+                _get_score_for_transposition_table(best_score, ply),
+                best_move_key,
+            )
+
+        return best_score
+
+    def _quiescence(self, board, alpha, beta, ply):
+        """
+        Score of position, searching only kills and promotions from it, until there are
+        no more good ones. Without this, search stops in the middle of exchanges and
+        for example thinks that queen killing defended pawn wins a pawn.
+
+        Player does not have to kill, so position's own score is the lowest result,
+        except when player is checked, then all moves are searched.
+        Kills that lose material(see Board.static_exchange_evaluation) are skipped.
+        """
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise _SearchStopped
+
+        self.nodes += 1
+        self.quiescence_nodes += 1
+
+        if (
+            self._stop_time is not None
+            and self.nodes % _CHECK_TIME_EVERY_NODES == 0
+            and time.perf_counter() >= self._stop_time
+        ):
+            raise _SearchStopped
+
+        self._principal_variations[ply] = []
+
+        legal_moves = board.legal_moves()
+        is_checked = board._player_has_check_in_position()
+
+        if not legal_moves:
+            return -MATE_SCORE + ply if is_checked else 0
+
+        if ply >= MAX_PLY:
+            return board.evaluate()
+
+        best_score = -INFINITY
+
+        if not is_checked:
+            best_score = board.evaluate()
+
+            if best_score >= beta:
+                return best_score
+
+            alpha = max(alpha, best_score)
+
+            legal_moves = [
+                (piece, move_info)
+                for piece, move_info in legal_moves
+                if (
+                    move_info["killed_opponent_piece_square"] is not None
+                    or move_info.get("promote_into")
+                )
+                and board.static_exchange_evaluation(piece, move_info) >= 0
+            ]
+
+        for piece, move_info in self.move_orderer.order_moves(board, legal_moves, ply):
+            board.push(piece=piece, move_info=move_info)
+            score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score = score
+
+                if score > alpha:
+                    alpha = score
+
+                    if alpha >= beta:
+                        break
+
+        return best_score
+
+    def _get_moves_strs(self, board, move_keys):
+        """
+        Move keys of line of moves from current position --> basic notation moves
+        """
+        moves_strs = []
+
+        for move_key in move_keys:
+            for piece, move_info in board.legal_moves():
+                if get_move_key(piece, move_info) == move_key:
+                    moves_strs.append(get_move_str(piece, move_info))
+                    board.push(piece=piece, move_info=move_info)
+                    break
+            else:
+                break
+
+        for _ in moves_strs:
+            board.pop()
+
+        return moves_strs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find best move in given position")
+    parser.add_argument(
+        "--fen",
+        default=STARTING_POSITION_FEN,
+        help="position to search, starting position by default",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=DEFAULT_TIME_LIMIT,
+        help="seconds to search",
+    )
+    parser.add_argument("--max-depth", type=int, default=MAX_PLY)
+    parser.add_argument("--node-limit", type=int, default=None)
+    parser.add_argument(
+        "--backend",
+        choices=(MAILBOX_BACKEND, BITBOARD_BACKEND),
+        default=MAILBOX_BACKEND,
+    )
+
+    args = parser.parse_args()
+
+    board = Board.from_fen(args.fen, backend=args.backend)
+
+    engine = Engine(
+        time_limit=args.time_limit,
+        max_depth=args.max_depth,
+        node_limit=args.node_limit,
+    )
+    result = engine.search(board)
+
+    print(f"Best move: {result['move']}")
+    print(f"Score: {result['score']}")
+    print(f"Depth: {result['depth']}")
+    print(f"Principal variation: {' '.join(result['principal_variation'])}")
+    print(f"Nodes: {result['nodes']}")
+
+    if result["transposition_table"]:
+        print(
+            "Transposition table hit rate: "
+            f"{result['transposition_table']['hit_rate']:.1%}"
+        )
+
+    if result["move_ordering"]:
+        print(
+            "Cutoffs by first move: "
+            f"{result['move_ordering']['first_move_cutoffs_rate']:.1%}"
+        )
+
+    print(f"Time: {result['seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
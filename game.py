@@ -1,22 +1,30 @@
 """
 Play chess in CLI with both player being just you.
 
-Can be useful if you do not have friends to play it with, 
+Can be useful if you do not have friends to play it with,
 or you are doing some testing/development.
 """
 
 import time
 from rich import print
 
-from board import Board
+from _endgame_tablebase import EndgameTablebase
+from _opening_book import OpeningBook
+from board import DRAW_MESSAGES, STALEMATE, Board
+from engine import DEFAULT_TIME_LIMIT, Engine
+from parallel_search import ParallelEngine
 
 # if set to True, moves history and previous game states
 # will also be printed on the screen during the game
 
+# type it instead of a move to get a suggestion
+HINT_COMMAND = "hint"
+
 
 class Game:
     """
-    Basic game class that allows 1 player to play both sides of chess game.
+    Basic game class that allows 1 player to play both sides of chess
+    game, or one side against computer(see engine.py).
 
     As you can see from the code, it is very similar to multiplayer_game.py file
     as they use the same API that board provides.
@@ -32,15 +40,49 @@ class Game:
         white_cell_color="grey37",
         previous_move_cell_color="green4",
         debug_mode=True,
+        opening_book_file_path=None,
+        endgame_tablebase_directory=None,
+        computer_player_number=None,
+        engine_time_limit=DEFAULT_TIME_LIMIT,
+        engine_processes=1,
     ):
+        """
+        opening_book_file_path - opening book file(see opening_book.py) to
+                                suggest moves from, when hint is asked
+        endgame_tablebase_directory - directory with endgame tables(see
+                                endgame_tablebase.py), to play and suggest
+                                perfect moves when few pieces are left
+        computer_player_number - 1 or 2 to let computer play for that player
+        engine_time_limit - seconds computer can think about each move or hint
+        engine_processes - number of processes computer uses to search moves(see
+                        parallel_search.py), None for all CPU cores
+        """
+        opening_book = None
+
+        if opening_book_file_path:
+            opening_book = OpeningBook.load(opening_book_file_path)
+
+        endgame_tablebase = None
+
+        if endgame_tablebase_directory:
+            endgame_tablebase = EndgameTablebase.load(endgame_tablebase_directory)
+
         self.board = Board(
             p1_color=p1_color,
             p2_color=p2_color,
             black_cell_color=black_cell_color,
             white_cell_color=white_cell_color,
             previous_move_cell_color=previous_move_cell_color,
+            opening_book=opening_book,
+            endgame_tablebase=endgame_tablebase,
         )
 
+        self.computer_player_number = computer_player_number
+        self.engine_time_limit = engine_time_limit
+        self.engine_processes = engine_processes
+        # created when computer moves or hint is asked for the first time, see engine
+        self._engine = None
+
         self.debug_mode = debug_mode
 
         self._game_status = "initial"
@@ -48,48 +90,136 @@ class Game:
     def __repr__(self):
         print(f"Game with board\n {self.board}")
 
+    @property
+    def engine(self):
+        """
+        Engine is created only when it is needed, as parallel one starts
+        processes and allocates shared memory, which close method frees
+        """
+        if self._engine is None:
+            if self.engine_processes == 1:
+                self._engine = Engine(time_limit=self.engine_time_limit)
+            else:
+                self._engine = ParallelEngine(
+                    processes=self.engine_processes, time_limit=self.engine_time_limit
+                )
+
+        return self._engine
+
+    def close(self):
+        """
+        Stop search processes of engine, if there are any
+        """
+        if isinstance(self._engine, ParallelEngine):
+            self._engine.close()
+
+        self._engine = None
+
+    def get_hint(self):
+        """
+        Move suggestion for current player as text, or None if there is no one
+        """
+        # looking move up in the book costs nothing, so try it first
+        book_moves = self.board.book_moves()
+
+        if book_moves:
+            return f'{book_moves[0]["move"]} (played in {book_moves[0]["games"]} games)'
+
+        tablebase_moves = self.board.endgame_tablebase_moves()
+
+        if tablebase_moves:
+            move = tablebase_moves[0]
+
+            if move["result"] == "draw":
+                return f'{move["move"]} (draw)'
+
+            return (
+                f'{move["move"]} ({move["result"]}, '
+                f'checkmate in {move["distance"]} plies)'
+            )
+
+        search_result = self.engine.search(self.board)
+
+        return search_result["move"]
+
     def play(self):
         print("Game Started")
 
         self._game_status = "running"
 
-        # start game and maintain it before necessary
-        while self._game_status == "running":
+        try:
+            # start game and maintain it before necessary
+            while self._game_status == "running":
 
-            # draw new board
-            self.board.draw(debug_mode=self.debug_mode)
+                # draw new board
+                self.board.draw(debug_mode=self.debug_mode)
 
-            (
-                move_was_successfull,
-                move_errors,
-                next_player_troubles,
-            ) = self.board.make_a_move_if_possible(input())
+                if self.board._player_turn == self.computer_player_number:
+                    move_str = self.engine.search(self.board)["move"]
 
-            # make sure it seems valid chess move
-            if not move_was_successfull:
-                assert len(move_errors) > 0
+                    # not checkmated, as game would have been already finished
+                    if move_str is None:
+                        self.board._add_temporary_error(DRAW_MESSAGES[STALEMATE])
 
-                for error_text in move_errors:
-                    self.board._add_temporary_error(error_text)
+                        self._game_status = "Finished"
 
-                continue
+                        self.board.draw(debug_mode=self.debug_mode)
+                        break
+                else:
+                    move_str = input()
 
-            if next_player_troubles["player_is_checked"]:
-                if next_player_troubles["player_is_checkmated"]:
-                    # game over, current player lose
-                    self.board._add_temporary_error("You lost the game!")
+                if move_str.strip().lower() == HINT_COMMAND:
+                    hint = self.get_hint()
 
-                    self._game_status = "Finished"
+                    self.board._add_temporary_error(
+                        f"Hint: {hint}" if hint else "No hints for this position"
+                    )
 
-                    self.board.draw(debug_mode=self.debug_mode)
-                else:
-                    info = next_player_troubles["move_that_makes_check_disappear"]
+                    continue
+
+                (
+                    move_was_successfull,
+                    move_errors,
+                    next_player_troubles,
+                ) = self.board.make_a_move_if_possible(move_str)
+
+                # make sure it seems valid chess move
+                if not move_was_successfull:
+                    assert len(move_errors) > 0
+
+                    for error_text in move_errors:
+                        self.board._add_temporary_error(error_text)
+
+                    continue
 
+                if next_player_troubles["player_is_checked"]:
+                    if next_player_troubles["player_is_checkmated"]:
+                        # game over, current player lose
+                        self.board._add_temporary_error("You lost the game!")
+
+                        self._game_status = "Finished"
+
+                        self.board.draw(debug_mode=self.debug_mode)
+                    else:
+                        info = next_player_troubles["move_that_makes_check_disappear"]
+
+                        self.board._add_temporary_error(
+                            f'One possible move: {info["piece"]} {info["new_position"]}'
+                        )
+
+                        # add it after previous message as draw function gets info from end first
+                        self.board._add_temporary_error("Check!")
+
+                if next_player_troubles["game_status"] in DRAW_MESSAGES:
                     self.board._add_temporary_error(
-                        f'One possible move: {info["piece"]} {info["new_position"]}'
+                        DRAW_MESSAGES[next_player_troubles["game_status"]]
                     )
 
-                    # add it after previous message as draw function gets info from end first
-                    self.board._add_temporary_error("Check!")
+                    self._game_status = "Finished"
+
+                    self.board.draw(debug_mode=self.debug_mode)
 
-            time.sleep(0.1)
+                time.sleep(0.1)
+        finally:
+            # stop search processes, also when game is interrupted
+            self.close()
@@ -0,0 +1,226 @@
+"""
+Compact binary format for games.
+
+Each game record is a small header and 2 bytes(16 bits) for each move:
+    . header
+        - 2 bytes: b"CG"
+        - 1 byte: format version
+        - 1 byte: flags, first bit is set if game starts from other than starting position
+        - 2 bytes: number of moves
+        - only if game does not start from starting position: 1 byte FEN length and FEN
+    . moves, each one as 16-bit number, where:
+        - bits 0-5: square from which piece moves(0 for A1, 63 for H8)
+        - bits 6-11: square to which piece moves(for castling, king's one)
+        - bits 12-13: piece to promote into(Q, R, B, N), if bit 14 is set
+
+All numbers are big-endian. Records can be written one after another into the same file,
+as each of them knows its length.
+
+Usage:
+    record = encode_board_history(board)
+    board = replay_game_record(record)
+
+    with open("games.bin", "wb") as f:
+        write_game_records(f, records)
+
+    with open("games.bin", "rb") as f:
+        for record in read_game_records(f):
+            ...
+"""
+
+import struct
+
+from _move_related_functions import (
+    POSITIONS_TO_SQUARES,
+    SQUARES_TO_POSITIONS,
+    decode_move,
+    encode_move,
+)
+from board import STARTING_POSITION_FEN, Board
+
+MAGIC = b"CG"
+VERSION = 1
+
+_HEADER = struct.Struct(">2sBBH")
+_HAS_FEN_FLAG = 1
+
+# squares of king before and after castling, for player 1 and player 2
+_CASTLING_KING_SQUARES = {
+    ("O-O", 1): (4, 6),
+    ("O-O-O", 1): (4, 2),
+    ("O-O", 2): (60, 62),
+    ("O-O-O", 2): (60, 58),
+}
+
+
+def encode_game_record(moves, starting_fen=STARTING_POSITION_FEN):
+    """
+    Make game record from moves given as (from_square, to_square, promote_into) tuples.
+    """
+    flags = 0
+    fen_bytes = b""
+
+    if starting_fen != STARTING_POSITION_FEN:
+        flags |= _HAS_FEN_FLAG
+        fen_bytes = starting_fen.encode("ascii")
+        fen_bytes = bytes([len(fen_bytes)]) + fen_bytes
+
+    return (
+        _HEADER.pack(MAGIC, VERSION, flags, len(moves))
+        + fen_bytes
+        + struct.pack(f">{len(moves)}H", *[encode_move(*i) for i in moves])
+    )
+
+
+def _decode_header(data, offset=0):
+    """
+    Returns starting FEN, number of moves and offset where moves start
+    """
+    if len(data) < offset + _HEADER.size:
+        raise ValueError("Game record is too short")
+
+    magic, version, flags, moves_count = _HEADER.unpack_from(data, offset)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a game record, or unsupported version of it")
+
+    offset += _HEADER.size
+    starting_fen = STARTING_POSITION_FEN
+
+    if flags & _HAS_FEN_FLAG:
+        fen_length = data[offset]
+        starting_fen = data[offset + 1 : offset + 1 + fen_length].decode("ascii")
+        offset += 1 + fen_length
+
+    return starting_fen, moves_count, offset
+
+
+def decode_game_record(data):
+    """
+    Game record --> (starting_fen, [(from_square, to_square, promote_into), ...])
+    """
+    starting_fen, moves_count, offset = _decode_header(data)
+
+    if len(data) != offset + moves_count * 2:
+        raise ValueError("Game record length does not match number of moves in it")
+
+    encoded_moves = struct.unpack_from(f">{moves_count}H", data, offset)
+
+    return starting_fen, [decode_move(i) for i in encoded_moves]
+
+
+def get_basic_move_squares(move, player_number):
+    """
+    Basic notation move of given player --> (from_square, to_square, promote_into)
+    ex:
+        "E7 E8=Q" --> (52, 60, "Q")
+        "O-O" --> (4, 6, None) for player 1
+    """
+    if move in ("O-O", "O-O-O"):
+        return (*_CASTLING_KING_SQUARES[(move, player_number)], None)
+
+    move_from, move_to = move.split()
+    move_to, _, promote_into = move_to.partition("=")
+
+    return (
+        POSITIONS_TO_SQUARES[move_from],
+        POSITIONS_TO_SQUARES[move_to],
+        promote_into or None,
+    )
+
+
+def encode_board_history(board):
+    """
+    Make game record from all moves made on board, see Board.moves
+    """
+    moves = []
+    # player who made first move
+    player_number = 1 if board.starting_fen.split()[1] == "w" else 2
+
+    for two_player_moves in board.moves:
+        for move in two_player_moves:
+            moves.append(get_basic_move_squares(move, player_number))
+
+            player_number = 3 - player_number
+
+    return encode_game_record(moves, starting_fen=board.starting_fen)
+
+
+def replay_game_record(data, with_history=False, **kwargs):
+    """
+    Create board(other arguments are passed to it) and apply all moves of game record.
+
+    Moves are checked to be legal, but by default are applied without updating
+    board's moves histories, as converting each move into chess notation takes
+    most of the time. Use with_history=True to get them as well.
+    """
+    starting_fen, moves = decode_game_record(data)
+
+    board = Board.from_fen(starting_fen, **kwargs)
+
+    for from_square, to_square, promote_into in moves:
+        if with_history:
+            move_str = (
+                f"{SQUARES_TO_POSITIONS[from_square]} {SQUARES_TO_POSITIONS[to_square]}"
+            )
+
+            if promote_into:
+                move_str += f"={promote_into}"
+
+            success, errors, _ = board.make_a_move_if_possible(move_str)
+
+            if not success:
+                raise ValueError(f"Move {move_str} is not possible: {errors}")
+
+            continue
+
+        for piece, move_info in board.legal_moves():
+            if (
+                piece.square == from_square
+                and move_info["new_square"] == to_square
+                and move_info.get("promote_into") == promote_into
+            ):
+                piece.apply_move_info_to_board(board_state=board, move_info=move_info)
+                break
+        else:
+            raise ValueError(
+                f"Move from {SQUARES_TO_POSITIONS[from_square]} to "
+                f"{SQUARES_TO_POSITIONS[to_square]} is not possible"
+            )
+
+    return board
+
+
+def write_game_records(file_object, records):
+    """
+    Write game records into binary file object one after another
+    """
+    for record in records:
+        file_object.write(record)
+
+
+def read_game_records(file_object):
+    """
+    Yield game records from binary file object, one at a time
+    """
+    while True:
+        record = file_object.read(_HEADER.size)
+
+        if not record:
+            return
+
+        if len(record) < _HEADER.size:
+            raise ValueError("Game record is not complete")
+
+        _, _, flags, moves_count = _HEADER.unpack(record)
+
+        if flags & _HAS_FEN_FLAG:
+            fen_length = file_object.read(1)
+            record += fen_length + file_object.read(fen_length[0] if fen_length else 0)
+
+        record += file_object.read(moves_count * 2)
+
+        # also checks that record is complete
+        decode_game_record(record)
+
+        yield record
@@ -2,17 +2,14 @@
 Implements basic functionality with sockets to play game in live using 2 players.
 
 Actually, you do not need to work with this file directly to start the game,
-please look at player_1.py and player_2.py and config.py for that purpose. 
+please look at player_1.py and player_2.py and config.py for that purpose.
 """
 
-
 import socket
 
 from rich import print
 
-from board import Board
-
-
+from board import DRAW_MESSAGES, Board
 
 
 class Game:
@@ -44,7 +41,7 @@ class Game:
             white_cell_color=white_cell_color,
             previous_move_cell_color=previous_move_cell_color,
         )
-        
+
         self.debug_mode = debug_mode
 
         # is used only when doing 2 player game
@@ -74,6 +71,13 @@ class Game:
                 # add it after previous message as draw function gets info from end first
                 self.board._add_temporary_error("Check!")
 
+        if current_player_troubles["game_status"] in DRAW_MESSAGES:
+            self.board._add_temporary_error(
+                DRAW_MESSAGES[current_player_troubles["game_status"]]
+            )
+            self.board.draw(**args)
+            exit()
+
     def play(self, connection):
         print("Game Started")
 
@@ -0,0 +1,98 @@
+"""
+Build opening book(see _opening_book.py) from games, to know which moves strong players
+make in the first moves of the game and how those games ended, without any search.
+
+Usage:
+    with open("games.pgn") as f:
+        book = build_opening_book(read_pgn_games(f))
+
+    book.save("book.bin")
+
+    board = Board(opening_book=OpeningBook.load("book.bin"))
+    board.book_moves()  # [{"move": "E2 E4", "games": 12, ...}, ...]
+
+From command line:
+    python opening_book.py games.pgn book.bin --max-plies 20 --min-games 2
+"""
+
+import argparse
+
+from _move_related_functions import encode_move
+from _opening_book import OpeningBook
+from board import MAILBOX_BACKEND, Board
+from game_records import get_basic_move_squares
+from pgn_reader import read_pgn_games
+
+# how many first moves(of both players) of each game to add into book
+DEFAULT_MAX_PLIES = 20
+
+
+def build_opening_book(
+    games,
+    max_plies=DEFAULT_MAX_PLIES,
+    min_games=1,
+    backend=MAILBOX_BACKEND,
+):
+    """
+    Replay games from any iterable(for example read_pgn_games generator) and count
+    first max_plies moves of each one. Moves played in less than min_games games
+    are not kept. Games are used till the first move that could not be applied.
+    """
+    book = OpeningBook()
+
+    for game in games:
+        board = Board(backend=backend)
+        moves = [
+            move for two_player_moves in game["moves"] for move in two_player_moves
+        ]
+
+        for move in moves[:max_plies]:
+            position_hash = board.position_hash
+            player_number = board._player_turn
+
+            try:
+                board.apply_chess_notation_moves([[move]])
+            except (ValueError, AssertionError):
+                break
+
+            move_squares = get_basic_move_squares(board.moves[-1][-1], player_number)
+
+            book.add_move(position_hash, encode_move(*move_squares), game.get("result"))
+
+    if min_games > 1:
+        book.remove_rare_moves(min_games)
+
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build opening book from pgn file")
+    parser.add_argument("pgn_file_path")
+    parser.add_argument("book_file_path")
+    parser.add_argument(
+        "--max-plies",
+        type=int,
+        default=DEFAULT_MAX_PLIES,
+        help="how many first moves of both players of each game to use",
+    )
+    parser.add_argument(
+        "--min-games",
+        type=int,
+        default=1,
+        help="keep only moves played at least in that many games",
+    )
+
+    args = parser.parse_args()
+
+    with open(args.pgn_file_path) as f:
+        book = build_opening_book(
+            read_pgn_games(f), max_plies=args.max_plies, min_games=args.min_games
+        )
+
+    book.save(args.book_file_path)
+
+    print(f"Positions in book: {len(book)}")
+
+
+if __name__ == "__main__":
+    main()
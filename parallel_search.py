@@ -0,0 +1,233 @@
+"""
+Search best move using all CPU cores(Lazy SMP).
+
+Move generation is pure Python, so threads would wait for each other, and separate
+processes are used instead. Each of them searches the same position on its own copy of
+the board(position is sent to them as FEN, which is just a short string, with hashes of
+previous positions it can repeat), but all of them save results into one transposition
+table in shared memory. Processes do not split the work in any smart way, they just find
+each other's results in the table and skip parts of search that others already did,
+which is enough to get deeper in the same time.
+Half of them start one ply deeper than others, so that they do not all follow each other.
+
+Result of the process that finished the biggest depth is used, of the first one if
+several finished the same depth.
+
+Usage:
+    with ParallelEngine(processes=4, time_limit=1) as engine:
+        result = engine.search(board)
+
+From command line:
+    python parallel_search.py --processes 4 --fen "<FEN>"
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+
+from _transposition_table import DEFAULT_SIZE_MB, TranspositionTable
+from board import BITBOARD_BACKEND, MAILBOX_BACKEND, STARTING_POSITION_FEN, Board
+from engine import DEFAULT_TIME_LIMIT, MAX_PLY, Engine
+
+# transposition table of worker process, it is created once, when process starts
+_worker_transposition_table = None
+
+
+def _initialize_worker(transposition_table_name, transposition_table_size_mb):
+    global _worker_transposition_table
+
+    _worker_transposition_table = TranspositionTable(
+        size_mb=transposition_table_size_mb, name=transposition_table_name
+    )
+
+
+def _search_in_worker(
+    fen, position_history, backend, worker_index, stop_time, max_depth, node_limit
+):
+    """
+    stop_time is time.time() when search should be finished, not number of seconds, as
+    process may start this search only after finishing other one, if pool gives it two
+    """
+    time_limit = None
+
+    if stop_time is not None:
+        time_limit = max(stop_time - time.time(), 0)
+
+    board = Board.from_fen(fen, backend=backend)
+    # FEN does not have previous positions, search needs them to find repetitions
+    board.set_position_history(position_history)
+
+    engine = Engine(
+        time_limit=time_limit,
+        max_depth=max_depth,
+        node_limit=node_limit,
+        use_opening_book=False,
+        transposition_table=_worker_transposition_table,
+        start_depth=1 + worker_index % 2,
+    )
+
+    result = engine.search(board)
+    result["worker_index"] = worker_index
+
+    return result
+
+
+class ParallelEngine:
+    def __init__(
+        self,
+        processes=None,
+        time_limit=DEFAULT_TIME_LIMIT,
+        max_depth=MAX_PLY,
+        node_limit=None,
+        use_opening_book=True,
+        use_endgame_tablebase=True,
+        transposition_table_size_mb=DEFAULT_SIZE_MB,
+    ):
+        """
+        processes - number of search processes, all CPU cores by default
+        node_limit - at most how many positions each process can visit
+        Other arguments are the same as Engine has.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.node_limit = node_limit
+        self.use_opening_book = use_opening_book
+        self.use_endgame_tablebase = use_endgame_tablebase
+
+        self.transposition_table = TranspositionTable(
+            size_mb=transposition_table_size_mb, shared=True
+        )
+
+        # processes are started once and reused for all searches,
+        # starting them takes more time than some searches need
+        self._pool = multiprocessing.Pool(
+            self.processes,
+            initializer=_initialize_worker,
+            initargs=(self.transposition_table.name, transposition_table_size_mb),
+        )
+
+    def search(self, board):
+        """
+        Same as Engine.search, but result also has "worker_index" of process whose result
+        was used and "processes" keys, and "nodes" are summed for all processes.
+        """
+        start_time = time.perf_counter()
+
+        # no need to search, and processes do not have book and tablebase anyway
+        if (self.use_opening_book and board.book_moves()) or (
+            self.use_endgame_tablebase and board.endgame_tablebase_moves()
+        ):
+            result = Engine(
+                time_limit=self.time_limit,
+                max_depth=self.max_depth,
+                node_limit=self.node_limit,
+                use_opening_book=self.use_opening_book,
+                use_endgame_tablebase=self.use_endgame_tablebase,
+                transposition_table_size_mb=0,
+            ).search(board)
+            result["worker_index"] = None
+            result["processes"] = 0
+
+            return result
+
+        # time of different processes can only be compared with time.time()
+        stop_time = None
+
+        if self.time_limit is not None:
+            stop_time = time.time() + self.time_limit
+
+        fen = board.to_fen()
+        position_history = board.get_position_history()
+
+        async_results = [
+            self._pool.apply_async(
+                _search_in_worker,
+                (
+                    fen,
+                    position_history,
+                    board.backend,
+                    worker_index,
+                    stop_time,
+                    self.max_depth,
+                    self.node_limit,
+                ),
+            )
+            for worker_index in range(self.processes)
+        ]
+
+        results = [async_result.get() for async_result in async_results]
+
+        result = max(results, key=lambda i: (i["depth"], -i["worker_index"]))
+
+        result["nodes"] = sum(i["nodes"] for i in results)
+        result["quiescence_nodes"] = sum(i["quiescence_nodes"] for i in results)
+        result["seconds"] = time.perf_counter() - start_time
+        result["processes"] = self.processes
+
+        return result
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+        self.transposition_table.close(unlink=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find best move in given position using all CPU cores"
+    )
+    parser.add_argument(
+        "--fen",
+        default=STARTING_POSITION_FEN,
+        help="position to search, starting position by default",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="number of search processes, all CPU cores by default",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=DEFAULT_TIME_LIMIT,
+        help="seconds to search",
+    )
+    parser.add_argument("--max-depth", type=int, default=MAX_PLY)
+    parser.add_argument(
+        "--backend",
+        choices=(MAILBOX_BACKEND, BITBOARD_BACKEND),
+        default=MAILBOX_BACKEND,
+    )
+
+    args = parser.parse_args()
+
+    board = Board.from_fen(args.fen, backend=args.backend)
+
+    with ParallelEngine(
+        processes=args.processes,
+        time_limit=args.time_limit,
+        max_depth=args.max_depth,
+    ) as engine:
+        result = engine.search(board)
+
+    print(f"Best move: {result['move']}")
+    print(f"Score: {result['score']}")
+    print(f"Depth: {result['depth']}")
+    print(f"Principal variation: {' '.join(result['principal_variation'])}")
+    print(f"Processes: {result['processes']}")
+    print(f"Nodes: {result['nodes']}")
+    print(f"Time: {result['seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
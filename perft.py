@@ -0,0 +1,130 @@
+"""
+Perft - count all positions reachable from current board position in given number of moves.
+
+Numbers for well known positions are published(for example, from starting position
+there are 20, 400, 8902, 197281 positions after 1, 2, 3, 4 moves), so it is the easiest
+way to make sure that move generation is correct, and as it does nothing except
+generating and applying moves, also to measure how fast it is.
+
+Usage from command line:
+    python perft.py 4
+    python perft.py 3 --divide --backend bitboard --moves e4 e5 Nf3
+    python perft.py 3 --fen "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+"""
+
+import argparse
+import time
+
+from _move_related_functions import SQUARES_TO_POSITIONS, _get_move_info_new_position
+from board import BITBOARD_BACKEND, MAILBOX_BACKEND, STARTING_POSITION_FEN, Board
+
+
+def perft(board, depth):
+    """
+    Number of leaf nodes of moves tree of given depth from current board position.
+    To measure speed of move generation, create board with position_cache_size=0.
+    """
+    if depth == 0:
+        return 1
+
+    legal_moves = board.legal_moves()
+
+    # no need to apply last moves, we only need their count
+    if depth == 1:
+        return len(legal_moves)
+
+    nodes = 0
+
+    for piece, move_info in legal_moves:
+        board.push(piece=piece, move_info=move_info)
+        nodes += perft(board, depth - 1)
+        board.pop()
+
+    return nodes
+
+
+def perft_divide(board, depth):
+    """
+    Same as perft, but returns number of leaf nodes for each move from current position,
+    as dictionary with basic notation moves(like "E2 E4" or "O-O") as keys.
+
+    When some count differs from expected one, this allows to find which
+    move causes it, and going deeper from there, which position has a problem.
+    """
+    assert depth > 0
+
+    nodes_by_moves = {}
+
+    for piece, move_info in board.legal_moves():
+        if move_info.get("castle_notation"):
+            move_str = move_info["castle_notation"]
+        else:
+            move_str = f"{SQUARES_TO_POSITIONS[piece.square]} {_get_move_info_new_position(move_info)}"
+
+        board.push(piece=piece, move_info=move_info)
+        nodes_by_moves[move_str] = perft(board, depth - 1)
+        board.pop()
+
+    return nodes_by_moves
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count positions reachable from given position in given number of moves"
+    )
+    parser.add_argument("depth", type=int)
+    parser.add_argument(
+        "--divide",
+        action="store_true",
+        help="also show number of positions for each move from starting position",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=(MAILBOX_BACKEND, BITBOARD_BACKEND),
+        default=MAILBOX_BACKEND,
+    )
+    parser.add_argument(
+        "--fen",
+        default=STARTING_POSITION_FEN,
+        help="position to start from, starting position by default",
+    )
+    parser.add_argument(
+        "--moves",
+        nargs="*",
+        default=[],
+        help="chess notation moves to apply to position before counting, like: e4 e5 Nf3",
+    )
+
+    args = parser.parse_args()
+
+    # most positions of perft tree are visited once, so position cache would only spend
+    # time on saving and evicting them, and speed would not be of move generation
+    board = Board.from_fen(args.fen, backend=args.backend, position_cache_size=0)
+
+    # apply_chess_notation_moves needs moves grouped by 2
+    board.apply_chess_notation_moves(
+        [args.moves[i : i + 2] for i in range(0, len(args.moves), 2)]
+    )
+
+    start_time = time.perf_counter()
+
+    if args.divide:
+        nodes_by_moves = perft_divide(board, args.depth)
+
+        for move_str, nodes in sorted(nodes_by_moves.items()):
+            print(f"{move_str}: {nodes}")
+
+        nodes = sum(nodes_by_moves.values())
+        print()
+    else:
+        nodes = perft(board, args.depth)
+
+    seconds = time.perf_counter() - start_time
+
+    print(f"Nodes: {nodes}")
+    print(f"Time: {seconds:.3f}s")
+    print(f"Nodes/second: {nodes / seconds if seconds else 0:.0f}")
+
+
+if __name__ == "__main__":
+    main()
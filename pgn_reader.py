@@ -0,0 +1,139 @@
+"""
+Streaming reader of PGN files.
+
+Games are read line by line and given back one at a time, so even huge game databases
+can be loaded with Board.apply_chess_notation_moves without keeping them in memory.
+
+Usage:
+    with open("games.pgn") as f:
+        for game in read_pgn_games(f):
+            board = Board()
+            board.apply_chess_notation_moves(game["moves"])
+"""
+
+import re
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+_HEADER_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+
+# comments and variations borders, NAGs like $1, results, move numbers
+# like "12." or "12..." and everything else, which should be moves
+_TOKEN_RE = re.compile(r"[{};()]|\$\d+|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s{};()$]+")
+
+
+def group_moves_by_two(moves):
+    """
+    ["e4", "e5", "Nf3"] --> [["e4", "e5"], ["Nf3"]], as apply_chess_notation_moves needs
+    """
+    return [moves[i : i + 2] for i in range(0, len(moves), 2)]
+
+
+def _get_game(headers, moves, result):
+    return {
+        "headers": headers,
+        "moves": group_moves_by_two(moves),
+        "result": result,
+    }
+
+
+def read_pgn_games(file_object):
+    """
+    Yield games from file object(or any other iterable of lines) with PGN text, like:
+        {
+            "headers": {"White": "Ding, Liren", "Black": "Carlsen, Magnus", ...},
+            "moves": [["d4", "Nf6"], ["c4", "e6"], ...],
+            "result": "1-0",
+        }
+
+    Comments, variations and NAGs are skipped, as well as move annotations like "!?".
+    Result is None if game text ends without it.
+    """
+    headers = {}
+    moves = []
+
+    in_comment = False
+    variations_depth = 0
+
+    for line in file_object:
+        position = 0
+
+        # comment started on some previous line
+        if in_comment:
+            comment_end = line.find("}")
+
+            if comment_end == -1:
+                continue
+
+            in_comment = False
+            position = comment_end + 1
+
+        # escaped lines
+        if position == 0 and line.startswith("%"):
+            continue
+
+        stripped_line = line.strip()
+
+        if position == 0 and stripped_line.startswith("[") and not variations_depth:
+            # headers without result at the end of previous game
+            if moves:
+                yield _get_game(headers, moves, None)
+                headers, moves = {}, []
+
+            header_match = _HEADER_RE.match(stripped_line)
+
+            if header_match:
+                headers[header_match.group(1)] = header_match.group(2).replace(
+                    '\\"', '"'
+                )
+
+            continue
+
+        while True:
+            token_match = _TOKEN_RE.search(line, position)
+
+            if token_match is None:
+                break
+
+            token = token_match.group()
+            position = token_match.end()
+
+            if token == "{":
+                comment_end = line.find("}", position)
+
+                if comment_end == -1:
+                    in_comment = True
+                    break
+
+                position = comment_end + 1
+
+            elif token == ";":
+                # comment till the end of line
+                break
+
+            elif token == "(":
+                variations_depth += 1
+
+            elif token == ")":
+                variations_depth = max(variations_depth - 1, 0)
+
+            elif variations_depth or token[0] == "$" or token[-1] == ".":
+                continue
+
+            elif token in RESULTS:
+                yield _get_game(headers, moves, token)
+                headers, moves = {}, []
+
+            else:
+                # castling is sometimes written with zeros
+                if token.startswith("0-0"):
+                    token = token.replace("0", "O")
+
+                move = token.rstrip("!?")
+
+                # annotation like "!" may be written as separate token
+                if move:
+                    moves.append(move)
+
+    if moves or headers:
+        yield _get_game(headers, moves, None)
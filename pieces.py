@@ -1,24 +1,25 @@
 import abc
-import re
 
 from _move_related_functions import (
+    BISHOP_DIRECTIONS,
+    KING_TARGETS,
+    KNIGHT_TARGETS,
+    PAWN_ATTACKS,
     PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO,
-    _bottom_coords,
-    _bottom_left_coords,
-    _bottom_right_coords,
+    POSITIONS_TO_SQUARES,
+    QUEEN_DIRECTIONS,
+    ROOK_DIRECTIONS,
+    SQUARES_TO_POSITIONS,
     _get_linearly_distant_cells_from_piece_position,
-    _is_chess_cell_coord,
-    _left_coords,
-    _right_coords,
-    _top_coords,
-    _top_left_coords,
-    _top_right_coords,
 )
 
 
 class Piece(metaclass=abc.ABCMeta):
     """
     Chess piece superclass for subclasses like Pawn, Queen, King e.t.c
+
+    Internally piece keeps its position as square index from 0(A1) to 63(H8),
+    position property gives it in usual "E2"-like notation.
     """
 
     def __init__(self, color, name, piece_icon, position, player_number):
@@ -26,22 +27,21 @@ class Piece(metaclass=abc.ABCMeta):
         self.name = name
         self.player_number = player_number
         self.piece_icon = piece_icon
-        self._position = position
+        self.square = POSITIONS_TO_SQUARES[position]
         self.moves_count = 0
 
+        # checked very often while generating moves, so it is not a property
+        self.piece_name = type(self).__name__.lower()
+
     def __repr__(self):
         return f"Player {self.player_number} {self.piece_name.capitalize()} on {self.position}".title()
 
     def increase_moves_count(self):
         self.moves_count += 1
 
-    @property
-    def piece_name(self):
-        return type(self).__name__.lower()
-
     @property
     def position(self):
-        return self._position
+        return SQUARES_TO_POSITIONS[self.square]
 
     @property
     def current_row(self) -> int:
@@ -74,12 +74,13 @@ class Piece(metaclass=abc.ABCMeta):
     def position(self, position):
 
         # basic check that position is not outside of board
-        try:
-            assert position and position[0] in "ABCDEFGH" and position[1] in "12345678"
-        except Exception:
+        if position not in POSITIONS_TO_SQUARES:
             raise ValueError("Please use correct position from Range A1 to H8")
 
-        self._position = position
+        self.move_to_square(POSITIONS_TO_SQUARES[position])
+
+    def move_to_square(self, square):
+        self.square = square
         self.increase_moves_count()
 
     @staticmethod
@@ -104,10 +105,7 @@ class Piece(metaclass=abc.ABCMeta):
 
     @property
     def index_based_position(self):
-
-        result = self.position_to_index_based_position(self.position)
-
-        return result
+        return 7 - self.square // 8, self.square % 8
 
     def get_all_pieces_of_this_type(self, board_state):
         all_pieces = []
@@ -122,8 +120,13 @@ class Piece(metaclass=abc.ABCMeta):
         return all_pieces
 
     def get_all_possible_cells_where_this_piece_can_kill(self, board_state):
-
-        (defended_cells, moves_info,) = self.get_technically_valid_moves_info_for_piece(
+        """
+        Returns squares of cells that this piece attacks
+        """
+        (
+            defended_cells,
+            moves_info,
+        ) = self.get_technically_valid_moves_info_for_piece(
             board_state,
             return_defended_cells=True,
             return_only_places_where_piece_can_directly_kill=True,
@@ -133,55 +136,25 @@ class Piece(metaclass=abc.ABCMeta):
         if self.piece_name == "pawn":
             defended_cells.extend(
                 [
-                    i["new_position"]
+                    i["new_square"]
                     for i in moves_info
-                    if i["killed_opponent_piece_position"]
+                    if i["killed_opponent_piece_square"] is not None
                 ]
             )
             return defended_cells
 
-        defended_cells.extend([i["new_position"] for i in moves_info])
-
-        # clean defended_cells as they may have offboard values
-        defended_cells = [i for i in defended_cells if _is_chess_cell_coord(i)]
+        defended_cells.extend([i["new_square"] for i in moves_info])
 
         return defended_cells
 
     def get_possible_moves(self, board_state):
-        _possible_moves = self.get_technically_valid_moves_info_for_piece(board_state)
-
-        possible_moves = [
-            i
-            for i in _possible_moves
-            if _is_chess_cell_coord(i["new_position"])
-            or _is_chess_cell_coord(
-                re.sub(
-                    f"=[" + PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO + "]+",
-                    "",
-                    i["new_position"],
-                )
-            )
+        """
+        Legal moves info of this piece, it must belong to the player whose turn it is
+        """
+        return [
+            move_info for _, move_info in board_state._get_legal_moves_of_pieces([self])
         ]
 
-        valid_possible_moves = []
-
-        for move_info in possible_moves:
-
-            copied_board_state = board_state.get_deepcopy()
-            copied_piece = copied_board_state.positions_to_pieces[self.position]
-
-            # apply move itself
-            copied_piece.apply_move_info_to_board(
-                board_state=copied_board_state,
-                move_info=move_info,
-                swap_player_turn=False,
-            )
-
-            if not copied_board_state._player_has_check_in_position():
-                valid_possible_moves.append(move_info)
-
-        return valid_possible_moves
-
     def apply_move_info_to_board(
         self,
         board_state,
@@ -198,18 +171,30 @@ class Piece(metaclass=abc.ABCMeta):
         Other special case may be Pawn promotion, where after moving pawn to last
         row, we remove it from pieces and add new piece that player requested(like Queen)
         to the same position.
+
+        move_info dictionaries have following structure, all cells are given as square indices:
+            {
+                "new_square": 28,
+                "killed_opponent_piece_square": None,
+                # only for pawn promotions, letter of piece to promote into
+                "promote_into": "Q",
+                # only for castling, rook movement and castling notation
+                "additional_movements": {"from": 7, "to": 5},
+                "castle_notation": "O-O",
+            }
         """
+        old_square = self.square
 
         # kill opponent if necessary
-        if move_info["killed_opponent_piece_position"]:
-            killed_opponent_piece = board_state.positions_to_pieces[
-                move_info["killed_opponent_piece_position"]
+        if move_info["killed_opponent_piece_square"] is not None:
+            killed_opponent_piece = board_state._squares[
+                move_info["killed_opponent_piece_square"]
             ]
 
             board_state.kill_piece(killed_opponent_piece)
 
         # change current piece position
-        self.position = move_info["new_position"]
+        board_state._move_piece_on_board(self, move_info["new_square"])
 
         # also handle rooks in case of castling
         if move_info.get("additional_movements"):
@@ -218,23 +203,24 @@ class Piece(metaclass=abc.ABCMeta):
                 move_info["additional_movements"]["to"],
             )
 
-            rook = board_state.positions_to_pieces[_from]
-            rook.position = _to
+            rook = board_state._squares[_from]
+            board_state._move_piece_on_board(rook, _to)
 
         ### handle pawn promotion
-        if move_info.get("is_pawn_promotion_move"):
-            destination_cell, promoted_piece_letter = self.position.split("=")
+        if move_info.get("promote_into"):
+            promoted_piece_letter = move_info["promote_into"]
 
             # only pawn can promote to new piece
             assert self.piece_name == "pawn"
             # on rows 1 or 8 based on current player
-            assert destination_cell[1] in "18"
-            # our notation for this uses = (equal) sign
-            assert self.position[-2] == "="
-            # followed with letter of new piece
-            assert self.position[-1] in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO
+            assert self.square // 8 == (7 if self.player_number == 1 else 0)
+            # into one of allowed pieces
+            assert promoted_piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO
 
-            modified_pieces_list = board_state.current_player_pieces
+            if self.player_number == 1:
+                modified_pieces_list = board_state.player_1_pieces
+            else:
+                modified_pieces_list = board_state.player_2_pieces
 
             # remove current pawn from board without adding to any killed pieces
             # as it is just the promotion, not a kill
@@ -245,23 +231,50 @@ class Piece(metaclass=abc.ABCMeta):
             ]
 
             # create new piece and add in place of old piece
-            modified_pieces_list.append(
-                new_piece_class(
-                    color=self.color,
-                    position=destination_cell,
-                    player_number=self.player_number,
-                )
+            new_piece = new_piece_class(
+                color=self.color,
+                position=self.position,
+                player_number=self.player_number,
             )
 
+            modified_pieces_list.append(new_piece)
+
+            board_state._remove_piece_from_index(self)
+            board_state._add_piece_to_index(new_piece)
+
             # save changed pieces
             if self.player_number == 1:
                 board_state.player_1_pieces = modified_pieces_list
             else:
                 board_state.player_2_pieces = modified_pieces_list
 
+        # update state that position hash also covers
+        board_state._update_castling_rights()
+
+        # and move counters
+        if (
+            self.piece_name == "pawn"
+            or move_info["killed_opponent_piece_square"] is not None
+        ):
+            board_state.halfmove_clock = 0
+        else:
+            board_state.halfmove_clock += 1
+
+        if self.player_number == 2:
+            board_state.fullmove_number += 1
+
+        if (
+            self.piece_name == "pawn"
+            and abs(move_info["new_square"] - old_square) == 16
+        ):
+            board_state._set_en_passant_victim_square(move_info["new_square"])
+        else:
+            board_state._set_en_passant_victim_square(None)
+
         # change/swap active player number
         if swap_player_turn:
             board_state._swap_player_turn()
+            board_state._add_position_to_history()
 
 
 class King(Piece):
@@ -286,44 +299,27 @@ class King(Piece):
         # but this case is losing for ourselves
         assert return_only_places_where_piece_can_directly_kill == return_defended_cells
 
-        positions_to_pieces = board_state.positions_to_pieces
+        squares_to_pieces = board_state._squares
 
         possible_moves_info = []
         defended_cells = []
-        possible_moves = []
-
-        _pos = self.position
-
-        # get all possible places, performance is not issue for now
-        possible_moves = [
-            _top_coords(_pos),
-            _bottom_coords(_pos),
-            _left_coords(_pos),
-            _right_coords(_pos),
-            _top_left_coords(_pos),
-            _top_right_coords(_pos),
-            _bottom_left_coords(_pos),
-            _bottom_right_coords(_pos),
-        ]
 
-        for move in possible_moves:
+        for move in KING_TARGETS[self.square]:
             # empty destination cell
-            if move not in positions_to_pieces:
+            if squares_to_pieces[move] is None:
                 possible_moves_info.append(
                     {
-                        "new_position": move,
-                        "killed_opponent_piece_position": None,
+                        "new_square": move,
+                        "killed_opponent_piece_square": None,
                     }
                 )
 
             # opponent piece on cell
-            elif positions_to_pieces[move].player_number != self.player_number:
+            elif squares_to_pieces[move].player_number != self.player_number:
                 possible_moves_info.append(
                     {
-                        "new_position": move,
-                        "killed_opponent_piece_position": positions_to_pieces[
-                            move
-                        ].position,
+                        "new_square": move,
+                        "killed_opponent_piece_square": move,
                     }
                 )
             # our piece on cell
@@ -332,39 +328,50 @@ class King(Piece):
 
         # is castling possible ?
         if not return_only_places_where_piece_can_directly_kill:
-            for castling_case, castle_notation in {
-                "short": "O-O",
-                "long": "O-O-O",
-            }.items():
+            possible_moves_info.extend(self.get_castling_moves_info(board_state))
+
+        if return_defended_cells:
+            return defended_cells, possible_moves_info
+
+        return possible_moves_info
+
+    def get_castling_moves_info(self, board_state):
+        castling_moves_info = []
 
-                rook_info = board_state._get_player_rook_info_if_possible_to_do_castling_with_it(
+        for castling_case, castle_notation in {
+            "short": "O-O",
+            "long": "O-O-O",
+        }.items():
+
+            rook_info = (
+                board_state._get_player_rook_info_if_possible_to_do_castling_with_it(
                     castling_case
                 )
+            )
 
-                king_info = board_state._get_player_king_info_if_possible_to_do_castling_with_it(
+            king_info = (
+                board_state._get_player_king_info_if_possible_to_do_castling_with_it(
                     castling_case
                 )
+            )
 
-                if bool(rook_info) and bool(king_info):
-                    old_rook_pos, new_rook_pos = rook_info
-                    new_king_pos = king_info
-
-                    possible_moves_info.append(
-                        {
-                            "new_position": new_king_pos,
-                            "killed_opponent_piece_position": None,
-                            "additional_movements": {
-                                "from": old_rook_pos,
-                                "to": new_rook_pos,
-                            },
-                            "castle_notation": castle_notation,
-                        }
-                    )
+            if rook_info is not None and king_info is not None:
+                old_rook_square, new_rook_square = rook_info
+                new_king_square = king_info
 
-        if return_defended_cells:
-            return defended_cells, possible_moves_info
+                castling_moves_info.append(
+                    {
+                        "new_square": new_king_square,
+                        "killed_opponent_piece_square": None,
+                        "additional_movements": {
+                            "from": old_rook_square,
+                            "to": new_rook_square,
+                        },
+                        "castle_notation": castle_notation,
+                    }
+                )
 
-        return possible_moves_info
+        return castling_moves_info
 
 
 class Queen(Piece):
@@ -383,23 +390,10 @@ class Queen(Piece):
         return_defended_cells=False,
         return_only_places_where_piece_can_directly_kill=False,
     ):
-        positions_to_pieces = board_state.positions_to_pieces
-
         defended_cells, info = _get_linearly_distant_cells_from_piece_position(
             piece=self,
-            positions_to_pieces=positions_to_pieces,
-            linearity_functions=[
-                # bishop-like moves
-                _top_left_coords,
-                _top_right_coords,
-                _bottom_left_coords,
-                _bottom_right_coords,
-                # rook-like moves
-                _top_coords,
-                _bottom_coords,
-                _left_coords,
-                _right_coords,
-            ],
+            squares_to_pieces=board_state._squares,
+            directions=QUEEN_DIRECTIONS,
         )
 
         if return_defended_cells:
@@ -424,17 +418,10 @@ class Rook(Piece):
         return_defended_cells=False,
         return_only_places_where_piece_can_directly_kill=False,
     ):
-        positions_to_pieces = board_state.positions_to_pieces
-
         defended_cells, info = _get_linearly_distant_cells_from_piece_position(
             piece=self,
-            positions_to_pieces=positions_to_pieces,
-            linearity_functions=[
-                _top_coords,
-                _bottom_coords,
-                _left_coords,
-                _right_coords,
-            ],
+            squares_to_pieces=board_state._squares,
+            directions=ROOK_DIRECTIONS,
         )
 
         if return_defended_cells:
@@ -459,17 +446,10 @@ class Bishop(Piece):
         return_defended_cells=False,
         return_only_places_where_piece_can_directly_kill=False,
     ):
-        positions_to_pieces = board_state.positions_to_pieces
-
         defended_cells, info = _get_linearly_distant_cells_from_piece_position(
             piece=self,
-            positions_to_pieces=positions_to_pieces,
-            linearity_functions=[
-                _top_left_coords,
-                _top_right_coords,
-                _bottom_left_coords,
-                _bottom_right_coords,
-            ],
+            squares_to_pieces=board_state._squares,
+            directions=BISHOP_DIRECTIONS,
         )
 
         if return_defended_cells:
@@ -494,54 +474,27 @@ class Knight(Piece):
         return_defended_cells=False,
         return_only_places_where_piece_can_directly_kill=False,
     ):
-        positions_to_pieces = board_state.positions_to_pieces
+        squares_to_pieces = board_state._squares
 
-        # possible_moves_to_killed_pieces = {}
         possible_moves_info = []
-        possible_moves = []
-
-        _pos = self.position
-        _top = _top_coords(_pos)
-        _bottom = _bottom_coords(_pos)
-        _left = _left_coords(_pos)
-        _right = _right_coords(_pos)
-
-        # get all possible places, performance is not issue for now
-        possible_moves = [
-            # top
-            _top_left_coords(_top),
-            _top_right_coords(_top),
-            # bottom
-            _bottom_left_coords(_bottom),
-            _bottom_right_coords(_bottom),
-            # left
-            _top_left_coords(_left),
-            _bottom_left_coords(_left),
-            # right
-            _top_right_coords(_right),
-            _bottom_right_coords(_right),
-        ]
-
         defended_cells = []
 
-        for move in possible_moves:
+        for move in KNIGHT_TARGETS[self.square]:
             # empty destination cell
-            if move not in positions_to_pieces:
+            if squares_to_pieces[move] is None:
                 possible_moves_info.append(
                     {
-                        "new_position": move,
-                        "killed_opponent_piece_position": None,
+                        "new_square": move,
+                        "killed_opponent_piece_square": None,
                     }
                 )
 
             # opponent piece on cell
-            elif positions_to_pieces[move].player_number != self.player_number:
+            elif squares_to_pieces[move].player_number != self.player_number:
                 possible_moves_info.append(
                     {
-                        "new_position": move,
-                        "killed_opponent_piece_position": positions_to_pieces[
-                            move
-                        ].position,
+                        "new_square": move,
+                        "killed_opponent_piece_square": move,
                     }
                 )
             # our piece
@@ -564,321 +517,102 @@ class Pawn(Piece):
             player_number=player_number,
         )
 
+    @staticmethod
+    def _add_moves_info(
+        possible_moves_info, new_square, killed_opponent_piece_square, is_promotion
+    ):
+        """
+        Add move info, or 4 of them if pawn gets promoted with this move,
+        1 for each piece it can be promoted into.
+        """
+        if not is_promotion:
+            possible_moves_info.append(
+                {
+                    "new_square": new_square,
+                    "killed_opponent_piece_square": killed_opponent_piece_square,
+                }
+            )
+            return
+
+        # Q-ueen, B-ishop, k-N-ight, R-ook
+        for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
+            possible_moves_info.append(
+                {
+                    "new_square": new_square,
+                    "killed_opponent_piece_square": killed_opponent_piece_square,
+                    "promote_into": piece_letter,
+                }
+            )
+
     def get_technically_valid_moves_info_for_piece(
         self,
         board_state,
         return_defended_cells=False,
         return_only_places_where_piece_can_directly_kill=False,
     ):
-        positions_to_pieces = board_state.positions_to_pieces
+        squares_to_pieces = board_state._squares
 
-        # possible_moves_to_killed_pieces = {}
         possible_moves_info = []
         defended_cells = []
 
-        piece_position = self.position
-        curr_col, curr_row = self.position
-
-        # if pawn moving forward means only to promote it
-        if (self.player_number == 1 and curr_row == "7") or (
-            self.player_number == 2 and curr_row == "2"
-        ):
-            # get top, top left and top right cells for both player cases
-            if self.player_number == 1:
-                # white piece
-                top_cell = _top_coords(piece_position)
-                top_left_cell = _top_left_coords(piece_position)
-                top_right_cell = _top_right_coords(piece_position)
-            else:
-                # black piece
-                top_cell = _bottom_coords(piece_position)
-                top_left_cell = _bottom_right_coords(piece_position)
-                top_right_cell = _bottom_left_coords(piece_position)
-
-            # moving forward
-            if top_cell not in board_state.positions_to_pieces:
-
-                for (
-                    piece_letter
-                ) in (
-                    PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO
-                ):  # Q-ueen, B-ishop, k-N-ight, R-ook
-                    # user must type pawn promotion using following
-                    # format to make it work - normal move + "=promoted_into_piece_letter"
-                    new_position_notation = f"{curr_col}8={piece_letter}"
-
-                    possible_moves_info.append(
-                        {
-                            "new_position": new_position_notation,
-                            "killed_opponent_piece_position": None,
-                            "is_pawn_promotion_move": True,
-                        }
-                    )
-
-            # killing left
-            # no piece there
-            if top_left_cell not in board_state.positions_to_pieces:
-
-                for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
-                    new_position_notation = f"{top_left_cell[0]}8={piece_letter}"
-
-                    possible_moves_info.append(
-                        {
-                            "new_position": new_position_notation,
-                            "killed_opponent_piece_position": None,
-                            "is_pawn_promotion_move": True,
-                        }
-                    )
-            else:
-                # there is some piece there
-                # it is opponent piece
-                if (
-                    board_state.positions_to_pieces[top_left_cell].player_number
-                    != self.player_number
-                ):
-
-                    for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
-                        new_position_notation = f"{top_left_cell[0]}8={piece_letter}"
-
-                        possible_moves_info.append(
-                            {
-                                "new_position": new_position_notation,
-                                "killed_opponent_piece_position": top_left_cell,
-                                "is_pawn_promotion_move": True,
-                            }
-                        )
-                else:
-                    defended_cells.append(top_right_cell)
-
-            # killing right
-            # no piece there
-            if top_right_cell not in board_state.positions_to_pieces:
-
-                for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
-                    new_position_notation = f"{top_right_cell[0]}8={piece_letter}"
-
-                    possible_moves_info.append(
-                        {
-                            "new_position": new_position_notation,
-                            "killed_opponent_piece_position": None,
-                            "is_pawn_promotion_move": True,
-                        }
-                    )
-            else:
-                # there is some piece there
-                # it is opponent piece
-                if (
-                    board_state.positions_to_pieces[top_right_cell].player_number
-                    != self.player_number
-                ):
-
-                    for piece_letter in PIECE_LETTERS_POSSIBLE_TO_PROMOTE_INTO:
-                        new_position_notation = f"{top_right_cell[0]}8={piece_letter}"
-
-                        possible_moves_info.append(
-                            {
-                                "new_position": new_position_notation,
-                                "killed_opponent_piece_position": top_right_cell,
-                                "is_pawn_promotion_move": True,
-                            }
-                        )
-                else:
-                    defended_cells.append(top_right_cell)
+        piece_square = self.square
 
+        # pawns never stand on first or last rows, so cells
+        # in front of them are always on board
+        if self.player_number == 1:
+            # white piece
+            top_cell = piece_square + 8
+            top_top_cell = piece_square + 16
+            last_row_index = 7
         else:
-            # non pawn promotion moves
+            # black piece
+            top_cell = piece_square - 8
+            top_top_cell = piece_square - 16
+            last_row_index = 0
 
-            # 1 up | no kill
-            top_cell = (
-                _top_coords(piece_position)
-                if self.player_number == 1
-                else _bottom_coords(piece_position)
-            )
-
-            if top_cell not in positions_to_pieces:
-                possible_moves_info.append(
-                    {
-                        "new_position": top_cell,
-                        "killed_opponent_piece_position": None,
-                    }
-                )
+        # if pawn moving forward means only to promote it
+        is_promotion = top_cell // 8 == last_row_index
 
-                # 2 up | no kill
-                if self.moves_count == 0:
-                    top_top_cell = (
-                        _top_coords(top_cell)
-                        if self.player_number == 1
-                        else _bottom_coords(top_cell)
-                    )
+        # 1 up | no kill
+        if squares_to_pieces[top_cell] is None:
+            self._add_moves_info(possible_moves_info, top_cell, None, is_promotion)
 
-                    if top_top_cell not in positions_to_pieces:
-                        possible_moves_info.append(
-                            {
-                                "new_position": top_top_cell,
-                                "killed_opponent_piece_position": None,
-                            }
-                        )
-
-            # up left | kill
-            top_left = (
-                _top_left_coords(piece_position)
-                if self.player_number == 1
-                else _bottom_right_coords(piece_position)
-            )
+            # 2 up | no kill
+            if self.moves_count == 0 and squares_to_pieces[top_top_cell] is None:
+                self._add_moves_info(
+                    possible_moves_info, top_top_cell, None, is_promotion
+                )
 
-            if top_left in positions_to_pieces:
-                # opponent piece there
-                if positions_to_pieces[top_left].player_number != self.player_number:
-                    possible_moves_info.append(
-                        {
-                            "new_position": top_left,
-                            "killed_opponent_piece_position": positions_to_pieces[
-                                top_left
-                            ].position,
-                        }
-                    )
+        # up left and up right | kill
+        for cell in PAWN_ATTACKS[self.player_number][piece_square]:
+            if squares_to_pieces[cell] is None:
+                continue
 
-                # our piece there
-                else:
-                    defended_cells.append(top_left)
+            # opponent piece there
+            if squares_to_pieces[cell].player_number != self.player_number:
+                self._add_moves_info(possible_moves_info, cell, cell, is_promotion)
 
-            # up right | kill
-            top_right = (
-                _top_right_coords(piece_position)
-                if self.player_number == 1
-                else _bottom_left_coords(piece_position)
-            )
+            # our piece there
+            else:
+                defended_cells.append(cell)
 
-            if top_right in positions_to_pieces:
-                # opponent piece there
-                if positions_to_pieces[top_right].player_number != self.player_number:
-                    # possible_moves_to_killed_pieces[top_right] = positions_to_pieces[
-                    #     top_right
-                    # ]
+        ### En passant
+        en_passant_victim_square = board_state._get_en_passant_victim_square()
 
+        if (
+            en_passant_victim_square is not None
+            and self.player_number == board_state._player_turn
+        ):
+            # victim must be just next to our pawn, on the same row, so pawn kills
+            # it by moving to the cell that it attacks, just behind the victim
+            for cell in PAWN_ATTACKS[self.player_number][piece_square]:
+                if cell == en_passant_victim_square + (top_cell - piece_square):
                     possible_moves_info.append(
                         {
-                            "new_position": top_right,
-                            "killed_opponent_piece_position": positions_to_pieces[
-                                top_right
-                            ].position,
+                            "new_square": cell,
+                            "killed_opponent_piece_square": en_passant_victim_square,
                         }
                     )
-                # our piece there
-                else:
-                    defended_cells.append(top_right)
-
-            ### En passant
-            if board_state.total_moves_count > 0:
-                opponents_last_moves = []
-
-                for two_player_moves in board_state.moves:
-                    try:
-                        if board_state._player_turn == 1:
-                            opponents_last_moves.append(two_player_moves[1])
-                        else:
-                            opponents_last_moves.append(two_player_moves[0])
-                    except IndexError:
-                        pass
-
-                opponents_last_move = opponents_last_moves[-1]
-
-                # for basic moves, we will hav space
-                if " " in opponents_last_move:
-                    last_move_from, last_move_to = opponents_last_move.split()
-                else:
-                    # for other moves we do not care about an pasants
-                    last_move_from, last_move_to = "", ""
-
-            # check for white player
-            if self.player_number == 1:
-                # whites can do it only from 5-th row
-                if piece_position[-1] == "5":
-
-                    # left En passant check
-                    left_cell = _left_coords(piece_position)
-                    if last_move_to == left_cell:
-
-                        if last_move_to in board_state.positions_to_pieces:
-                            last_moved_piece = board_state.positions_to_pieces[
-                                last_move_to
-                            ]
-
-                            if (
-                                last_moved_piece.piece_name == "pawn"
-                                and last_moved_piece.moves_count == 1
-                            ):
-                                possible_moves_info.append(
-                                    {
-                                        "new_position": _top_coords(left_cell),
-                                        "killed_opponent_piece_position": left_cell,
-                                    }
-                                )
-
-                    # right En passant check
-                    right_cell = _right_coords(piece_position)
-                    if last_move_to == right_cell:
-
-                        if last_move_to in board_state.positions_to_pieces:
-
-                            last_moved_piece = board_state.positions_to_pieces[
-                                last_move_to
-                            ]
-
-                            if (
-                                last_moved_piece.piece_name == "pawn"
-                                and last_moved_piece.moves_count == 1
-                            ):
-                                possible_moves_info.append(
-                                    {
-                                        "new_position": _top_coords(right_cell),
-                                        "killed_opponent_piece_position": right_cell,
-                                    }
-                                )
-
-            elif self.player_number == 2:
-                # blacks can do it only from 4-th row
-                if piece_position[-1] == "4":
-
-                    # left from whites perspective En passant check
-                    left_cell = _left_coords(piece_position)
-                    if last_move_to == left_cell:
-                        if last_move_to in board_state.positions_to_pieces:
-
-                            last_moved_piece = board_state.positions_to_pieces[
-                                last_move_to
-                            ]
-
-                            if (
-                                last_moved_piece.piece_name == "pawn"
-                                and last_moved_piece.moves_count == 1
-                            ):
-                                possible_moves_info.append(
-                                    {
-                                        "new_position": _bottom_coords(left_cell),
-                                        "killed_opponent_piece_position": left_cell,
-                                    }
-                                )
-
-                    # right from whites perspective En passant check
-                    right_cell = _right_coords(piece_position)
-                    if last_move_to == right_cell:
-
-                        if last_move_to in board_state.positions_to_pieces:
-                            last_moved_piece = board_state.positions_to_pieces[
-                                last_move_to
-                            ]
-
-                            if (
-                                last_moved_piece.piece_name == "pawn"
-                                and last_moved_piece.moves_count == 1
-                            ):
-                                possible_moves_info.append(
-                                    {
-                                        "new_position": _bottom_coords(right_cell),
-                                        "killed_opponent_piece_position": right_cell,
-                                    }
-                                )
 
         if return_defended_cells:
             return defended_cells, possible_moves_info
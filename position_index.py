@@ -0,0 +1,241 @@
+"""
+On-disk index of positions reached in games, to find which games reached some position.
+
+Index file is a sorted list of (position hash, game id, ply) entries, where game id is
+number of game in source(starting from 0) and ply is number of moves made in game before
+that position(0 for position game starts from). Entries are sorted by position hash, so
+queries memory-map the file and use binary search, without loading it into memory.
+
+Index is built with external sort: entries are collected and sorted in chunks of limited
+size in temporary files, which are then merged into one, so archives of any size can be
+indexed with limited memory.
+
+Usage:
+    with open("games.pgn") as f:
+        build_position_index(read_pgn_games(f), "games.index")
+
+    with PositionIndex("games.index") as index:
+        index.find_games(board.position_hash)  # [(game_id, ply), ...]
+
+From command line:
+    python position_index.py build games.pgn games.index
+    python position_index.py query games.index "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+"""
+
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+
+from board import MAILBOX_BACKEND, Board
+from pgn_reader import read_pgn_games
+
+MAGIC = b"CCPI"
+VERSION = 1
+
+# magic, version, number of entries
+_HEADER = struct.Struct(">4sIQ")
+# position hash, game id, ply. Big-endian, so that entries bytes
+# are sorted in the same order as position hashes
+_ENTRY = struct.Struct(">QIH")
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def get_game_positions_hashes(game, backend=MAILBOX_BACKEND):
+    """
+    Yield (ply, position hash) for each position of game(like read_pgn_games gives),
+    till the end of game or first move that could not be applied.
+    """
+    board = Board(backend=backend)
+    ply = 0
+
+    yield ply, board.position_hash
+
+    for moves in game["moves"]:
+        for move in moves:
+            try:
+                board.apply_chess_notation_moves([[move]])
+            except (ValueError, AssertionError):
+                return
+
+            ply += 1
+
+            yield ply, board.position_hash
+
+
+def _write_sorted_chunk(entries, directory):
+    entries.sort()
+
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+        for entry in entries:
+            f.write(_ENTRY.pack(*entry))
+
+    return f.name
+
+
+def _read_entries(file_path, buffer_entries=4096):
+    with open(file_path, "rb") as f:
+        while True:
+            data = f.read(_ENTRY.size * buffer_entries)
+
+            if not data:
+                return
+
+            yield from _ENTRY.iter_unpack(data)
+
+
+def build_position_index(
+    games,
+    index_file_path,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    backend=MAILBOX_BACKEND,
+):
+    """
+    Replay games from any iterable(for example read_pgn_games generator) and write
+    index of their positions into given file. At most chunk_size entries are kept in
+    memory at once. Returns number of entries in index.
+    """
+    directory = os.path.dirname(os.path.abspath(index_file_path))
+    chunk_file_paths = []
+    entries = []
+
+    try:
+        for game_id, game in enumerate(games):
+            for ply, position_hash in get_game_positions_hashes(game, backend):
+                entries.append((position_hash, game_id, ply))
+
+                if len(entries) >= chunk_size:
+                    chunk_file_paths.append(_write_sorted_chunk(entries, directory))
+                    entries = []
+
+        if entries:
+            chunk_file_paths.append(_write_sorted_chunk(entries, directory))
+            entries = []
+
+        entries_count = 0
+
+        with open(index_file_path, "wb") as f:
+            # number of entries is not known yet, it will be updated at the end
+            f.write(_HEADER.pack(MAGIC, VERSION, 0))
+
+            for entry in heapq.merge(*[_read_entries(i) for i in chunk_file_paths]):
+                f.write(_ENTRY.pack(*entry))
+                entries_count += 1
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, entries_count))
+    finally:
+        for file_path in chunk_file_paths:
+            os.remove(file_path)
+
+    return entries_count
+
+
+class PositionIndex:
+    def __init__(self, index_file_path):
+        self._file = open(index_file_path, "rb")
+
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can not be memory-mapped
+            self._file.close()
+            raise ValueError(f"{index_file_path} is not a position index")
+
+        magic, version, self.entries_count = None, None, 0
+
+        if len(self._mmap) >= _HEADER.size:
+            magic, version, self.entries_count = _HEADER.unpack_from(self._mmap)
+
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or len(self._mmap) != _HEADER.size + self.entries_count * _ENTRY.size
+        ):
+            self.close()
+            raise ValueError(f"{index_file_path} is not a position index")
+
+    def _get_entry(self, entry_index):
+        return _ENTRY.unpack_from(self._mmap, _HEADER.size + entry_index * _ENTRY.size)
+
+    def find_games(self, position_hash):
+        """
+        Return list of (game_id, ply) for all times given position was reached.
+        """
+        # first entry with given or bigger hash
+        low, high = 0, self.entries_count
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self._get_entry(middle)[0] < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        found_games = []
+
+        for entry_index in range(low, self.entries_count):
+            entry_position_hash, game_id, ply = self._get_entry(entry_index)
+
+            if entry_position_hash != position_hash:
+                break
+
+            found_games.append((game_id, ply))
+
+        return found_games
+
+    def find_games_with_position_of_board(self, board):
+        return self.find_games(board.position_hash)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.entries_count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build index of positions of games, or find games by position"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="build index from pgn file")
+    build_parser.add_argument("pgn_file_path")
+    build_parser.add_argument("index_file_path")
+    build_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    query_parser = subparsers.add_parser("query", help="find games by position")
+    query_parser.add_argument("index_file_path")
+    query_parser.add_argument("fen")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.pgn_file_path) as f:
+            entries_count = build_position_index(
+                read_pgn_games(f), args.index_file_path, chunk_size=args.chunk_size
+            )
+
+        print(f"Positions indexed: {entries_count}")
+    else:
+        with PositionIndex(args.index_file_path) as index:
+            for game_id, ply in index.find_games_with_position_of_board(
+                Board.from_fen(args.fen)
+            ):
+                print(f"Game {game_id}, ply {ply}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,16 @@
-'''
-
-'''
+""" """
 
 from game import Game
 
-
 game = Game(
     # p1_color="dark_red",
     # p2_color="green1",
     # black_cell_color="dark_blue",
     # white_cell_color="orange",
     # previous_move_cell_color="blue",
+    # opening_book_file_path="book.bin",
+    # computer_player_number=2,
+    # engine_processes=None,
     debug_mode=True,
 )
 
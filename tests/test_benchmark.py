@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from benchmark import _get_percentile, run_benchmarks
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(_get_percentile(values, 99), 99)
+        self.assertEqual(_get_percentile(values, 100), 100)
+        self.assertEqual(_get_percentile([5], 99), 5)
+        self.assertEqual(_get_percentile([], 99), 0)
+
+    def test_results_are_given_per_game_and_in_total(self):
+        results = run_benchmarks(games_limit=2)
+
+        self.assertEqual(len(results["games"]), 2)
+        self.assertEqual(
+            results["total"]["moves"], sum(i["moves"] for i in results["games"])
+        )
+
+        for stats in [results["total"], *results["games"]]:
+            self.assertGreater(stats["moves_per_second"], 0)
+            self.assertGreater(stats["make_a_move_p99_ms"], 0)
+            self.assertGreater(stats["peak_memory_bytes"], 0)
+
+    def test_games_without_moves_are_skipped(self):
+        self.assertEqual(run_benchmarks(games_limit=0)["games"], [])
+
+        with tempfile.NamedTemporaryFile("w", suffix=".pgn", delete=False) as f:
+            f.write('[Event "No moves"]\n\n*\n')
+
+        self.addCleanup(os.remove, f.name)
+
+        results = run_benchmarks(pgn_file_path=f.name)
+
+        self.assertEqual(results["games"], [])
+        self.assertEqual(results["total"]["moves"], 0)
+        self.assertEqual(results["total"]["make_a_move_mean_ms"], 0)
+        self.assertEqual(results["total"]["peak_memory_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
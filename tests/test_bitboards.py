@@ -0,0 +1,139 @@
+import unittest
+
+import _bitboards
+from _move_related_functions import POSITIONS_TO_SQUARES
+from board import BITBOARD_BACKEND, Board
+from tests import test_board, test_king, test_pawn
+from tests.real_game_info_retrieval_functions import (
+    get_real_game_chess_moves_history_from_pgn_file,
+)
+
+
+def _positions_to_bitboard(positions):
+    return sum(1 << POSITIONS_TO_SQUARES[i] for i in positions)
+
+
+class TestAttacks(unittest.TestCase):
+    def test_knight_and_king_attacks_stay_on_board(self):
+        self.assertEqual(
+            _bitboards.KNIGHT_ATTACKS[POSITIONS_TO_SQUARES["A1"]],
+            _positions_to_bitboard(["B3", "C2"]),
+        )
+        self.assertEqual(
+            _bitboards.KING_ATTACKS[POSITIONS_TO_SQUARES["H8"]],
+            _positions_to_bitboard(["G8", "G7", "H7"]),
+        )
+
+    def test_pawn_attacks_depend_on_player(self):
+        self.assertEqual(
+            _bitboards.PAWN_ATTACKS[1][POSITIONS_TO_SQUARES["A2"]],
+            _positions_to_bitboard(["B3"]),
+        )
+        self.assertEqual(
+            _bitboards.PAWN_ATTACKS[2][POSITIONS_TO_SQUARES["E7"]],
+            _positions_to_bitboard(["D6", "F6"]),
+        )
+
+    def test_sliding_attacks_stop_on_first_blocker(self):
+        occupied = _positions_to_bitboard(["D6", "B4", "D2", "F2"])
+
+        self.assertEqual(
+            _bitboards.rook_attacks(POSITIONS_TO_SQUARES["D4"], occupied),
+            _positions_to_bitboard(
+                ["D5", "D6", "D3", "D2", "C4", "B4", "E4", "F4", "G4", "H4"]
+            ),
+        )
+        self.assertEqual(
+            _bitboards.bishop_attacks(POSITIONS_TO_SQUARES["D4"], occupied),
+            _positions_to_bitboard(
+                ["C5", "B6", "A7", "E5", "F6", "G7", "H8", "C3", "B2", "A1", "E3", "F2"]
+            ),
+        )
+
+    def test_sliding_attacks_ignore_blockers_on_board_edges(self):
+        all_attacks = _positions_to_bitboard(
+            ["D1", "D2", "D3", "D5", "D6", "D7", "D8"]
+            + ["A4", "B4", "C4", "E4", "F4", "G4", "H4"]
+            + ["A1", "B2", "C3", "E5", "F6", "G7", "H8"]
+            + ["G1", "F2", "E3", "C5", "B6", "A7"]
+        )
+
+        for occupied in ([], ["D8", "A4", "H4", "D1", "A7", "G1", "A1", "H8"]):
+            self.assertEqual(
+                _bitboards.queen_attacks(
+                    POSITIONS_TO_SQUARES["D4"], _positions_to_bitboard(occupied)
+                ),
+                all_attacks,
+            )
+
+    def test_between_squares_include_the_other_square(self):
+        self.assertEqual(
+            _bitboards.BETWEEN_SQUARES[POSITIONS_TO_SQUARES["E1"]][
+                POSITIONS_TO_SQUARES["A5"]
+            ],
+            _positions_to_bitboard(["D2", "C3", "B4", "A5"]),
+        )
+        self.assertEqual(
+            _bitboards.BETWEEN_SQUARES[POSITIONS_TO_SQUARES["E1"]][
+                POSITIONS_TO_SQUARES["B3"]
+            ],
+            0,
+        )
+
+
+class TestBitboardBackendGivesSameMoves(unittest.TestCase):
+    def test_real_games_replay_the_same_way(self):
+        games_moves = get_real_game_chess_moves_history_from_pgn_file(
+            "./tests/assets/master_games.pgn"
+        )
+
+        for game_moves in games_moves[:5]:
+            mailbox_board = Board()
+            bitboard_board = Board(backend=BITBOARD_BACKEND)
+
+            mailbox_board.apply_chess_notation_moves(game_moves)
+            bitboard_board.apply_chess_notation_moves(game_moves)
+
+            self.assertEqual(mailbox_board.moves, bitboard_board.moves)
+            self.assertEqual(
+                mailbox_board.chess_notation_moves, bitboard_board.chess_notation_moves
+            )
+
+    def test_legal_moves_are_the_same(self):
+        for fen in [
+            # knight gives check and rook can kill it
+            "8/6k1/8/r3p3/R4n1P/1B6/P5K1/8 w - - 3 51",
+            # pawn gives check and bishop can kill it
+            "6k1/8/8/8/8/8/3p4/2B1K3 w - - 0 1",
+            # double check, knight could block only one of them
+            "4r1k1/8/8/8/1b6/5N2/8/4K3 w - - 0 1",
+        ]:
+            mailbox_board = Board.from_fen(fen)
+            bitboard_board = Board.from_fen(fen, backend=BITBOARD_BACKEND)
+
+            key = lambda i: (i[0].square, repr(sorted(i[1].items())))
+
+            self.assertEqual(
+                sorted(map(key, mailbox_board.legal_moves())),
+                sorted(map(key, bitboard_board.legal_moves())),
+                fen,
+            )
+
+
+class TestBoardWithBitboards(test_board.TestBoard):
+    def setUp(self):
+        self.board = Board(backend=BITBOARD_BACKEND)
+
+
+class TestKingWithBitboards(test_king.TestKing):
+    def setUp(self):
+        self.board = Board(backend=BITBOARD_BACKEND)
+
+
+class TestPawnWithBitboards(test_pawn.TestPawn):
+    def setUp(self):
+        self.board = Board(backend=BITBOARD_BACKEND)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ from tests.base import BaseTest
 from tests.real_game_info_retrieval_functions import (
     get_real_game_chess_moves_history_from_pgn_file,
 )
+from _move_related_functions import POSITIONS_TO_SQUARES
 from board import Board
 
 
@@ -125,6 +126,342 @@ class TestBoard(BaseTest):
         # but it has checkmate information correctly
         self.assertTrue(next_player_troubles["player_is_checkmated"])
 
+    def test_push_and_pop_restore_board_state(self):
+        # promotions with and without kill and castling, all from one position
+        self.board.apply_chess_notation_moves(
+            [["b4", "c5"], ["bxc5", "Nf6"], ["c6", "e6"], ["c7", "Be7"]]
+        )
+
+        positions_before = dict(self.board.positions_to_pieces)
+        moves_counts_before = {
+            position: piece.moves_count for position, piece in positions_before.items()
+        }
+
+        for move_str in ["C7 D8=Q", "O-O", "C7 B8=N"]:
+            if move_str == "O-O":
+                self.board._swap_player_turn()
+
+            move_info, piece, _, _ = self.board.get_move_info_if_it_is_valid_move_str(
+                move_str
+            )
+            self.assertTrue(move_info)
+
+            self.board.push(piece=piece, move_info=move_info)
+            self.assertNotEqual(positions_before, self.board.positions_to_pieces)
+
+            self.assertIs(self.board.pop(), piece)
+
+            if move_str == "O-O":
+                self.board._swap_player_turn()
+
+            self.assertEqual(positions_before, self.board.positions_to_pieces)
+            self.assertEqual(
+                moves_counts_before,
+                {
+                    position: piece.moves_count
+                    for position, piece in self.board.positions_to_pieces.items()
+                },
+            )
+            self.assertEqual(self.board._player_turn, 1)
+            self.assertEqual(len(self.board.player_1_pieces), 16)
+            self.assertEqual(len(self.board.player_2_pieces), 15)
+            self.assertEqual(len(self.board.killed_opponent_pieces[1]), 1)
+
+    def test_pieces_index_follows_moves_kills_and_promotions(self):
+        self.board.apply_chess_notation_moves(
+            [["b4", "c5"], ["bxc5", "Nf6"], ["c6", "e6"], ["c7", "Be7"], ["cxd8=Q+"]]
+        )
+
+        all_pieces = [*self.board.player_1_pieces, *self.board.player_2_pieces]
+
+        self.assertEqual(
+            self.board.positions_to_pieces, {i.position: i for i in all_pieces}
+        )
+        self.assertEqual(
+            dict(self.board.index_based_positions_to_pieces),
+            {i.index_based_position: i for i in all_pieces},
+        )
+        self.assertEqual(self.board.positions_to_pieces["D8"].piece_name, "queen")
+
+    def test_pinned_piece_can_not_leave_its_line(self):
+        self.board.apply_chess_notation_moves([["d4", "e6"], ["Nc3", "Bb4"]])
+
+        knight = self.board.positions_to_pieces["C3"]
+
+        self.assertEqual(knight.get_possible_moves(board_state=self.board), [])
+        self.assertNotIn(knight, [piece for piece, _ in self.board.legal_moves()])
+        self._assert_was_not_successful_move("C3 D5")
+
+    def test_is_square_attacked(self):
+        self.board.apply_chess_notation_moves([["e4", "e5"], ["Nf3"]])
+
+        for position, by_player_number, expected in [
+            # knight, pawn, bishop and queen lines
+            ("E5", 1, True),
+            ("D4", 2, True),
+            ("A6", 1, True),
+            ("H4", 2, True),
+            # queen line ends on the board edge, and pawns can not kill forward
+            ("H5", 2, False),
+            ("E4", 2, False),
+            # knight reaches g5, but bishop on c1 is still blocked by pawn on d2
+            ("G5", 1, True),
+            ("H6", 1, False),
+        ]:
+            self.assertEqual(
+                self.board.is_square_attacked(
+                    POSITIONS_TO_SQUARES[position], by_player_number
+                ),
+                expected,
+                position,
+            )
+
+    def test_static_exchange_evaluation(self):
+        board = Board.from_fen("3rk3/8/2p1p3/3n4/2B1P3/5N2/3R4/3QK3 w - - 0 1")
+
+        def get_score(move_str):
+            move_info, piece, _, _ = board.get_move_info_if_it_is_valid_move_str(
+                move_str
+            )
+
+            return board.static_exchange_evaluation(piece, move_info)
+
+        # knight is defended by 2 pawns and rook, we attack it with
+        # pawn, bishop and rook with queen behind it
+        self.assertEqual(get_score("E4 D5"), 320 - 100)
+        # all pieces get killed, we win knight, pawn, pawn, rook
+        # and lose bishop, pawn and rook
+        self.assertEqual(get_score("C4 D5"), 320 + 100 + 100 + 500 - 330 - 100 - 500)
+        # player 2 stops after first 3 kills, as continuing loses more
+        self.assertEqual(get_score("D2 D5"), 320 + 100 - 500)
+
+        self.assertEqual(
+            [i.position for i in board.get_attackers(POSITIONS_TO_SQUARES["D5"], 1)],
+            ["E4", "C4", "D2"],
+        )
+        # queen behind rook is found, when rook is ignored
+        self.assertEqual(
+            sorted(
+                i.position
+                for i in board.get_attackers(
+                    POSITIONS_TO_SQUARES["D5"],
+                    1,
+                    ignored_squares={POSITIONS_TO_SQUARES["D2"]},
+                )
+            ),
+            ["C4", "D1", "E4"],
+        )
+        self.assertEqual(
+            board.get_attackers(POSITIONS_TO_SQUARES["D5"], 2)[-1].position, "D8"
+        )
+
+    def test_evaluation_is_updated_incrementally(self):
+        games_moves = get_real_game_chess_moves_history_from_pgn_file(
+            "./tests/assets/master_games.pgn"
+        )
+
+        for game_moves in games_moves[:5]:
+            board = Board()
+
+            self.assertEqual(board.evaluate(), 0)
+
+            for move in [move for moves in game_moves for move in moves]:
+                board.apply_chess_notation_moves([[move]])
+
+                # new board calculates it from all pieces
+                self.assertEqual(
+                    board.evaluate(), Board.from_fen(board.to_fen()).evaluate()
+                )
+
+                for piece, move_info in board.legal_moves():
+                    evaluation = board.evaluate()
+
+                    board.push(piece=piece, move_info=move_info)
+                    board.pop()
+
+                    self.assertEqual(board.evaluate(), evaluation)
+
+    def test_position_hash_is_updated_incrementally(self):
+        games_moves = get_real_game_chess_moves_history_from_pgn_file(
+            "./tests/assets/master_games.pgn"
+        )
+
+        for game_moves in games_moves[:2]:
+            board = type(self.board)(backend=self.board.backend)
+
+            for moves in game_moves:
+                for move in moves:
+                    board.apply_chess_notation_moves([[move]])
+                    position_hash = board.position_hash
+
+                    # recalculate it from scratch
+                    board._rebuild_pieces_index()
+                    self.assertEqual(board.position_hash, position_hash)
+
+    def test_position_hash_depends_on_position_only(self):
+        start_position_hash = self.board.position_hash
+
+        # different moves order, same position
+        self.board.apply_chess_notation_moves([["Nf3", "Nf6"], ["Ng1", "Ng8"]])
+        self.assertEqual(self.board.position_hash, start_position_hash)
+
+        other_board = type(self.board)(backend=self.board.backend)
+        other_board.apply_chess_notation_moves([["Nf3", "Nc6"], ["e4", "e5"]])
+        self.board.apply_chess_notation_moves([["e4", "e5"], ["Nf3", "Nc6"]])
+        self.assertEqual(self.board.position_hash, other_board.position_hash)
+
+        # player to move is part of position
+        self.board.apply_chess_notation_moves([["Ng1"]])
+        self.assertNotEqual(self.board.position_hash, other_board.position_hash)
+        other_board.apply_chess_notation_moves([["Ng1", "Nb8"], ["Nf3", "Nc6"]])
+
+        # same placement, but castling rights of moved king are lost
+        self.board.apply_chess_notation_moves([["Nb8"], ["Ke2", "Nf6"], ["Ke1", "Ng8"]])
+        self.board.apply_chess_notation_moves([["Nf3", "Nc6"]])
+        self.assertEqual(
+            self.board.positions_to_pieces.keys(),
+            other_board.positions_to_pieces.keys(),
+        )
+        self.assertNotEqual(self.board.position_hash, other_board.position_hash)
+
+    def test_position_hash_is_restored_by_pop(self):
+        self.board.apply_chess_notation_moves(
+            [["e4", "a6"], ["Nf3", "Nc6"], ["Bc4", "Nh6"], ["e5", "d5"]]
+        )
+        position_hash = self.board.position_hash
+
+        for move_str in ["E5 D6", "O-O", "E1 F1"]:
+            move_info, piece, _, _ = self.board.get_move_info_if_it_is_valid_move_str(
+                move_str
+            )
+
+            self.board.push(piece=piece, move_info=move_info)
+            self.assertNotEqual(self.board.position_hash, position_hash)
+
+            self.board.pop()
+            self.assertEqual(self.board.position_hash, position_hash)
+
+    def test_threefold_repetition(self):
+        knights_moves = [["Nf3", "Nf6"], ["Ng1", "Ng8"]]
+
+        self.assertEqual(self.board.get_position_repetitions(), 1)
+
+        self.board.apply_chess_notation_moves(knights_moves)
+        self.assertEqual(self.board.get_position_repetitions(), 2)
+        self.assertIsNone(self.board.get_game_status())
+
+        # pushed moves are counted too, until they are popped
+        for move_str in ["G1 F3", "G8 F6", "F3 G1", "F6 G8"]:
+            move_info, piece, _, _ = self.board.get_move_info_if_it_is_valid_move_str(
+                move_str
+            )
+            self.board.push(piece=piece, move_info=move_info)
+
+        self.assertTrue(self.board.is_threefold_repetition())
+
+        for _ in range(4):
+            self.board.pop()
+
+        self.assertEqual(self.board.get_position_repetitions(), 2)
+
+        self.board.apply_chess_notation_moves([["Nf3", "Nf6"]])
+
+        success, _, next_player_troubles = self.board.make_a_move_if_possible("F3 G1")
+        self.assertTrue(success)
+        self.assertIsNone(next_player_troubles["game_status"])
+
+        success, _, next_player_troubles = self.board.make_a_move_if_possible("F6 G8")
+        self.assertTrue(success)
+        self.assertEqual(self.board.get_position_repetitions(), 3)
+        self.assertEqual(next_player_troubles["game_status"], "threefold_repetition")
+
+        # the same pieces placement, but other castling rights
+        self.board.apply_chess_notation_moves([["e4", "e5"], ["Ke2", "Ke7"]])
+        self.board.apply_chess_notation_moves([["Ke1", "Ke8"], ["Ke2", "Ke7"]])
+        self.assertEqual(self.board.get_position_repetitions(), 2)
+
+        # history starts again from new position, unless it is given to the board
+        board = type(self.board).from_fen(self.board.to_fen())
+        self.assertEqual(board.get_position_repetitions(), 1)
+
+        board.set_position_history(self.board.get_position_history())
+        self.assertEqual(board.get_position_repetitions(), 2)
+
+        with self.assertRaises(ValueError):
+            board.set_position_history([])
+
+    def test_game_status(self):
+        board_class = type(self.board)
+
+        self.assertIsNone(self.board.get_game_status())
+
+        board = board_class.from_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        self.assertEqual(board.get_game_status(), "stalemate")
+
+        board = board_class.from_fen("7k/8/6K1/8/8/8/8/R7 w - - 99 80")
+        self.assertIsNone(board.get_game_status())
+
+        board.make_a_move_if_possible("A1 A2")
+        self.assertTrue(board.is_fifty_move_rule())
+        self.assertEqual(board.get_game_status(), "fifty_move_rule")
+
+        # checkmate is more important than fifty-move rule
+        board = board_class.from_fen("7k/8/6K1/8/8/8/8/R7 w - - 99 80")
+        board.make_a_move_if_possible("A1 A8")
+        self.assertEqual(board.get_game_status(), "checkmate")
+
+        for fen, insufficient_material in [
+            ("7k/8/6K1/8/8/8/8/8 w - - 0 1", True),
+            ("7k/8/6K1/8/8/8/8/1n6 w - - 0 1", True),
+            ("7k/8/6K1/8/8/8/8/1B6 w - - 0 1", True),
+            ("7k/8/6K1/8/8/8/1P6/8 w - - 0 1", False),
+            ("7k/8/6K1/8/8/8/8/1BN5 w - - 0 1", False),
+        ]:
+            board = board_class.from_fen(fen)
+
+            self.assertEqual(board.has_insufficient_material(), insufficient_material)
+            self.assertEqual(
+                board.get_game_status() == "insufficient_material",
+                insufficient_material,
+            )
+
+    def test_legal_moves_match_moves_that_do_not_leave_king_in_check(self):
+        games_moves = get_real_game_chess_moves_history_from_pgn_file(
+            "./tests/assets/master_games.pgn"
+        )
+
+        for game_moves in games_moves[:2]:
+            board = type(self.board)(backend=self.board.backend)
+
+            for moves in game_moves:
+                for move in moves:
+                    expected_moves = []
+
+                    for piece in board.current_player_pieces:
+                        moves_info = board._get_technically_valid_moves_info(piece)
+
+                        if piece.piece_name == "king":
+                            moves_info += piece.get_castling_moves_info(board)
+
+                        for move_info in moves_info:
+                            board.push(
+                                piece=piece, move_info=move_info, swap_player_turn=False
+                            )
+
+                            if not board._player_has_check_in_position():
+                                expected_moves.append((piece, move_info))
+
+                            board.pop()
+
+                    key = lambda i: (i[0].square, repr(sorted(i[1].items())))
+
+                    self.assertEqual(
+                        sorted(board.legal_moves(), key=key),
+                        sorted(expected_moves, key=key),
+                    )
+
+                    board.apply_chess_notation_moves([[move]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,244 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from _endgame_tablebase import (
+    DRAW,
+    NOT_POSSIBLE,
+    EndgameTablebase,
+    TableLayout,
+    load_table,
+    save_table,
+)
+from board import Board
+from endgame_tablebase import (
+    CHECKPOINT_FILE_EXTENSION,
+    _TableGenerator,
+    _save_checkpoint,
+    generate_endgame_table,
+    generate_endgame_tables,
+    get_file_path,
+    get_required_materials,
+)
+from engine import MATE_SCORE, Engine
+
+
+class TestEndgameTablebase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.generated_materials = generate_endgame_tables(
+            ["KKQ"], cls.directory, processes=1
+        )
+        cls.tablebase = EndgameTablebase.load(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def _get_board(self, fen):
+        board = Board.from_fen(fen)
+        board.endgame_tablebase = self.tablebase
+
+        return board
+
+    def test_generated_table(self):
+        self.assertEqual(self.generated_materials, ["KQK"])
+        self.assertEqual(self.tablebase.materials, ["KQK"])
+        self.assertFalse(
+            os.path.exists(
+                get_file_path(self.directory, "KQK") + CHECKPOINT_FILE_EXTENSION
+            )
+        )
+
+        material, values = load_table(get_file_path(self.directory, "KQK"))
+
+        self.assertEqual(material, "KQK")
+        self.assertEqual(len(values), TableLayout("KQK").size)
+        # the longest checkmate with king and queen takes 10 moves
+        self.assertEqual(max(i for i in values if i != NOT_POSSIBLE) - 1, 20)
+
+    def test_probe(self):
+        board = self._get_board("7k/8/6K1/8/8/8/8/1Q6 w - - 0 1")
+
+        self.assertEqual(
+            board.probe_endgame_tablebase(), {"result": "win", "distance": 1}
+        )
+
+        tablebase_moves = board.endgame_tablebase_moves()
+
+        self.assertEqual(tablebase_moves[0]["move"], "B1 B8")
+        self.assertEqual(tablebase_moves[0]["result"], "win")
+        self.assertEqual(tablebase_moves[0]["distance"], 1)
+        # moves that let king kill queen
+        self.assertEqual(tablebase_moves[-1]["result"], "draw")
+
+        board.make_a_move_if_possible("B1 B8")
+
+        self.assertEqual(
+            board.get_current_player_troubles(),
+            {
+                "player_is_checked": True,
+                "player_is_checkmated": True,
+                "move_that_makes_check_disappear": {},
+                "endgame_tablebase_result": {"result": "loss", "distance": 0},
+                "game_status": "checkmate",
+            },
+        )
+
+        # the same position with players swapped
+        board = self._get_board("1q6/8/8/8/8/6k1/8/7K b - - 0 1")
+
+        self.assertEqual(
+            board.probe_endgame_tablebase(), {"result": "win", "distance": 1}
+        )
+
+        # king can kill queen
+        board = self._get_board("7k/6Q1/8/8/8/8/8/K7 b - - 0 1")
+
+        self.assertEqual(
+            board.probe_endgame_tablebase(), {"result": "draw", "distance": 0}
+        )
+        self.assertEqual(board.endgame_tablebase_moves()[0]["move"], "H8 G7")
+
+        # only kings left, no table is needed
+        board = self._get_board("7k/8/8/8/8/8/8/K7 w - - 0 1")
+
+        self.assertEqual(
+            board.probe_endgame_tablebase(), {"result": "draw", "distance": 0}
+        )
+
+        # no table for rook
+        board = self._get_board("7k/8/6K1/8/8/8/8/R7 w - - 0 1")
+
+        self.assertIsNone(board.probe_endgame_tablebase())
+        self.assertEqual(board.endgame_tablebase_moves(), [])
+        self.assertIsNone(Board().probe_endgame_tablebase())
+
+    def test_engine_plays_tablebase_moves(self):
+        board = self._get_board("8/8/8/3k4/8/8/8/KQ6 w - - 0 1")
+        distance = board.probe_endgame_tablebase()["distance"]
+
+        engine = Engine(time_limit=None, max_depth=1)
+        result = engine.search(board)
+
+        self.assertTrue(result["from_endgame_tablebase"])
+        self.assertEqual(result["score"], MATE_SCORE - distance)
+
+        board.make_a_move_if_possible(result["move"])
+
+        self.assertEqual(
+            board.probe_endgame_tablebase(),
+            {"result": "loss", "distance": distance - 1},
+        )
+
+    def test_generation_continues_from_checkpoint(self):
+        file_path = get_file_path(self.directory, "KQK")
+        _, values = load_table(file_path)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        # generation was stopped after positions with checkmate in 11 plies were found
+        finished_steps = 12
+        checkpoint_values = bytes(
+            i if i <= finished_steps or i == NOT_POSSIBLE else 0 for i in values
+        )
+
+        _save_checkpoint(
+            get_file_path(directory, "KQK") + CHECKPOINT_FILE_EXTENSION,
+            "KQK",
+            finished_steps,
+            len(values),
+            checkpoint_values,
+            bytes(len(values)),
+        )
+
+        generate_endgame_table("KQK", directory, processes=1)
+
+        self.assertEqual(load_table(get_file_path(directory, "KQK"))[1], values)
+
+    def test_values_match_values_of_moves(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        # made up tables for promotions, where both players win, lose or draw
+        # after different number of plies, so that moves into other materials
+        # are sometimes better and sometimes worse than moves in the table
+        for material in ("KQK", "KRK"):
+            save_table(
+                get_file_path(directory, material),
+                material,
+                bytes(i % 7 * 5 % 31 for i in range(TableLayout(material).size)),
+            )
+
+        generate_endgame_table("KPK", directory, processes=1)
+
+        tablebase = EndgameTablebase.load(directory)
+        _, values = load_table(get_file_path(directory, "KPK"))
+        generator = _TableGenerator("KPK", values, tablebase)
+
+        self.assertGreater(len(set(values) - {DRAW, NOT_POSSIBLE}), 2)
+
+        for index, value in enumerate(values):
+            if value == NOT_POSSIBLE:
+                continue
+
+            squares, player_number = generator.layout.get_position(index)
+            moves = generator._get_moves(squares, player_number)
+
+            self.assertEqual(
+                generator._get_value(squares, player_number, moves), value, index
+            )
+
+    def test_positions_are_solved_only_on_their_step(self):
+        # checkmate in 4 plies after each promotion
+        tablebase = EndgameTablebase()
+
+        for material in ("KQK", "KRK"):
+            tablebase.add_table(material, bytes([5]) * TableLayout(material).size)
+
+        layout = TableLayout("KPK")
+        generator = _TableGenerator("KPK", bytes(layout.size), tablebase)
+        index = layout.get_index([0, 52, 7], 1)
+
+        # moves in the table are not known yet, and may give shorter win later
+        self.assertEqual(generator.solve_positions([index], 1), [])
+        self.assertEqual(generator.solve_positions([index], 5), [(index, 6)])
+
+    def test_required_materials(self):
+        self.assertEqual(get_required_materials("KQK"), [])
+        self.assertEqual(get_required_materials("KBNK"), [])
+        self.assertEqual(get_required_materials("KPK"), ["KQK", "KRK"])
+        self.assertEqual(get_required_materials("KQKR"), ["KQK", "KRK"])
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        # tables for promotions should be generated first
+        with self.assertRaises(ValueError):
+            generate_endgame_table("KPK", directory, processes=1)
+
+    def test_load_and_save(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        file_path = os.path.join(directory, "KRK.cctb")
+
+        with self.assertRaises(ValueError):
+            save_table(file_path, "KRK", b"\0")
+
+        save_table(file_path, "KRK", bytes(TableLayout("KRK").size))
+
+        self.assertEqual(EndgameTablebase.load(directory).materials, ["KRK"])
+
+        with open(file_path, "r+b") as f:
+            f.truncate(100)
+
+        with self.assertRaises(ValueError):
+            load_table(file_path)
+
+        for material in ("KQ", "QKK", "KXK", "KQRBK", "KNBK"):
+            with self.assertRaises(ValueError):
+                TableLayout(material)
@@ -0,0 +1,86 @@
+import io
+import unittest
+
+from board import Board
+from engine import MATE_SCORE, Engine
+from opening_book import build_opening_book
+from pgn_reader import read_pgn_games
+
+
+class TestEngine(unittest.TestCase):
+    def test_finds_checkmate(self):
+        board = Board.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+
+        result = Engine(time_limit=None, max_depth=3).search(board)
+
+        self.assertEqual(result["move"], "A1 A8")
+        self.assertEqual(result["score"], MATE_SCORE - 1)
+
+        # player 2 should make space for king to escape
+        board = Board.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 b - - 0 1")
+
+        result = Engine(time_limit=None, max_depth=2).search(board)
+        # only rook less, not checkmated
+        self.assertLess(result["score"], -400)
+        self.assertGreater(result["score"], -600)
+
+    def test_kills_undefended_queen_and_leaves_board_as_it_was(self):
+        fen = "4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1"
+        board = Board.from_fen(fen)
+        position_hash = board.position_hash
+
+        result = Engine(time_limit=None, max_depth=3).search(board)
+
+        self.assertEqual(result["move"], "D2 D5")
+        self.assertEqual(result["depth"], 3)
+        self.assertEqual(result["principal_variation"][0], "D2 D5")
+        self.assertEqual(len(result["principal_variation"]), 3)
+
+        self.assertEqual(board.to_fen(), fen)
+        self.assertEqual(board.position_hash, position_hash)
+
+    def test_does_not_kill_defended_pawn_with_queen(self):
+        board = Board.from_fen("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+
+        result = Engine(time_limit=None, max_depth=1).search(board)
+
+        self.assertNotEqual(result["move"], "D1 D5")
+        self.assertGreater(result["quiescence_nodes"], 0)
+
+    def test_limits(self):
+        board = Board()
+
+        result = Engine(time_limit=None, node_limit=500).search(board)
+
+        self.assertLessEqual(result["nodes"], 500)
+        self.assertIsNotNone(result["move"])
+        self.assertEqual(board.to_fen(), Board().to_fen())
+
+        result = Engine(time_limit=0.2).search(board)
+
+        self.assertLess(result["seconds"], 1)
+        self.assertGreaterEqual(result["depth"], 1)
+        self.assertEqual(board.to_fen(), Board().to_fen())
+
+    def test_no_legal_moves(self):
+        # stalemate
+        board = Board.from_fen("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1")
+
+        result = Engine().search(board)
+
+        self.assertIsNone(result["move"])
+        self.assertEqual(result["score"], 0)
+
+    def test_book_moves_are_played_without_search(self):
+        board = Board(
+            opening_book=build_opening_book(read_pgn_games(io.StringIO("1. d4 *")))
+        )
+
+        result = Engine().search(board)
+
+        self.assertEqual(result["move"], "D2 D4")
+        self.assertTrue(result["from_opening_book"])
+        self.assertEqual(result["nodes"], 0)
+
+        result = Engine(use_opening_book=False, max_depth=1).search(board)
+        self.assertFalse(result["from_opening_book"])
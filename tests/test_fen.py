@@ -0,0 +1,106 @@
+import unittest
+
+from board import BITBOARD_BACKEND, STARTING_POSITION_FEN, Board
+
+
+class TestFen(unittest.TestCase):
+    def test_starting_position(self):
+        self.assertEqual(Board().to_fen(), STARTING_POSITION_FEN)
+
+        board = Board.from_fen(STARTING_POSITION_FEN)
+
+        self.assertEqual(board.position_hash, Board().position_hash)
+        self.assertEqual(board.to_fen(), STARTING_POSITION_FEN)
+
+    def test_fen_follows_moves(self):
+        board = Board()
+        board.apply_chess_notation_moves([["e4"]])
+
+        self.assertEqual(
+            board.to_fen(),
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+        )
+
+        board.apply_chess_notation_moves([["Nf6"], ["Ke2", "Ng8"], ["Ke1"]])
+
+        self.assertEqual(
+            board.to_fen(),
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b kq - 4 3",
+        )
+
+    def test_position_is_the_same_as_after_moves(self):
+        moves = [
+            ["e4", "c5"],
+            ["e5", "d5"],
+            ["exd6", "Nc6"],
+            ["Nf3", "Qb6"],
+            ["Bb5", "a6"],
+            ["O-O", "axb5"],
+        ]
+
+        for backend_kwargs in ({}, {"backend": BITBOARD_BACKEND}):
+            board = Board(**backend_kwargs)
+            board.apply_chess_notation_moves(moves[:2])
+
+            board_from_fen = Board.from_fen(board.to_fen(), **backend_kwargs)
+
+            self.assertEqual(board_from_fen.to_fen(), board.to_fen())
+            self.assertEqual(board_from_fen.position_hash, board.position_hash)
+
+            # En passant, castling and other moves work the same way
+            board.apply_chess_notation_moves(moves[2:])
+            board_from_fen.apply_chess_notation_moves(moves[2:])
+
+            self.assertEqual(board_from_fen.to_fen(), board.to_fen())
+            self.assertEqual(board_from_fen.position_hash, board.position_hash)
+            self.assertEqual(
+                board_from_fen.chess_notation_moves, board.chess_notation_moves[2:]
+            )
+
+    def test_castling_rights_become_moves_counts(self):
+        board = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w Kq - 0 1")
+
+        self.assertEqual(board.positions_to_pieces["E1"].moves_count, 0)
+        self.assertEqual(board.positions_to_pieces["H1"].moves_count, 0)
+        self.assertEqual(board.positions_to_pieces["A1"].moves_count, 1)
+        self.assertEqual(board.positions_to_pieces["H8"].moves_count, 1)
+
+        self.assertFalse(board.make_a_move_if_possible("O-O-O")[0])
+        self.assertTrue(board.make_a_move_if_possible("O-O")[0])
+        self.assertFalse(board.make_a_move_if_possible("O-O")[0])
+        self.assertTrue(board.make_a_move_if_possible("O-O-O")[0])
+
+        self.assertEqual(board.to_fen(), "2kr3r/8/8/8/8/8/8/R4RK1 w - - 2 2")
+
+    def test_game_can_start_from_second_player_move(self):
+        board = Board.from_fen(
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        )
+        board.apply_chess_notation_moves([["c5"], ["Nf3"]])
+
+        self.assertEqual(board.chess_notation_moves, [["c5"], ["Nf3"]])
+        self.assertEqual(board.fullmove_number, 2)
+
+    def test_invalid_fens(self):
+        for fen in [
+            "",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNRR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQQBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkX - 0 1",
+            # no rook for castling and no pawn for En passant
+            "rnbqkbn1/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e6 0 1",
+            # pawns on first and last rows
+            "4k2P/8/8/8/8/8/8/4K3 w - - 0 1",
+            "4k3/8/8/8/8/8/8/p3K3 b - - 0 1",
+            "4k3/8/8/8/8/8/8/P3K3 w - - 0 1",
+        ]:
+            with self.assertRaises(ValueError, msg=fen):
+                Board.from_fen(fen)
+
+
+if __name__ == "__main__":
+    unittest.main()
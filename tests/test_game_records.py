@@ -0,0 +1,85 @@
+import io
+import unittest
+
+from board import Board
+from game_records import (
+    decode_game_record,
+    decode_move,
+    encode_board_history,
+    encode_move,
+    read_game_records,
+    replay_game_record,
+    write_game_records,
+)
+from tests.real_game_info_retrieval_functions import (
+    get_real_game_chess_moves_history_from_pgn_file,
+)
+
+
+class TestGameRecords(unittest.TestCase):
+    def test_moves_take_16_bits(self):
+        for move in [(12, 28, None), (63, 0, None), (50, 58, "N"), (8, 0, "Q")]:
+            encoded_move = encode_move(*move)
+
+            self.assertLess(encoded_move, 1 << 16)
+            self.assertEqual(decode_move(encoded_move), move)
+
+    def test_real_games_are_restored(self):
+        games_moves = get_real_game_chess_moves_history_from_pgn_file(
+            "./tests/assets/master_games.pgn"
+        )
+
+        records = []
+
+        for game_moves in games_moves[:3]:
+            board = Board()
+            board.apply_chess_notation_moves(game_moves)
+
+            record = encode_board_history(board)
+            records.append(record)
+
+            self.assertEqual(len(record), 6 + 2 * board.total_moves_count)
+            self.assertEqual(replay_game_record(record).to_fen(), board.to_fen())
+
+            board_with_history = replay_game_record(record, with_history=True)
+            self.assertEqual(
+                board_with_history.chess_notation_moves, board.chess_notation_moves
+            )
+
+        f = io.BytesIO()
+        write_game_records(f, records)
+        f.seek(0)
+
+        self.assertEqual(list(read_game_records(f)), records)
+
+    def test_castling_promotions_and_starting_position(self):
+        fen = "r3k2r/1P6/8/8/8/8/8/R3K2R b KQkq - 0 1"
+
+        board = Board.from_fen(fen)
+        board.apply_chess_notation_moves([["O-O"], ["bxa8=N", "Rxa8"], ["O-O-O"]])
+
+        record = encode_board_history(board)
+        starting_fen, moves = decode_game_record(record)
+
+        self.assertEqual(starting_fen, fen)
+        self.assertEqual(
+            moves, [(60, 62, None), (49, 56, "N"), (61, 56, None), (4, 2, None)]
+        )
+        self.assertEqual(replay_game_record(record).to_fen(), board.to_fen())
+
+        f = io.BytesIO(record * 2)
+        self.assertEqual(list(read_game_records(f)), [record, record])
+
+    def test_broken_records(self):
+        record = encode_board_history(Board.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1"))
+
+        for broken_record in [b"", b"XX" + record[2:], record[:-1], record + b"\0"]:
+            with self.assertRaises(ValueError):
+                decode_game_record(broken_record)
+
+        with self.assertRaises(ValueError):
+            list(read_game_records(io.BytesIO(record[:-1])))
+
+
+if __name__ == "__main__":
+    unittest.main()
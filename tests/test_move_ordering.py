@@ -0,0 +1,65 @@
+import unittest
+
+from _move_ordering import MoveOrderer
+from board import Board
+from engine import Engine, get_move_key, get_move_str
+
+
+class TestMoveOrdering(unittest.TestCase):
+    def _get_ordered_moves_strs(self, move_orderer, board, ply=0, best_move_key=None):
+        return [
+            get_move_str(piece, move_info)
+            for piece, move_info in move_orderer.order_moves(
+                board, board.legal_moves(), ply, best_move_key
+            )
+        ]
+
+    def test_kills_and_promotions_first(self):
+        # pawn and queen can kill rook, queen can kill pawn, pawn can promote
+        board = Board.from_fen("4k3/1P6/8/3r4/p1P5/8/8/3QK3 w - - 0 1")
+
+        moves_strs = self._get_ordered_moves_strs(MoveOrderer(), board)
+
+        self.assertEqual(moves_strs[:4], ["C4 D5", "D1 D5", "D1 A4", "B7 B8=Q"])
+        self.assertEqual(sorted(moves_strs[4:7]), ["B7 B8=B", "B7 B8=N", "B7 B8=R"])
+
+    def test_best_move_killers_and_history(self):
+        board = Board()
+        move_orderer = MoveOrderer()
+
+        moves = {get_move_str(*i): i for i in board.legal_moves()}
+
+        move_orderer.add_cutoff(*moves["G2 G3"], ply=2, depth=3, move_number=0)
+        move_orderer.add_cutoff(*moves["H2 H3"], ply=2, depth=3, move_number=5)
+        move_orderer.add_cutoff(*moves["A2 A3"], ply=1, depth=4, move_number=1)
+
+        self.assertEqual(
+            self._get_ordered_moves_strs(
+                move_orderer, board, ply=2, best_move_key=get_move_key(*moves["B1 C3"])
+            )[:4],
+            # best move, killers, then the one with best history score
+            ["B1 C3", "H2 H3", "G2 G3", "A2 A3"],
+        )
+
+        self.assertEqual(
+            move_orderer.get_stats(),
+            {
+                "cutoffs": 3,
+                "first_move_cutoffs": 1,
+                "first_move_cutoffs_rate": 1 / 3,
+                "killer_move_cutoffs": 0,
+            },
+        )
+
+        move_orderer.new_search()
+
+        self.assertEqual(move_orderer.get_stats()["cutoffs"], 0)
+        self.assertEqual(
+            self._get_ordered_moves_strs(move_orderer, board, ply=2)[0], "A2 A3"
+        )
+
+    def test_engine_gives_stats(self):
+        result = Engine(time_limit=None, max_depth=3).search(Board())
+
+        self.assertGreater(result["move_ordering"]["cutoffs"], 0)
+        self.assertGreater(result["move_ordering"]["first_move_cutoffs_rate"], 0.5)
@@ -1,6 +1,13 @@
 import unittest
 
 from _move_related_functions import (
+    KING_TARGETS,
+    KNIGHT_TARGETS,
+    PAWN_ATTACKS,
+    POSITIONS_TO_SQUARES,
+    RAYS,
+    SQUARES_TO_POSITIONS,
+    TOP_RIGHT,
     _is_chess_cell_coord,
     _is_chess_basic_move_str,
     _is_chess_notation_move_str,
@@ -49,13 +56,53 @@ class TestIsChessNotationMoveStr(unittest.TestCase):
             "Qexe6+",
             "Q3xe6+",
             "Qe3xe6+",
+            "Qh4#",
+            "exd8=Q#",
+            "O-O+",
+            "O-O-O#",
         ]:
             self.assertTrue(_is_chess_notation_move_str(i))
 
     def test_is_not_chess_notation_move_str(self):
-        for i in ["R e8", "QxE6+", "xNe4", "e4Nx", "A9", "a0", "b11", "00", "000"]:
+        for i in [
+            "R e8",
+            "QxE6+",
+            "xNe4",
+            "e4Nx",
+            "A9",
+            "a0",
+            "b11",
+            "00",
+            "000",
+            "Q+h4",
+            "Qh4+#",
+            "O-O#+",
+        ]:
             self.assertFalse(_is_chess_notation_move_str(i))
 
 
+class TestMoveTables(unittest.TestCase):
+    def _positions(self, squares):
+        return [SQUARES_TO_POSITIONS[i] for i in squares]
+
+    def test_targets_stay_on_board(self):
+        self.assertCountEqual(
+            self._positions(KNIGHT_TARGETS[POSITIONS_TO_SQUARES["A1"]]), ["B3", "C2"]
+        )
+        self.assertCountEqual(
+            self._positions(KING_TARGETS[POSITIONS_TO_SQUARES["H8"]]),
+            ["G8", "G7", "H7"],
+        )
+        self.assertCountEqual(
+            self._positions(PAWN_ATTACKS[2][POSITIONS_TO_SQUARES["A7"]]), ["B6"]
+        )
+
+    def test_rays_start_from_nearest_cell(self):
+        self.assertEqual(
+            self._positions(RAYS[POSITIONS_TO_SQUARES["E4"]][TOP_RIGHT]),
+            ["F5", "G6", "H7"],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+import unittest
+
+from _move_related_functions import POSITIONS_TO_SQUARES, encode_move
+from _opening_book import OpeningBook
+from board import Board
+from engine import Engine
+from opening_book import build_opening_book
+from pgn_reader import read_pgn_games
+
+PGN_TEXT = """
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Nf6 4. O-O 1-0
+
+1. e4 c5 2. Nf3 d6 0-1
+
+1. d4 d5 2. c4 1/2-1/2
+
+1. e4 e5 2. Bc4 *
+"""
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.book = build_opening_book(read_pgn_games(io.StringIO(PGN_TEXT)))
+
+    def test_book_moves(self):
+        board = Board(opening_book=self.book)
+
+        self.assertEqual(
+            board.book_moves(),
+            [
+                {
+                    "move": "E2 E4",
+                    "games": 3,
+                    "player_1_wins": 1,
+                    "draws": 0,
+                    "player_2_wins": 1,
+                },
+                {
+                    "move": "D2 D4",
+                    "games": 1,
+                    "player_1_wins": 0,
+                    "draws": 1,
+                    "player_2_wins": 0,
+                },
+            ],
+        )
+
+        board.apply_chess_notation_moves([["e4", "e5"]])
+        self.assertEqual([i["move"] for i in board.book_moves()], ["G1 F3", "F1 C4"])
+
+        board.apply_chess_notation_moves([["Nf3", "Nc6"], ["Bc4", "Nf6"]])
+        self.assertEqual([i["move"] for i in board.book_moves()], ["O-O"])
+
+        board.make_a_move_if_possible("O-O")
+        self.assertEqual(board.book_moves(), [])
+
+        self.assertEqual(Board().book_moves(), [])
+
+    def test_illegal_book_moves_are_skipped(self):
+        board = Board(opening_book=self.book)
+
+        # king can not move to E2, as pawn is there
+        self.book.add_move(
+            board.position_hash,
+            encode_move(POSITIONS_TO_SQUARES["E1"], POSITIONS_TO_SQUARES["E2"]),
+        )
+
+        self.assertEqual([i["move"] for i in board.book_moves()], ["E2 E4", "D2 D4"])
+        self.assertEqual(Engine().search(board)["move"], "E2 E4")
+
+    def test_max_plies_and_min_games(self):
+        book = build_opening_book(
+            read_pgn_games(io.StringIO(PGN_TEXT)), max_plies=2, min_games=2
+        )
+
+        board = Board(opening_book=book)
+        self.assertEqual([i["move"] for i in board.book_moves()], ["E2 E4"])
+
+        board.apply_chess_notation_moves([["e4"]])
+        self.assertEqual([i["move"] for i in board.book_moves()], ["E7 E5"])
+
+        board.apply_chess_notation_moves([["e5"]])
+        self.assertEqual(board.book_moves(), [])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            book_file_path = os.path.join(directory, "book.bin")
+
+            self.book.save(book_file_path)
+            loaded_book = OpeningBook.load(book_file_path)
+
+            with open(book_file_path, "wb") as f:
+                f.write(b"not a book")
+
+            with self.assertRaises(ValueError):
+                OpeningBook.load(book_file_path)
+
+        self.assertEqual(len(loaded_book), len(self.book))
+
+        board = Board(opening_book=self.book)
+        loaded_book_board = Board(opening_book=loaded_book)
+
+        for moves in [[], ["e4"], ["e5"], ["Nf3"]]:
+            board.apply_chess_notation_moves([moves])
+            loaded_book_board.apply_chess_notation_moves([moves])
+
+            self.assertEqual(board.book_moves(), loaded_book_board.book_moves())
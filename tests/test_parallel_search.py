@@ -0,0 +1,83 @@
+import time
+import unittest
+
+from _endgame_tablebase import EndgameTablebase, TableLayout
+from board import MAILBOX_BACKEND, Board
+from engine import MATE_SCORE, MAX_PLY
+from parallel_search import ParallelEngine, _search_in_worker
+
+
+class TestParallelSearch(unittest.TestCase):
+    def test_search(self):
+        fen = "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1"
+        board = Board.from_fen(fen)
+
+        with ParallelEngine(processes=2, time_limit=None, max_depth=3) as engine:
+            result = engine.search(board)
+
+            # workers save positions into table of main process
+            self.assertIsNotNone(engine.transposition_table.probe(board.position_hash))
+
+            self.assertEqual(result["move"], "A1 A8")
+            self.assertEqual(result["score"], MATE_SCORE - 1)
+            self.assertEqual(result["processes"], 2)
+            self.assertIn(result["worker_index"], (0, 1))
+
+            # the same processes are used for next searches
+            board.apply_chess_notation_moves([["Kf1", "h6"]])
+            result = engine.search(board)
+
+            # king can escape now
+            self.assertIsNotNone(result["move"])
+            self.assertLess(result["score"], MATE_SCORE - MAX_PLY)
+
+        self.assertEqual(board.to_fen(), "6k1/5pp1/7p/8/8/8/5PPP/R4K2 w - - 0 2")
+
+    def test_repetitions_are_found_by_workers(self):
+        board = Board.from_fen("k1r5/8/q7/8/8/8/8/1N5K w - - 0 1")
+        board.apply_chess_notation_moves([["Nc3", "Kb8"], ["Nb1", "Ka8"]])
+
+        # Nc3 repeats position, which is better than being without queen and rook
+        with ParallelEngine(processes=2, time_limit=None, max_depth=2) as engine:
+            result = engine.search(board)
+
+        self.assertEqual(result["move"], "B1 C3")
+        self.assertEqual(result["score"], 0)
+
+    def test_worker_stops_at_given_time(self):
+        board = Board()
+
+        # search that waited for other one in the same process has no time left
+        result = _search_in_worker(
+            board.to_fen(),
+            board.get_position_history(),
+            MAILBOX_BACKEND,
+            0,
+            time.time() - 1,
+            MAX_PLY,
+            None,
+        )
+
+        self.assertIsNotNone(result["move"])
+        self.assertLess(result["seconds"], 0.5)
+
+    def test_tablebase_moves_are_played_without_processes(self):
+        # table where all positions are draws is enough to have tablebase moves
+        tablebase = EndgameTablebase()
+        tablebase.add_table("KRK", bytes(TableLayout("KRK").size))
+
+        board = Board.from_fen("7k/8/6K1/8/8/8/8/R7 w - - 0 1")
+        board.endgame_tablebase = tablebase
+
+        with ParallelEngine(processes=2, time_limit=None, max_depth=2) as engine:
+            result = engine.search(board)
+
+            self.assertTrue(result["from_endgame_tablebase"])
+            self.assertEqual(result["processes"], 0)
+
+            # the same position without tablebase is searched by processes
+            board.endgame_tablebase = None
+            result = engine.search(board)
+
+            self.assertEqual(result["move"], "A1 A8")
+            self.assertEqual(result["processes"], 2)
@@ -142,6 +142,29 @@ class TestPawn(BaseTest):
         # but can do like knight
         self._assert_was_successful_move("d8 c6")
 
+    def test_black_pawn_promotes_on_first_row(self):
+        self.board.apply_chess_notation_moves(
+            [["a3", "b5"], ["a4", "bxa4"], ["b3", "axb3"], ["Nf3", "bxc2"], ["Nd4"]]
+        )
+
+        self._assert_was_not_successful_move("c2 c1=Q")
+        self._assert_was_not_successful_move("c2 d1")
+        success, _, _ = self.board.make_a_move_if_possible("c2 d1=R")
+        self.assertTrue(success)
+
+        self.assertEqual(self.board.positions_to_pieces["D1"].piece_name, "rook")
+        self.assertEqual(self.board.positions_to_pieces["D1"].player_number, 2)
+
+    def test_can_not_promote_by_moving_diagonally_to_empty_cell(self):
+        self.board.apply_chess_notation_moves(
+            [["b4", "c5"], ["bxc5", "a6"], ["c6", "a5"], ["c7", "Nc6"]]
+        )
+
+        self._assert_was_not_successful_move("c7 b8=Q")
+
+        success, _, _ = self.board.make_a_move_if_possible("c7 d8=Q")
+        self.assertTrue(success)
+
 
 if __name__ == "__main__":
     unittest.main()
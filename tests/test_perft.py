@@ -0,0 +1,86 @@
+import unittest
+
+from board import BITBOARD_BACKEND, MAILBOX_BACKEND, STARTING_POSITION_FEN, Board
+from perft import perft, perft_divide
+
+
+class TestPerft(unittest.TestCase):
+    backend = MAILBOX_BACKEND
+
+    def _get_board(self, fen=STARTING_POSITION_FEN):
+        return Board.from_fen(fen, backend=self.backend)
+
+    def test_starting_position_counts(self):
+        board = self._get_board()
+
+        # published reference numbers
+        for depth, nodes in [(0, 1), (1, 20), (2, 400), (3, 8902)]:
+            self.assertEqual(perft(board, depth), nodes)
+
+    def test_published_positions_counts(self):
+        for fen, nodes_by_depth in [
+            # "Kiwipete", lots of castling, En passant and pins
+            (
+                "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                [48, 2039],
+            ),
+            # En passant that opens check along the row
+            ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812]),
+            # promotions
+            (
+                "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                [6, 264],
+            ),
+            ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486]),
+        ]:
+            board = self._get_board(fen)
+
+            for depth, nodes in enumerate(nodes_by_depth, start=1):
+                self.assertEqual(perft(board, depth), nodes, fen)
+
+    def test_board_is_not_changed(self):
+        board = self._get_board()
+        board.apply_chess_notation_moves([["e4", "d5"], ["e5", "f5"]])
+
+        position_hash = board.position_hash
+        positions = dict(board.positions_to_pieces)
+
+        perft(board, 3)
+
+        self.assertEqual(board.position_hash, position_hash)
+        self.assertEqual(dict(board.positions_to_pieces), positions)
+
+    def test_divide_counts_each_move(self):
+        board = self._get_board()
+        board.apply_chess_notation_moves([["e4", "d5"], ["e5", "f5"]])
+
+        nodes_by_moves = perft_divide(board, 2)
+
+        # En passant is one of the moves
+        self.assertIn("E5 F6", nodes_by_moves)
+        self.assertEqual(len(nodes_by_moves), perft(board, 1))
+        self.assertEqual(sum(nodes_by_moves.values()), perft(board, 2))
+
+    def test_castling_and_promotions_are_counted(self):
+        board = self._get_board()
+        board.apply_chess_notation_moves(
+            [["b4", "c5"], ["bxc5", "Nf6"], ["c6", "e6"], ["cxb7", "Be7"]]
+        )
+
+        nodes_by_moves = perft_divide(board, 1)
+
+        # 4 promotions on each of 2 cells, and no castling yet for white
+        self.assertEqual(len([i for i in nodes_by_moves if i.startswith("B7 ")]), 8)
+        self.assertNotIn("O-O", nodes_by_moves)
+
+        board.apply_chess_notation_moves([["bxa8=Q"]])
+
+        self.assertIn("O-O", perft_divide(board, 1))
+
+
+class TestPerftWithBitboards(TestPerft):
+    backend = BITBOARD_BACKEND
+
+
+if __name__ == "__main__":
+    unittest.main()
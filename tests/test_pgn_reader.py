@@ -0,0 +1,78 @@
+import io
+import unittest
+
+from board import Board
+from pgn_reader import read_pgn_games
+
+PGN_TEXT = """
+[Event "Test game"]
+[White "Player, \\"One\\""]
+[Black "Player Two"]
+[Result "1-0"]
+
+% escaped line 1. a4
+1. e4! {multi line
+comment 1... h5} e5 !? 2. Nf3 $1 (2. Bc4 Nc6 (2... Nf6) 3. Qh5) 2... Nc6 ; rest is comment 3. a3
+3. Bb5 a6?! 4. 0-0 1-0
+
+[Event "Second game"]
+
+1. d4 d5 2. c4 *
+
+1. f3 e5 2. g4
+"""
+
+
+class TestPgnReader(unittest.TestCase):
+    def test_games_are_read_one_by_one(self):
+        games = read_pgn_games(io.StringIO(PGN_TEXT))
+
+        game = next(games)
+        self.assertEqual(
+            game["headers"],
+            {
+                "Event": "Test game",
+                "White": 'Player, "One"',
+                "Black": "Player Two",
+                "Result": "1-0",
+            },
+        )
+        self.assertEqual(
+            game["moves"],
+            [["e4", "e5"], ["Nf3", "Nc6"], ["Bb5", "a6"], ["O-O"]],
+        )
+        self.assertEqual(game["result"], "1-0")
+
+        game = next(games)
+        self.assertEqual(game["headers"], {"Event": "Second game"})
+        self.assertEqual(game["moves"], [["d4", "d5"], ["c4"]])
+        self.assertEqual(game["result"], "*")
+
+        # game without headers and result
+        game = next(games)
+        self.assertEqual(game["headers"], {})
+        self.assertEqual(game["moves"], [["f3", "e5"], ["g4"]])
+        self.assertIsNone(game["result"])
+
+        self.assertIsNone(next(games, None))
+
+    def test_read_games_can_be_applied_to_board(self):
+        with open("./tests/assets/master_games.pgn") as f:
+            games_count = 0
+
+            for game in read_pgn_games(f):
+                self.assertIn(game["result"], ("1-0", "0-1", "1/2-1/2"))
+                self.assertEqual(game["result"], game["headers"]["Result"])
+                games_count += 1
+
+            self.assertEqual(games_count, 25)
+
+        board = Board()
+        board.apply_chess_notation_moves(
+            next(read_pgn_games(io.StringIO(PGN_TEXT)))["moves"]
+        )
+        self.assertEqual(board.moves[-1], ["O-O"])
+
+
+if __name__ == "__main__":
+    unittest.main()
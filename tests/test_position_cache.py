@@ -0,0 +1,63 @@
+import unittest
+
+from _position_cache import PositionCache
+from board import Board
+from tests.real_game_info_retrieval_functions import (
+    get_real_game_chess_moves_history_from_pgn_file,
+)
+
+
+class TestPositionCache(unittest.TestCase):
+    def test_least_recently_used_values_are_evicted(self):
+        cache = PositionCache(max_size=2)
+
+        cache.set(1, "legal_moves", "first")
+        cache.set(2, "legal_moves", "second")
+
+        # now first one is used more recently than second
+        self.assertEqual(cache.get(1, "legal_moves"), "first")
+
+        cache.set(3, "legal_moves", "third")
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(2, "legal_moves"))
+        self.assertEqual(cache.get(1, "legal_moves"), "first")
+        self.assertEqual(cache.get(3, "legal_moves"), "third")
+
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.misses, 1)
+
+    def test_zero_size_cache_saves_nothing(self):
+        cache = PositionCache(max_size=0)
+        cache.set(1, "player_is_checked", False)
+
+        self.assertIsNone(cache.get(1, "player_is_checked"))
+        self.assertEqual(len(cache), 0)
+        # lookups of disabled cache are not misses
+        self.assertEqual(cache.misses, 0)
+        self.assertFalse(cache.get_stats()["enabled"])
+
+    def test_board_gives_same_results_with_and_without_cache(self):
+        games_moves = get_real_game_chess_moves_history_from_pgn_file(
+            "./tests/assets/master_games.pgn"
+        )
+
+        for game_moves in games_moves[:3]:
+            board = Board()
+            board_without_cache = Board(position_cache_size=0)
+
+            board.apply_chess_notation_moves(game_moves)
+            board_without_cache.apply_chess_notation_moves(game_moves)
+
+            self.assertEqual(board.moves, board_without_cache.moves)
+            self.assertEqual(
+                board.chess_notation_moves, board_without_cache.chess_notation_moves
+            )
+
+            # each position is analysed few times when loading games
+            self.assertGreater(board.position_cache.hits, board.position_cache.misses)
+            self.assertEqual(len(board_without_cache.position_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
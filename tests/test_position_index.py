@@ -0,0 +1,64 @@
+import io
+import os
+import tempfile
+import unittest
+
+from board import STARTING_POSITION_FEN, Board
+from pgn_reader import read_pgn_games
+from position_index import PositionIndex, build_position_index
+
+PGN_TEXT = """
+1. e4 e5 2. Nf3 Nc6 *
+
+1. Nf3 Nc6 2. e4 e5 3. Bb5 *
+
+1. d4 d5 2. Ke3 *
+"""
+
+
+class TestPositionIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index_file_path = os.path.join(self.directory.name, "games.index")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_games_are_found_by_position(self):
+        # small chunks, to also check their merging
+        entries_count = build_position_index(
+            read_pgn_games(io.StringIO(PGN_TEXT)), self.index_file_path, chunk_size=3
+        )
+
+        # all positions of first 2 games, and of 3-rd one before invalid move
+        self.assertEqual(entries_count, 5 + 6 + 3)
+        self.assertEqual(os.listdir(self.directory.name), ["games.index"])
+
+        board = Board()
+        board.apply_chess_notation_moves([["e4", "e5"], ["Nf3", "Nc6"]])
+
+        with PositionIndex(self.index_file_path) as index:
+            self.assertEqual(len(index), entries_count)
+
+            # same position reached with different moves order
+            self.assertEqual(
+                index.find_games_with_position_of_board(board), [(0, 4), (1, 4)]
+            )
+            self.assertEqual(
+                index.find_games(Board.from_fen(STARTING_POSITION_FEN).position_hash),
+                [(0, 0), (1, 0), (2, 0)],
+            )
+
+            board.apply_chess_notation_moves([["Bc4"]])
+            self.assertEqual(index.find_games_with_position_of_board(board), [])
+
+    def test_not_an_index_file(self):
+        with open(self.index_file_path, "wb") as f:
+            f.write(b"not an index")
+
+        with self.assertRaises(ValueError):
+            PositionIndex(self.index_file_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from _transposition_table import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+    _ENTRY,
+)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(size_mb=1)
+
+    def _get_same_bucket_hashes(self, count):
+        return [12345 + i * self.table.buckets_count for i in range(count)]
+
+    def test_store_and_probe(self):
+        self.assertIsNone(self.table.probe(12345))
+
+        self.table.store(12345, 5, LOWER_BOUND, -99990, 1234)
+        self.table.store(2**64 - 1, 63, UPPER_BOUND, 2**31 - 1, None)
+
+        self.assertEqual(self.table.probe(12345), (5, LOWER_BOUND, -99990, 1234))
+        self.assertEqual(
+            self.table.probe(2**64 - 1), (63, UPPER_BOUND, 2**31 - 1, None)
+        )
+        self.assertIsNone(self.table.probe(12346))
+
+        # best move is kept, if new result of the same position has no move
+        self.table.store(12345, 6, EXACT, 10, None)
+        self.assertEqual(self.table.probe(12345), (6, EXACT, 10, 1234))
+
+        self.assertEqual(
+            self.table.get_stats(),
+            {
+                "size_mb": 1,
+                "probes": 5,
+                "hits": 3,
+                "hit_rate": 3 / 5,
+                "stores": 3,
+                "replacements": 0,
+            },
+        )
+
+        self.table.clear()
+        self.assertIsNone(self.table.probe(12345))
+
+    def test_replacement(self):
+        position_hashes = self._get_same_bucket_hashes(6)
+
+        for depth, position_hash in zip((4, 2, 5, 3), position_hashes):
+            self.table.store(position_hash, depth, EXACT, 0, None)
+
+        # bucket is full, shallowest entry is replaced
+        self.table.store(position_hashes[4], 1, EXACT, 0, None)
+
+        self.assertIsNone(self.table.probe(position_hashes[1]))
+        self.assertEqual(
+            [self.table.probe(i)[0] for i in position_hashes[2:5]], [5, 3, 1]
+        )
+        self.assertEqual(self.table.replacements, 1)
+
+        # entries of previous searches are replaced before new ones, even deeper ones
+        self.table.new_search()
+        self.table.store(position_hashes[1], 1, EXACT, 0, None)
+        self.table.store(position_hashes[5], 1, EXACT, 0, None)
+
+        self.assertIsNone(self.table.probe(position_hashes[3]))
+        self.assertIsNotNone(self.table.probe(position_hashes[1]))
+        self.assertIsNotNone(self.table.probe(position_hashes[5]))
+
+    def test_entry_changed_by_other_process_at_the_same_time_is_ignored(self):
+        self.table.store(12345, 5, EXACT, 10, 1234)
+        self.table.store(67890, 7, EXACT, 20, 4321)
+
+        offset = 12345 % self.table.buckets_count * 4 * _ENTRY.size
+        checksum, _ = _ENTRY.unpack_from(self.table._buffer, offset)
+        _, other_data = _ENTRY.unpack_from(
+            self.table._buffer, 67890 % self.table.buckets_count * 4 * _ENTRY.size
+        )
+
+        # first half of entry is written, but second one is still old
+        _ENTRY.pack_into(self.table._buffer, offset, checksum, other_data)
+
+        self.assertIsNone(self.table.probe(12345))
+
+    def test_shared_table(self):
+        table = TranspositionTable(size_mb=1, shared=True)
+        other_process_table = TranspositionTable(size_mb=1, name=table.name)
+
+        try:
+            table.store(12345, 5, EXACT, 10, 1234)
+
+            self.assertEqual(other_process_table.probe(12345), (5, EXACT, 10, 1234))
+        finally:
+            other_process_table.close()
+            table.close(unlink=True)
@@ -0,0 +1,66 @@
+import io
+import unittest
+
+from pgn_reader import read_pgn_games
+from validate_games import validate_game, validate_games
+
+PGN_TEXT = """
+[Event "Valid"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Event "Invalid"]
+
+1. e4 e5 2. Ke3 Nc6 0-1
+
+[Event "Checkmate"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+"""
+
+
+class TestValidateGames(unittest.TestCase):
+    def test_invalid_move_is_found(self):
+        valid_game, invalid_game, checkmate_game = read_pgn_games(io.StringIO(PGN_TEXT))
+
+        result = validate_game(valid_game)
+        self.assertTrue(result["is_legal"])
+        self.assertEqual(result["moves_count"], 4)
+        self.assertIsNone(result["error_move"])
+
+        result = validate_game(invalid_game, index=1)
+        self.assertFalse(result["is_legal"])
+        self.assertEqual(result["index"], 1)
+        self.assertEqual(result["moves_count"], 2)
+        self.assertEqual(result["error_move"], "Ke3")
+        self.assertEqual(result["headers"], {"Event": "Invalid"})
+        self.assertEqual(
+            result["final_fen"],
+            "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2",
+        )
+
+        result = validate_game(checkmate_game)
+        self.assertTrue(result["is_legal"])
+        self.assertEqual(result["moves_count"], 4)
+
+    def test_results_of_process_pool(self):
+        games = list(read_pgn_games(io.StringIO(PGN_TEXT))) * 3
+
+        results = list(validate_games(games, processes=2, max_pending_games=3))
+
+        self.assertEqual([i["index"] for i in results], list(range(9)))
+        self.assertEqual([i["is_legal"] for i in results], [True, False, True] * 3)
+
+        results = list(validate_games(iter(games), processes=2, ordered=False))
+
+        self.assertEqual(sorted(i["index"] for i in results), list(range(9)))
+
+        # the same results in current process
+        self.assertEqual(
+            list(validate_games(games, processes=1)),
+            list(validate_games(games, processes=2)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Replay and validate many games at once, using all CPU cores.
+
+Games do not depend on each other, so each one is replayed in one of worker processes
+and results are given back one by one, in the same order as games were given or in
+order in which workers finish them. Games are read from source only when there is a free
+place for them, so any number of games can be validated without keeping them in memory.
+
+Usage from command line(prints JSON line for each game):
+    python validate_games.py games.pgn
+    python validate_games.py games.pgn --processes 32 --unordered --backend bitboard
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+from board import BITBOARD_BACKEND, MAILBOX_BACKEND, Board
+from pgn_reader import read_pgn_games
+
+
+def validate_game(game, index=0, backend=MAILBOX_BACKEND):
+    """
+    Apply moves of game(like read_pgn_games gives) to new board and return:
+        {
+            "index": 0,  # given index, to know which game it was
+            "headers": {...},
+            "is_legal": False,
+            "moves_count": 41,  # how many moves were applied successfully
+            "error_move": "Qxf7",  # first move that could not be applied, if any
+            "error": "Move Qxf7 does not seem valid/possible on current board",
+            # position after last applied move
+            "final_fen": "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+            "final_position_hash": 1234567890,
+        }
+    """
+    board = Board(backend=backend)
+
+    moves_count = 0
+    error_move, error = None, None
+
+    for moves in game["moves"]:
+        for move in moves:
+            try:
+                board.apply_chess_notation_moves([[move]])
+            # conversion of notations and board validations raise different errors for
+            # moves that are not possible, but all of them mean that game is not valid
+            except Exception as e:
+                error_move, error = move, str(e) or type(e).__name__
+                break
+
+            moves_count += 1
+
+        if error_move is not None:
+            break
+
+    return {
+        "index": index,
+        "headers": game.get("headers", {}),
+        "is_legal": error_move is None,
+        "moves_count": moves_count,
+        "error_move": error_move,
+        "error": error,
+        "final_fen": board.to_fen(),
+        "final_position_hash": board.position_hash,
+    }
+
+
+def _validate_game_with_index(args):
+    return validate_game(*args)
+
+
+def validate_games(
+    games,
+    processes=None,
+    ordered=True,
+    backend=MAILBOX_BACKEND,
+    max_pending_games=None,
+):
+    """
+    Validate games from any iterable(for example read_pgn_games generator) using pool of
+    processes and yield results of validate_game for each of them.
+
+    args:
+        processes - number of worker processes, all CPU cores by default. If 1, games
+                    are validated in current process
+        ordered - if True, results are given in the same order as games, otherwise
+                    as soon as each of them is ready
+        max_pending_games - at most how many games are read from source, but not given
+                    back yet, 4 for each process by default
+    """
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1:
+        for index, game in enumerate(games):
+            yield validate_game(game, index, backend)
+
+        return
+
+    max_pending_games = max_pending_games or processes * 4
+
+    finished_results = queue.Queue()
+    # results that are ready, but wait for previous ones in ordered mode
+    results_waiting_for_their_turn = {}
+    next_result_index = 0
+    running_games_count = 0
+
+    games = enumerate(games)
+    all_games_started = False
+
+    with multiprocessing.Pool(processes) as pool:
+        while True:
+            while (
+                not all_games_started
+                and running_games_count + len(results_waiting_for_their_turn)
+                < max_pending_games
+            ):
+                index_and_game = next(games, None)
+
+                if index_and_game is None:
+                    all_games_started = True
+                    break
+
+                index, game = index_and_game
+
+                pool.apply_async(
+                    _validate_game_with_index,
+                    ((game, index, backend),),
+                    callback=finished_results.put,
+                    error_callback=finished_results.put,
+                )
+                running_games_count += 1
+
+            if running_games_count == 0:
+                break
+
+            result = finished_results.get()
+            running_games_count -= 1
+
+            # validate_game handles errors of moves itself, so this
+            # is something unexpected, like process being killed
+            if isinstance(result, BaseException):
+                raise result
+
+            if not ordered:
+                yield result
+                continue
+
+            results_waiting_for_their_turn[result["index"]] = result
+
+            while next_result_index in results_waiting_for_their_turn:
+                yield results_waiting_for_their_turn.pop(next_result_index)
+                next_result_index += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that all games in pgn file contain only valid moves"
+    )
+    parser.add_argument("pgn_file_path")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="number of worker processes, all CPU cores by default",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="print results as soon as they are ready, not in order of games",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=(MAILBOX_BACKEND, BITBOARD_BACKEND),
+        default=MAILBOX_BACKEND,
+    )
+
+    args = parser.parse_args()
+
+    games_count, invalid_games_count = 0, 0
+    start_time = time.perf_counter()
+
+    with open(args.pgn_file_path) as f:
+        for result in validate_games(
+            read_pgn_games(f),
+            processes=args.processes,
+            ordered=not args.unordered,
+            backend=args.backend,
+        ):
+            print(json.dumps(result), flush=True)
+
+            games_count += 1
+            invalid_games_count += not result["is_legal"]
+
+    seconds = time.perf_counter() - start_time
+
+    print(
+        f"Games: {games_count}, invalid: {invalid_games_count}, "
+        f"time: {seconds:.2f}s",
+        file=sys.stderr,
+    )
+
+    if invalid_games_count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()